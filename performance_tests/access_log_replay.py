@@ -0,0 +1,257 @@
+import csv
+import datetime
+import gzip
+import json
+import logging
+import time
+import zlib
+from collections.abc import Callable, Iterable, Iterator
+from typing import Final, TextIO, TypedDict
+from urllib.parse import parse_qsl, urlsplit
+
+import gevent
+from gevent.pool import Pool
+from locust.env import Environment
+from locust.runners import WorkerRunner
+
+from performance_tests.configs.endpoints_config import EndpointConfig
+from performance_tests.configs.runtime_config import RuntimeConfig
+from performance_tests.open_model import corrected_latency_stats, schedule_lag_stats
+
+logger = logging.getLogger(__name__)
+
+# Fields of an access log record, in the column order of the CSV format
+ACCESS_LOG_FIELDS: Final[tuple[str, ...]] = ("timestamp", "method", "path", "query")
+
+class AccessLogRecord(TypedDict):
+    timestamp: float # Seconds since epoch the request was received at
+    method: str
+    path: str # URL path of the request, without the host
+    query: str # Query string of the request, without the leading ?
+
+
+class ReplayRequest(TypedDict):
+    offset: float # Seconds since the first record of the log
+    endpoint_name: str # Name of the endpoint in the endpoints config
+    param_overrides: dict[str, str] # Locust-owned values of the parameters the production values are rewritten to
+
+
+def parse_timestamp(value: str) -> float:
+    """Parse a timestamp as seconds since epoch, or as an ISO 8601 date and time (UTC if no offset is set)"""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    timestamp = datetime.datetime.fromisoformat(value)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=datetime.UTC)
+
+    return timestamp.timestamp()
+
+
+def open_access_log(file_path: str) -> TextIO:
+    """Open an access log as text, decompressing it on the fly if gzipped"""
+    if file_path.endswith(".gz"):
+        return gzip.open(file_path, "rt", newline="")
+
+    return open(file_path, newline="")
+
+
+def read_access_log(file_path: str) -> Iterator[AccessLogRecord]:
+    """
+    Read the records of an access log lazily, one line at a time, so that logs larger than memory can be replayed.
+
+    The log is either JSON lines ({"timestamp": ..., "method": ..., "path": ..., "query": ...} per line, for a .jsonl
+    or .jsonl.gz file), or CSV lines in the order timestamp,method,path,query with an optional header line.
+    The timestamps are seconds since epoch or ISO 8601 date and times, in ascending order. If the path includes the
+    query string, the query field can be left empty.
+
+    Args:
+        file_path (str): the path of the access log
+
+    Returns:
+        Iterator[AccessLogRecord]: the records of the log, in order
+    """
+    with open_access_log(file_path) as log_file:
+        if file_path.removesuffix(".gz").endswith(".jsonl"):
+            rows: Iterable[dict[str, str]] = (json.loads(line) for line in log_file if line.strip())
+        else:
+            rows = (dict(zip(ACCESS_LOG_FIELDS, row, strict=False)) for row in csv.reader(log_file) if row)
+
+        for row in rows:
+            if row.get("timestamp") == "timestamp":
+                continue
+
+            url = urlsplit(row["path"])
+            yield AccessLogRecord(
+                timestamp=parse_timestamp(str(row["timestamp"])),
+                method=row["method"].upper(),
+                path=url.path,
+                query=(row.get("query") or url.query).removeprefix("?"),
+            )
+
+
+def is_in_partition(record: AccessLogRecord, partition: int, partitions: int) -> bool:
+    """
+    Check if a record belongs to the given partition of the log. The records are partitioned by hash of their path
+    and query, so that the requests to the same resource are replayed in order by the same worker.
+    """
+    return zlib.crc32(f"{record['path']}?{record['query']}".encode()) % partitions == partition
+
+
+def rewrite_key(value: str, pool: tuple[str, ...] | list[str]) -> str:
+    """Rewrite a production value to a Locust-owned value of the pool, always the same for the same production value"""
+    return pool[zlib.crc32(value.encode()) % len(pool)]
+
+
+def get_replay_key_pools(runtime_config: RuntimeConfig) -> dict[str, list[str]]:
+    """
+    Get the Locust-owned values the production values of each key parameter are rewritten to: the identifiers of the
+    preprocessed dataset, known to every process. The same production value is always rewritten to the same value, so
+    that the key skew of the production traffic is kept across the pool.
+    """
+    return {"identifier": runtime_config.DATASET_IDENTIFIERS}
+
+
+class AccessLogReplay:
+    """
+    Replay the slice of an access log of a process, mapping the records onto the tested endpoints and sending them at
+    their original offsets from the first record of the log, divided by the speedup factor.
+
+    The requests are sent to the endpoints of the endpoints config, with their parameters set from the test data:
+    the placeholders are mapped to the runtime values, and the production values of the key parameters are rewritten
+    to the Locust-owned values of their pool. The records of other endpoints are skipped.
+    """
+
+    def __init__(
+            self,
+            file_path: str,
+            endpoint_configs: dict[str, EndpointConfig],
+            runtime_config: RuntimeConfig,
+            speedup: float,
+            partition: int,
+            partitions: int,
+    ):
+        if speedup <= 0:
+            raise ValueError(f"Invalid replay speedup: {speedup}. Must be > 0")
+
+        self.file_path = file_path
+        self.endpoints = {(config["method"], config["url"]): name for name, config in endpoint_configs.items()}
+        self.endpoint_configs = endpoint_configs
+        self.runtime_config = runtime_config
+        self.key_pools = get_replay_key_pools(runtime_config)
+        self.speedup = speedup
+        self.partition = partition
+        self.partitions = partitions
+        self.replayed_records = 0
+        self.skipped_records = 0
+        self._requests: Iterator[ReplayRequest] | None = None
+        self._start: float | None = None
+
+    def get_param_overrides(self, endpoint_name: str, query: str) -> dict[str, str]:
+        """Get the Locust-owned values the production values of the key parameters of a request are rewritten to"""
+        endpoint_config = self.endpoint_configs[endpoint_name]
+        params = endpoint_config.get("params") or {}
+        cache_key_param = endpoint_config.get("cache_key_param")
+
+        param_overrides = {}
+        for key, value in parse_qsl(query):
+            if key not in params:
+                continue
+
+            if self.key_pools.get(key):
+                param_overrides[key] = rewrite_key(value, self.key_pools[key])
+            elif key == cache_key_param and self.runtime_config.COLD_CACHE_KEY_POOL:
+                # Distinct production resources are read from distinct resources of the cold pool
+                param_overrides[key] = rewrite_key(value, self.runtime_config.COLD_CACHE_KEY_POOL.keys)
+
+        return param_overrides
+
+    def get_requests(self) -> Iterator[ReplayRequest]:
+        """Get the requests of the slice of the log of this process, in order"""
+        first_timestamp = None
+        for record in read_access_log(self.file_path):
+            # The offsets are taken from the first record of the whole log, so that all the slices stay in step
+            if first_timestamp is None:
+                first_timestamp = record["timestamp"]
+
+            if not is_in_partition(record, self.partition, self.partitions):
+                continue
+
+            endpoint_name = self.endpoints.get((record["method"], record["path"]))
+            if endpoint_name is None:
+                self.skipped_records += 1
+                continue
+
+            yield ReplayRequest(
+                offset=record["timestamp"] - first_timestamp,
+                endpoint_name=endpoint_name,
+                param_overrides=self.get_param_overrides(endpoint_name, record["query"]),
+            )
+
+    def run(self, send: Callable[[ReplayRequest], object], get_stats_key: Callable[[str], tuple[str, str]],
+            max_in_flight: int) -> None:
+        """
+        Send the requests of the slice at their intended send times until the log is exhausted, then idle until the
+        greenlet is killed. If the replay is interrupted, the next run resumes from the next request.
+
+        Args:
+            send (Callable): the function sending the request of a record
+            get_stats_key (Callable): the function getting the method and name the requests of an endpoint are
+                reported under, used to record the schedule lag stats
+            max_in_flight (int): the maximum number of requests in flight
+        """
+        if self._requests is None:
+            self._requests = self.get_requests()
+            self._start = time.perf_counter()
+            logger.info(f"Replaying partition {self.partition + 1}/{self.partitions} of {self.file_path} "
+                        f"at {self.speedup:g}x speed")
+
+        pool = Pool(max_in_flight)
+        try:
+            for request in self._requests:
+                intended_send_time = self._start + request["offset"] / self.speedup
+                delay = intended_send_time - time.perf_counter()
+                if delay > 0:
+                    gevent.sleep(delay)
+
+                # Blocks when the pool is full, the lag is then accounted for in the schedule lag stats
+                pool.spawn(self._send_at, intended_send_time, send, request, *get_stats_key(request["endpoint_name"]))
+                self.replayed_records += 1
+
+            logger.info(f"Replay of {self.file_path} completed: {self.replayed_records} requests replayed, "
+                        f"{self.skipped_records} records of untested endpoints skipped")
+            pool.join()
+            while True:
+                # Nothing left to send, idle until the user is stopped
+                gevent.sleep(1)
+        finally:
+            pool.kill()
+
+    @staticmethod
+    def _send_at(intended_send_time: float, send: Callable[[ReplayRequest], object], request: ReplayRequest,
+                 method: str, name: str) -> None:
+        """Send a request and record its lag against the intended send time"""
+        actual_send_time = time.perf_counter()
+        send(request)
+        completion_time = time.perf_counter()
+
+        schedule_lag_stats.log(method, name, (actual_send_time - intended_send_time) * 1000)
+        corrected_latency_stats.log(method, name, (completion_time - intended_send_time) * 1000)
+
+
+def get_replay_partition(environment: Environment) -> tuple[int, int]:
+    """
+    Get the partition of the access log replayed by this process and the number of partitions, one per expected
+    worker. The workers get the expected number of workers from the master, which is the number of processes.
+    """
+    if isinstance(environment.runner, WorkerRunner):
+        partition, partitions = environment.runner.worker_index, environment.parsed_options.expect_workers or 1
+        if partition >= partitions:
+            # The slices of the expected workers already cover the whole log
+            logger.warning(f"Worker {partition} is beyond the {partitions} expected workers and replays no request")
+
+        return partition, partitions
+
+    return 0, 1
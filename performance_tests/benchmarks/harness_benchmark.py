@@ -0,0 +1,257 @@
+"""
+Benchmark of the overhead of the load generator itself, run against the local mock service with no latency.
+
+Each endpoint is benchmarked in its own process, standing in for one worker process, and the results are written to a
+JSON file to be compared between commits.
+
+Usage:
+    MOCK_MODE=true APP=sds python -m performance_tests.benchmarks.harness_benchmark --users 50 --duration 10
+"""
+import argparse
+import datetime
+import json
+import logging
+import platform
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+import gevent
+import gevent.event
+import locust
+import psutil
+from locust import constant, events
+from locust.argument_parser import parse_options
+from locust.env import Environment
+
+from performance_tests.configs.config import config
+from performance_tests.configs.endpoints_config import ENDPOINTS_CONFIG
+from performance_tests.locustfile import PerformanceTests, runtime_config
+from performance_tests.result_evaluation.result_store import get_commit
+
+logger = logging.getLogger(__name__)
+
+# Number of calls timed by the micro benchmarks of the harness code paths
+MICRO_BENCHMARK_CALLS: int = 10000
+
+# CPU utilisation of the process, in cores, from which it is saturated and its requests per second are its maximum
+SATURATED_CPU_UTILISATION: float = 0.9
+
+# Seconds to wait for the mock service to accept connections before benchmarking against it
+MOCK_SERVICE_START_TIMEOUT: float = 30.0
+
+
+class BenchmarkUser(PerformanceTests):
+    wait_time = constant(0) # Send requests back to back to saturate the process
+
+
+class NullClient:
+    """Client discarding the requests, to time the request preparation of the harness alone"""
+
+    def request(self, **kwargs) -> None:
+        return None
+
+
+def get_cpu_seconds(process: psutil.Process) -> float:
+    cpu_times = process.cpu_times()
+    return cpu_times.user + cpu_times.system
+
+
+def time_micro_benchmark(func, calls: int = MICRO_BENCHMARK_CALLS) -> float:
+    """Get the CPU time in microseconds of a single call of the function"""
+    start = time.process_time()
+    for _ in range(calls):
+        func()
+
+    return (time.process_time() - start) / calls * 1_000_000
+
+
+def measure_load(environment: Environment, process: psutil.Process, duration: float) -> tuple[int, int, float, float]:
+    """Measure the requests, failures, CPU seconds and elapsed seconds of the process over the duration"""
+    requests_start = environment.stats.total.num_requests
+    failures_start = environment.stats.total.num_failures
+    cpu_start = get_cpu_seconds(process)
+    time_start = time.perf_counter()
+
+    gevent.sleep(duration)
+
+    return (
+        environment.stats.total.num_requests - requests_start,
+        environment.stats.total.num_failures - failures_start,
+        get_cpu_seconds(process) - cpu_start,
+        time.perf_counter() - time_start,
+    )
+
+
+def benchmark_endpoint(endpoint: str, users: int, max_users: int, warmup: float, duration: float) -> dict:
+    """
+    Benchmark an endpoint in the current process: the requests per second and the CPU time per request of the
+    process at saturation, the memory per user, and the CPU time of the request preparation and stats bookkeeping.
+
+    The users are doubled, up to the maximum users, until the process uses a full core, so that the requests per
+    second are bounded by the harness and not by the latency of the users. A result below saturation is flagged as
+    such, its requests per second then being a lower bound only.
+
+    Returns:
+        dict: the benchmark result of the endpoint
+    """
+    options = parse_options(args=["--test-endpoints", endpoint])
+    environment = Environment(user_classes=[BenchmarkUser], events=events, parsed_options=options, host=config.BASE_URL)
+    runner = environment.create_local_runner()
+    process = psutil.Process()
+
+    # The runner preprocesses the test data as it starts the test, before spawning the users: the memory is measured
+    # once the test start listeners of the locustfile have run, and the warmup only starts then
+    preprocessed = gevent.event.Event()
+    rss_before = 0
+
+    def on_preprocessed(**kwargs):
+        nonlocal rss_before
+        rss_before = process.memory_info().rss
+        preprocessed.set()
+
+    events.test_start.add_listener(on_preprocessed)
+    runner.start(users, spawn_rate=users)
+    gevent.wait([preprocessed, runner.spawning_greenlet], count=1)
+    events.test_start.remove_listener(on_preprocessed)
+    if not preprocessed.is_set():
+        raise RuntimeError(f"The test of {endpoint} did not start")
+    gevent.sleep(warmup)
+    requests_count, failures_count, cpu_seconds, elapsed = measure_load(environment, process, duration)
+
+    while cpu_seconds / elapsed < SATURATED_CPU_UTILISATION and users < max_users:
+        users = min(users * 2, max_users)
+        runner.start(users, spawn_rate=users)
+        gevent.sleep(warmup)
+        requests_count, failures_count, cpu_seconds, elapsed = measure_load(environment, process, duration)
+
+    rss_after = process.memory_info().rss
+
+    runner.quit()
+
+    endpoint_helpers = BenchmarkUser(environment).endpoint_helpers
+    null_client = NullClient()
+
+    return {
+        "endpoint": endpoint,
+        "users": users,
+        "duration_s": round(elapsed, 3),
+        "requests": requests_count,
+        "failures": failures_count,
+        "rps": round(requests_count / elapsed, 1),
+        "cpu_utilisation": round(cpu_seconds / elapsed, 3),
+        "saturated": cpu_seconds / elapsed >= SATURATED_CPU_UTILISATION,
+        "cpu_us_per_request": round(cpu_seconds / max(requests_count, 1) * 1_000_000, 1),
+        "rss_per_user_kb": round((rss_after - rss_before) / users / 1024, 1),
+        "send_request_us": round(time_micro_benchmark(
+            lambda: endpoint_helpers.send_request(null_client, endpoint, runtime_config)
+        ), 2),
+        "stats_log_us": round(time_micro_benchmark(
+            lambda: environment.stats.log_request("GET", endpoint, 1, 100)
+        ), 2),
+    }
+
+
+def run_child(endpoint: str, users: int, max_users: int, warmup: float, duration: float) -> dict | None:
+    """Benchmark an endpoint in a fresh process, so that the processes do not share memory or connections"""
+    completed = subprocess.run(
+        [
+            sys.executable, "-m", "performance_tests.benchmarks.harness_benchmark",
+            "--child-endpoint", endpoint,
+            "--users", str(users),
+            "--max-users", str(max_users),
+            "--warmup", str(warmup),
+            "--duration", str(duration),
+        ],
+        capture_output=True,
+        text=True,
+    )
+
+    if completed.returncode != 0:
+        logger.error(f"Benchmark of {endpoint} failed: {completed.stderr[-2000:]}")
+        return None
+
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def wait_for_port(host: str, port: int, timeout: float = MOCK_SERVICE_START_TIMEOUT) -> None:
+    """Wait until a server accepts connections on the port, raising a TimeoutError if it does not within the timeout"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Nothing accepts connections on {host}:{port} after {timeout:g}s") from None
+            time.sleep(0.1)
+
+
+def run_benchmarks(endpoints: list[str], users: int, max_users: int, warmup: float, duration: float) -> dict:
+    """Start the mock service and benchmark each endpoint against it"""
+    mock_url = urlparse(config.BASE_URL)
+    mock_service = subprocess.Popen(
+        [sys.executable, "-m", "performance_tests.mock_service.mock_server", "--port", str(mock_url.port)],
+    )
+    try:
+        wait_for_port(mock_url.hostname, mock_url.port)
+        results = []
+        for endpoint in endpoints:
+            logger.info(f"Benchmarking {endpoint} with {users} users for {duration}s...")
+            result = run_child(endpoint, users, max_users, warmup, duration)
+            if result:
+                logger.info(f"{endpoint}: {result['rps']} req/s with {result['users']} users, "
+                            f"{result['cpu_us_per_request']} CPU us/request, {result['rss_per_user_kb']} KB/user")
+                if not result["saturated"]:
+                    logger.warning(f"{endpoint} did not saturate the process with {result['users']} users "
+                                   f"({result['cpu_utilisation']} CPU): its req/s is a lower bound, "
+                                   f"increase --max-users")
+                results.append(result)
+    finally:
+        mock_service.terminate()
+        mock_service.wait()
+
+    return {
+        "app": config.APP,
+        "commit": get_commit(),
+        "created_at": datetime.datetime.now(datetime.UTC).isoformat(),
+        "python_version": platform.python_version(),
+        "locust_version": locust.__version__,
+        "cpu_count": psutil.cpu_count(),
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--endpoints", nargs="*", help="Endpoints to benchmark, all the endpoints of the app by default")
+    parser.add_argument("--users", type=int, default=50, help="Number of users of the process to start with")
+    parser.add_argument("--max-users", type=int, default=800, help="Number of users the process is ramped up to at most until it saturates")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Seconds to run before measuring")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to measure for")
+    parser.add_argument("--output", default=f"benchmark_results/harness_{config.APP}.json", help="JSON file to write the results to")
+    parser.add_argument("--child-endpoint", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child_endpoint:
+        logging.basicConfig(level=logging.ERROR)
+        print(json.dumps(benchmark_endpoint(args.child_endpoint, args.users, args.max_users, args.warmup, args.duration)))
+        sys.exit(0)
+
+    logging.basicConfig(level=logging.INFO)
+
+    if not config.MOCK_MODE:
+        logger.error("The harness benchmark runs against the mock service only. Set MOCK_MODE=true.")
+        sys.exit(1)
+
+    endpoints = args.endpoints or list(ENDPOINTS_CONFIG[config.APP]["test_endpoints"])
+    benchmark = run_benchmarks(endpoints, args.users, args.max_users, args.warmup, args.duration)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(benchmark, indent=2))
+
+    logger.info(f"Benchmark results written to {output}")
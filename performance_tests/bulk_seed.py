@@ -0,0 +1,63 @@
+from typing import TypedDict
+
+from performance_tests.configs.config import App, config
+
+
+class SeedRecord(TypedDict):
+    index: int # Index of the record in the seeded collection
+    survey_id: str # Survey the schema/CI is published under
+    classifier_value: str # Form type of the CI (CIR only)
+    language: str # Language of the CI (CIR only)
+
+
+def get_seed_survey_ids(seed_surveys: int) -> list[str]:
+    """Get the ids of the surveys the schemas/CIs are seeded across"""
+    return [f"{config.TEST_SEED_SURVEY_ID_PREFIX}_{index}" for index in range(seed_surveys)]
+
+
+def get_seed_records(seed_records: int, seed_surveys: int) -> list[SeedRecord]:
+    """
+    Get the records to seed, spread evenly across the surveys first, then the classifier values and the languages,
+    so that every survey gets a share of the records whatever their number.
+
+    Args:
+        seed_records (int): the number of schemas/CIs to seed
+        seed_surveys (int): the number of surveys to seed them across
+
+    Returns:
+        list[SeedRecord]: the records to seed
+    """
+    survey_ids = get_seed_survey_ids(seed_surveys)
+    classifier_values = config.TEST_SEED_CI_CLASSIFIER_VALUES
+    languages = config.TEST_SEED_CI_LANGUAGES
+
+    return [
+        SeedRecord(
+            index=index,
+            survey_id=survey_ids[index % seed_surveys],
+            classifier_value=classifier_values[index // seed_surveys % len(classifier_values)],
+            language=languages[index // (seed_surveys * len(classifier_values)) % len(languages)],
+        )
+        for index in range(seed_records)
+    ]
+
+
+def get_seed_record_group(record: SeedRecord) -> tuple[str, ...]:
+    """
+    Get the key of the metadata query listing the record. SDS lists schemas by survey, CIR lists CIs by survey,
+    classifier value and language.
+    """
+    if config.APP == App.SDS:
+        return (record["survey_id"],)
+
+    return record["survey_id"], record["classifier_value"], record["language"]
+
+
+def group_seed_records(records: list[SeedRecord]) -> dict[tuple[str, ...], list[SeedRecord]]:
+    """Group the records by the metadata query listing them"""
+    groups: dict[tuple[str, ...], list[SeedRecord]] = {}
+    for record in records:
+        groups.setdefault(get_seed_record_group(record), []).append(record)
+
+    return groups
+
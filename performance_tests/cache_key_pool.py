@@ -0,0 +1,73 @@
+import logging
+import random
+from typing import Final
+
+logger = logging.getLogger(__name__)
+
+WARM_CACHE_MODE: Final[str] = "warm"
+COLD_CACHE_MODE: Final[str] = "cold"
+MIXED_CACHE_MODE: Final[str] = "mixed"
+CACHE_MODE_CHOICES: Final[list[str]] = [WARM_CACHE_MODE, COLD_CACHE_MODE, MIXED_CACHE_MODE]
+
+
+class CacheKeyPool:
+    """
+    Hand out the keys of a pool of distinct resources in a shuffled cycle, so that every key is requested once
+    before any key is requested again, and the least recently requested key is always the next one.
+    """
+
+    def __init__(self, keys: list[str], seed: int | None = None):
+        self.keys = keys.copy()
+        random.Random(seed).shuffle(self.keys)
+        self._index = 0
+        self.passes = 0 # Number of times every key of the pool has been handed out
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def next_key(self) -> str:
+        """Get the least recently requested key of the pool"""
+        key = self.keys[self._index]
+        self._index = (self._index + 1) % len(self.keys)
+        if self._index == 0:
+            self.passes += 1
+
+        return key
+
+
+class ColdCacheKeyPool(CacheKeyPool):
+    """
+    Hand out the keys of the cold pool, each key being on the cold path the first time only. Once every key has been
+    handed out, the keys are handed out again but are no longer cold, which is warned about once.
+    """
+
+    def next_cold_key(self) -> tuple[str, bool]:
+        """Get the least recently requested key of the pool, and whether it is requested for the first time"""
+        is_cold = self.passes == 0
+        key = self.next_key()
+
+        if is_cold and self.passes == 1:
+            logger.warning(f"Cold pool of {len(self)} keys exhausted: the next cold path requests read keys already "
+                           "read, and are reported as [cold reused]. Increase the cold pool size to keep them cold.")
+
+        return key, is_cold
+
+
+def select_cold_pool_keys(keys: list[str], cold_pool_size: int) -> list[str]:
+    """
+    Select the keys of the cold pool of the requested size from the keys published under the cold pool survey, which
+    can be more when a previous run published a larger pool. The keys are sorted first, so that every process
+    selects the same ones.
+    """
+    return sorted(keys)[:cold_pool_size]
+
+
+def get_cold_ratio(cache_mode: str, mixed_cold_ratio: float) -> float:
+    """Get the share of read requests to send on the cold path for the given cache mode"""
+    if cache_mode == COLD_CACHE_MODE:
+        return 1.0
+
+    if cache_mode == MIXED_CACHE_MODE:
+        return mixed_cold_ratio
+
+    return 0.0
@@ -0,0 +1,120 @@
+import json
+from typing import Final, TypedDict
+
+# Types of the generated answers, cycled through the answers of each question
+ANSWER_TYPES: Final[tuple[str, ...]] = ("Number", "Currency", "TextField", "Percentage")
+
+SMALL_CI_SCHEMA_VARIANT: Final[str] = "small"
+MEDIUM_CI_SCHEMA_VARIANT: Final[str] = "medium"
+LARGE_CI_SCHEMA_VARIANT: Final[str] = "large"
+# Variant of the size set by the CI schema size option
+CUSTOM_CI_SCHEMA_VARIANT: Final[str] = "custom"
+
+
+class CISchemaSize(TypedDict):
+    sections: int # Number of sections of the schema
+    questions: int # Number of questions of each section
+    answers: int # Number of answers of each question
+
+
+# Sizes of the generated CI schema variants, from a short survey to the largest production ones of hundreds of KB
+CI_SCHEMA_VARIANTS: Final[dict[str, CISchemaSize]] = {
+    SMALL_CI_SCHEMA_VARIANT: CISchemaSize(sections=2, questions=10, answers=2),
+    MEDIUM_CI_SCHEMA_VARIANT: CISchemaSize(sections=5, questions=20, answers=3),
+    LARGE_CI_SCHEMA_VARIANT: CISchemaSize(sections=20, questions=25, answers=3),
+}
+CI_SCHEMA_VARIANT_CHOICES: Final[list[str]] = [*CI_SCHEMA_VARIANTS, CUSTOM_CI_SCHEMA_VARIANT]
+
+
+def parse_ci_schema_size(ci_schema_size: str) -> CISchemaSize:
+    """Parse a CI schema size in the format "<sections>,<questions>,<answers>", e.g. "10,20,3" """
+    try:
+        sections, questions, answers = (int(value) for value in ci_schema_size.split(","))
+    except ValueError as e:
+        raise ValueError(f"Invalid CI schema size: {ci_schema_size}. "
+                         "Expected format <sections>,<questions>,<answers>") from e
+
+    if min(sections, questions, answers) < 1:
+        raise ValueError(f"Invalid CI schema size: {ci_schema_size}. Every count must be at least 1")
+
+    return CISchemaSize(sections=sections, questions=questions, answers=answers)
+
+
+def generate_answer(section: int, question: int, answer: int) -> dict:
+    """Generate an answer of a question, of the next answer type"""
+    answer_type = ANSWER_TYPES[answer % len(ANSWER_TYPES)]
+    generated = {
+        "id": f"answer-{section}-{question}-{answer}",
+        "mandatory": False,
+        "type": answer_type,
+        "label": f"Answer {answer + 1} of question {question + 1}",
+        "description": "Enter the value for the reporting period, or your best estimate if it is not available",
+    }
+    if answer_type in ("Number", "Currency"):
+        generated["decimal_places"] = 0
+    if answer_type == "Currency":
+        generated["currency"] = "GBP"
+    if answer_type == "TextField":
+        generated["max_length"] = 100
+
+    return generated
+
+
+def generate_question_block(section: int, question: int, answers: int) -> dict:
+    """Generate the block of a question of a section, with its answers"""
+    return {
+        "id": f"block-{section}-{question}",
+        "type": "Question",
+        "question": {
+            "id": f"question-{section}-{question}",
+            "title": f"Question {question + 1} of section {section + 1} for {{ru_name}}",
+            "type": "General",
+            "guidance": {
+                "contents": [{"description": "Include all sites in England, Scotland, Wales and Northern Ireland"}],
+            },
+            "answers": [generate_answer(section, question, answer) for answer in range(answers)],
+        },
+        "page_title": f"Question {question + 1} of section {section + 1}",
+    }
+
+
+def generate_ci_schema(template_file: str, sections: int, questions: int, answers: int) -> dict:
+    """
+    Generate a CI schema of the given size from a template CI schema. The metadata and the introduction of the
+    template are kept, and its sections are replaced with the generated ones.
+
+    Args:
+        template_file (str): the path of the template CI schema
+        sections (int): the number of sections
+        questions (int): the number of questions of each section
+        answers (int): the number of answers of each question
+
+    Returns:
+        dict: the generated CI schema, with the placeholders of the template
+    """
+    with open(template_file) as f:
+        template = json.load(f)
+
+    # The introduction of the template opens the first section
+    introduction = template["sections"][0]["groups"][0]
+
+    schema = template
+    schema["sections"] = [
+        {
+            "id": f"section-{section}",
+            "title": f"Section {section + 1}",
+            "summary": {"show_on_completion": False, "collapsible": False},
+            "show_on_hub": True,
+            "groups": [
+                *([introduction] if section == 0 else []),
+                {
+                    "id": f"group-{section}",
+                    "title": f"Section {section + 1}",
+                    "blocks": [generate_question_block(section, question, answers) for question in range(questions)],
+                },
+            ],
+        }
+        for section in range(sections)
+    ]
+
+    return schema
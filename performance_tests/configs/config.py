@@ -1,7 +1,7 @@
 from enum import StrEnum
 
 from performance_tests.configs.config_helpers import get_value_from_env
-from performance_tests.locust_test import FIXED_IDENTIFIERS, LOCUST_TEST_ID
+from performance_tests.locust_test import FIXED_IDENTIFIERS, LOCUST_COLD_POOL_ID, LOCUST_SEED_ID, LOCUST_TEST_ID
 
 
 class App(StrEnum):
@@ -27,5 +27,14 @@ class Config:
     TEST_CI_CLASSIFIER_TYPE = "form_type"
     TEST_CI_CLASSIFIER_VALUE = "0001"
     TEST_CI_VALIDATOR_VERSION = "0.0.1"
+    TEST_COLD_POOL_SURVEY_ID = LOCUST_COLD_POOL_ID # Survey of the schemas/CIs seeded for cold path testing
+    TEST_SEED_SURVEY_ID_PREFIX = LOCUST_SEED_ID # Prefix of the surveys of the schemas/CIs seeded for scale testing
+    TEST_SEED_CI_CLASSIFIER_VALUES = ("0001", "0002", "0003", "0004", "0005") # Form types the seeded CIs are spread across
+    TEST_SEED_CI_LANGUAGES = ("en", "cy") # Languages the seeded CIs are spread across
+    FIRESTORE_DB_NAME = get_value_from_env("FIRESTORE_DB_NAME", "(default)") # Firestore database of SDS, to delete seeded schemas
+    MOCK_MODE = get_value_from_env("MOCK_MODE", "false").lower() == "true" # Run against the local mock service with fake GCP providers
+    MOCK_BUCKET_DIR = get_value_from_env("MOCK_BUCKET_DIR", "performance_tests/mock_service/buckets") # Directory of the fake buckets in mock mode
+    OPEN_MODEL_MAX_IN_FLIGHT = int(get_value_from_env("LOCUST_OPEN_MODEL_MAX_IN_FLIGHT", "100")) # Max concurrent requests per user in open model
+    COMMIT_SHA = get_value_from_env("COMMIT_SHA", "unknown") # Commit of the harness recorded in the result archive, read from git if unset
 
 config = Config()
@@ -1,5 +1,6 @@
-from typing import TypedDict
+from typing import NotRequired, TypedDict
 
+from performance_tests.ci_schema_generator import CI_SCHEMA_VARIANT_CHOICES
 from performance_tests.configs import endpoints_func
 from performance_tests.configs.config import App, config
 
@@ -10,6 +11,11 @@ class EndpointConfig(TypedDict):
     name: str # Group name to group endpoint with different parameters calling into the same test method in result
     params: dict[str, str | dict] | None # URL parameters to be sent with the request, with optional placeholders for runtime values
     payload: str | None # File path for the payload to be sent with the request, if applicable
+    cache_key_param: NotRequired[str] # URL parameter identifying the cached resource of a read endpoint, for cold path testing
+    payload_variant: NotRequired[str] # CI schema variant generated from the payload file and sent instead of it
+    shard_key_param: NotRequired[str] # URL parameter taking the keys of the shard of the user when the test data is sharded
+    response_size_bounds: NotRequired[tuple[int, int]] # Minimum and maximum size in bytes of the validated responses
+    response_digest: NotRequired[bool] # Validate the responses to the warm key against a reference response digested before the test
 
 # SDS Endpoints
 
@@ -29,9 +35,15 @@ GET_CI_VALIDATOR_METADATA: str = "get_ci_validator_metadata"
 POST_CI: str = "post_ci_schema"
 PUT_VALIDATOR_VERSION: str = "put_validator_version"
 
+# Size bounds in bytes of the validated responses of the read endpoints, from the smallest valid envelope to well over
+# the largest unit data (1 MB) and schema
+UNIT_DATA_RESPONSE_SIZE_BOUNDS: tuple[int, int] = (100, 2_000_000)
+SCHEMA_RESPONSE_SIZE_BOUNDS: tuple[int, int] = (100, 10_000_000)
+
 # Runtime value placeholders
 RUNTIME_DATASET_ID_PLACEHOLDER = "dataset_id_placeholder"
 RUNTIME_SCHEMA_ID_PLACEHOLDER = "schema_guid_placeholder"
+RUNTIME_PERIOD_ID_PLACEHOLDER = "period_id_placeholder"
 
 
 SDS_ENDPOINTS: dict[str, EndpointConfig] = {
@@ -52,6 +64,7 @@ SDS_ENDPOINTS: dict[str, EndpointConfig] = {
             "survey_id": config.TEST_SURVEY_ID,
         },
         "payload": None,
+        "response_size_bounds": SCHEMA_RESPONSE_SIZE_BOUNDS,
     },
     GET_SCHEMA_V2: {
         "url": "/v2/schema",
@@ -61,6 +74,9 @@ SDS_ENDPOINTS: dict[str, EndpointConfig] = {
             "guid": RUNTIME_SCHEMA_ID_PLACEHOLDER,
         },
         "payload": None,
+        "cache_key_param": "guid",
+        "response_size_bounds": SCHEMA_RESPONSE_SIZE_BOUNDS,
+        "response_digest": True,
     },
     GET_DATASET_METADATA: {
         "url": "/v1/dataset_metadata",
@@ -68,7 +84,7 @@ SDS_ENDPOINTS: dict[str, EndpointConfig] = {
         "name": "/v1/dataset_metadata?survey_id=[survey_id]&period_id=[period_id]",
         "params": {
             "survey_id": config.TEST_SURVEY_ID,
-            "period_id": config.TEST_PERIOD_ID,
+            "period_id": RUNTIME_PERIOD_ID_PLACEHOLDER,
         },
         "payload": None,
     },
@@ -81,6 +97,9 @@ SDS_ENDPOINTS: dict[str, EndpointConfig] = {
             "identifier": config.TEST_UNIT_DATA_IDENTIFIER,
         },
         "payload": None,
+        "shard_key_param": "identifier",
+        "response_size_bounds": UNIT_DATA_RESPONSE_SIZE_BOUNDS,
+        "response_digest": True,
     },
     GET_SURVEY_LIST: {
         "url": "/v1/survey_list",
@@ -126,6 +145,9 @@ CIR_ENDPOINTS: dict[str, EndpointConfig] = {
             "guid": config.TEST_CI_GUID,
         },
         "payload": None,
+        "cache_key_param": "guid",
+        "response_size_bounds": SCHEMA_RESPONSE_SIZE_BOUNDS,
+        "response_digest": True,
     },
     PUT_VALIDATOR_VERSION: {
         "url": "/collection-instruments/validator-version",
@@ -142,6 +164,14 @@ CIR_ENDPOINTS: dict[str, EndpointConfig] = {
     },
 }
 
+# CIR write endpoints sending a generated CI schema of each size variant, e.g. post_ci_schema_large
+CIR_PAYLOAD_VARIANT_ENDPOINTS: dict[str, EndpointConfig] = {
+    f"{endpoint}_{variant}": {**CIR_ENDPOINTS[endpoint], "payload_variant": variant}
+    for endpoint in (POST_CI, PUT_VALIDATOR_VERSION)
+    for variant in CI_SCHEMA_VARIANT_CHOICES
+}
+CIR_ENDPOINTS.update(CIR_PAYLOAD_VARIANT_ENDPOINTS)
+
 ALL_ENDPOINTS: dict[str, EndpointConfig] = {**SDS_ENDPOINTS, **CIR_ENDPOINTS}
 
 SDS_ENDPOINTS_CHOICE: list = ["all", *list(SDS_ENDPOINTS.keys())]
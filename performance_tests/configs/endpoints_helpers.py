@@ -1,24 +1,84 @@
+import functools
+import json
+import random
+from typing import Final
 from urllib.parse import urlencode
 
 from locust.clients import ResponseContextManager
 from locust.contrib.fasthttp import FastHttpSession, FastResponse
 
+from performance_tests.cache_key_pool import WARM_CACHE_MODE, CacheKeyPool
+from performance_tests.ci_schema_generator import (
+    CI_SCHEMA_VARIANTS,
+    CUSTOM_CI_SCHEMA_VARIANT,
+    CISchemaSize,
+    generate_ci_schema,
+)
 from performance_tests.configs.config import config
 from performance_tests.configs.endpoints_config import (
     RUNTIME_DATASET_ID_PLACEHOLDER,
+    RUNTIME_PERIOD_ID_PLACEHOLDER,
     RUNTIME_SCHEMA_ID_PLACEHOLDER,
     EndpointConfig,
 )
 from performance_tests.configs.runtime_config import RuntimeConfig
 from performance_tests.locust_helper import LocustHelper
+from performance_tests.metrics.body_streaming import discard_response_body
+from performance_tests.metrics.http_phase_timing import track_request_phases
+from performance_tests.response_validation import ResponseDigest, fetch_response_digest
+from performance_tests.setup_engine import gather, setup_engine
 
 locust_helper = LocustHelper()
 
+# Headers of the requests sending a JSON payload, set from the payload encoded once instead of by the client
+JSON_PAYLOAD_HEADERS: Final[dict[str, str]] = {"Content-Type": "application/json", "Accept": "application/json"}
+
+# Upper bounds in bytes of the payload size buckets the response times of the requests with a payload are broken down by
+PAYLOAD_SIZE_BUCKETS: Final[tuple[tuple[int, str], ...]] = (
+    (10_000, "<10KB"),
+    (100_000, "10-100KB"),
+    (1_000_000, "100KB-1MB"),
+)
+
+
+def get_payload_size_bucket(size: int) -> str:
+    """Get the bucket of a payload size in bytes"""
+    for upper_bound, bucket in PAYLOAD_SIZE_BUCKETS:
+        if size < upper_bound:
+            return bucket
+
+    return ">1MB"
+
+
+@functools.cache
+def load_payload_body(payload_file: str, sections: int = 0, questions: int = 0, answers: int = 0) -> bytes:
+    """
+    Load the payload of an endpoint mapped to the test values and encoded as JSON, once per process and payload, so
+    that the requests are sent from memory. If a CI schema size is set, the payload is a CI schema of that size
+    generated from the payload file.
+
+    Args:
+        payload_file (str): the path of the payload file
+        sections (int): the number of sections of the generated CI schema, 0 to send the payload file as is
+        questions (int): the number of questions of each section of the generated CI schema
+        answers (int): the number of answers of each question of the generated CI schema
+
+    Returns:
+        bytes: the body of the requests
+    """
+    if sections:
+        payload = generate_ci_schema(payload_file, sections, questions, answers)
+    else:
+        payload = locust_helper.load_json(payload_file)
+
+    return json.dumps(locust_helper.map_schema_payload(payload)).encode()
+
 
 class EndpointsHelpers:
     def __init__(self, base_url: str, endpoints: dict[str, EndpointConfig]):
         self.base_url = base_url
         self.endpoints = endpoints
+        self.shard_key_pools: dict[str, CacheKeyPool] = {}  # Keys of the shard of the user, by parameter
 
     def get_endpoint_url(self, endpoint_name: str) -> str:
         """Get the URL for a given endpoint name"""
@@ -40,10 +100,40 @@ class EndpointsHelpers:
         """Get the payload for a given endpoint name"""
         return self.endpoints[endpoint_name].get("payload")
 
+    def get_endpoint_payload_size(self, endpoint_name: str, runtime_config: RuntimeConfig) -> CISchemaSize | None:
+        """Get the size of the CI schema generated as the payload for a given endpoint name, if it has a payload variant"""
+        variant = self.endpoints[endpoint_name].get("payload_variant")
+        if variant is None:
+            return None
+
+        if variant == CUSTOM_CI_SCHEMA_VARIANT:
+            return runtime_config.CI_SCHEMA_SIZE
+
+        return CI_SCHEMA_VARIANTS[variant]
+
+    def get_endpoint_cache_key_param(self, endpoint_name: str) -> str | None:
+        """Get the parameter identifying the cached resource for a given endpoint name, if it is a cacheable read"""
+        return self.endpoints[endpoint_name].get("cache_key_param")
+
+    def get_endpoint_shard_key_param(self, endpoint_name: str) -> str | None:
+        """Get the parameter taking the keys of the shard of the user for a given endpoint name, if it is sharded"""
+        return self.endpoints[endpoint_name].get("shard_key_param")
+
+    def get_endpoint_response_size_bounds(self, endpoint_name: str) -> tuple[int, int] | None:
+        """Get the size bounds of the validated responses for a given endpoint name, if they are bounded"""
+        return self.endpoints[endpoint_name].get("response_size_bounds")
+
+    def get_request_name(self, endpoint_name: str) -> str | None:
+        """Get the name the requests of a given endpoint name are grouped under in the stats"""
+        group_name = self.get_endpoint_group_name(endpoint_name)
+
+        return f"{config.BASE_URL}{group_name}" if group_name else None
+
     def get_endpoint_configs_from_selection(self, selected_endpoints: list[str]) -> dict[str, EndpointConfig]:
         """Get the endpoints config for the selected endpoints"""
         if "all" in selected_endpoints:
-            return self.endpoints
+            # The payload variants are only tested when selected
+            return {endpoint: config for endpoint, config in self.endpoints.items() if "payload_variant" not in config}
 
         return {endpoint: config for endpoint, config in self.endpoints.items() if endpoint in selected_endpoints}
 
@@ -69,6 +159,8 @@ class EndpointsHelpers:
                 mapped_params[key] = runtime_config.DATASET_ID
             elif value == RUNTIME_SCHEMA_ID_PLACEHOLDER:
                 mapped_params[key] = runtime_config.SCHEMA_GUID
+            elif value == RUNTIME_PERIOD_ID_PLACEHOLDER:
+                mapped_params[key] = runtime_config.PERIOD_ID
             else:
                 mapped_params[key] = value
 
@@ -96,24 +188,116 @@ class EndpointsHelpers:
 
         return output_params
 
-    def send_request(self, client: FastHttpSession, endpoint_name: str, runtime_config: RuntimeConfig) -> ResponseContextManager | FastResponse:
-        """Send a request to the given URL using the specified HTTP method and headers"""
+    def fetch_response_digests(self, runtime_config: RuntimeConfig) -> dict[str, ResponseDigest]:
+        """
+        Fetch the reference responses of the endpoints validated against a digest, on their warm key, concurrently
+
+        Returns:
+            dict[str, ResponseDigest]: the digests of the reference responses by endpoint name, for the references
+                fetched successfully
+        """
+        urls = {
+            endpoint_name: self.generate_full_url(
+                endpoint_name, self.map_params_to_runtime_values(endpoint_config["params"] or {}, runtime_config)
+            )
+            for endpoint_name, endpoint_config in self.endpoints.items()
+            if endpoint_config.get("response_digest")
+        }
+        digests = gather([setup_engine.spawn(fetch_response_digest, url, runtime_config.HEADER) for url in urls.values()])
+
+        return {endpoint_name: digest for endpoint_name, digest in zip(urls, digests, strict=True) if digest}
+
+    def send_request(
+            self,
+            client: FastHttpSession,
+            endpoint_name: str,
+            runtime_config: RuntimeConfig,
+            param_overrides: dict[str, str] | None = None,
+            catch_response: bool = False,
+    ) -> ResponseContextManager | FastResponse:
+        """
+        Send a request to the given URL using the specified HTTP method and headers
+
+        Args:
+            client (FastHttpSession): the client of the user sending the request
+            endpoint_name (str): the name of the endpoint in the endpoints config
+            runtime_config (RuntimeConfig): the runtime config to map the parameter placeholders from
+            param_overrides (dict[str, str] | None): parameter values overriding the endpoint config, e.g. values
+                extracted from a previous response
+            catch_response (bool): return a context manager to mark the request as success or failure, the caller
+                then validating the response instead of the sampled response validation
+
+        Returns:
+            ResponseContextManager | FastResponse: the response of the request
+        """
         method = self.get_endpoint_method(endpoint_name)
         params = self.get_endpoint_params(endpoint_name)
 
-        group_name = self.get_endpoint_group_name(endpoint_name)
-        if group_name:
-            group_name = f"{config.BASE_URL}{group_name}"
+        group_name = self.get_request_name(endpoint_name)
 
         mapped_params = self.map_params_to_runtime_values(params, runtime_config) if params else None
-        processed_params = self.generate_params_value_from_endpoints_func(mapped_params) if mapped_params else None
+        processed_params = (self.generate_params_value_from_endpoints_func(mapped_params) if mapped_params else None) or {}
+        # Send cacheable reads on the cold path at the cold ratio, and report each cache path separately
+        cache_key_param = self.get_endpoint_cache_key_param(endpoint_name)
+        if cache_key_param and runtime_config.CACHE_MODE != WARM_CACHE_MODE and not (param_overrides and cache_key_param in param_overrides):
+            if runtime_config.COLD_CACHE_KEY_POOL and random.random() < runtime_config.COLD_RATIO:
+                processed_params[cache_key_param], is_cold = runtime_config.COLD_CACHE_KEY_POOL.next_cold_key()
+                # Once the pool is exhausted, the keys have all been read and are reported apart from the cold ones
+                group_name = f"{group_name} [cold]" if is_cold else f"{group_name} [cold reused]"
+            else:
+                group_name = f"{group_name} [warm]"
+        # Send the sharded parameter with the next key of the shard of the user, if the test data is sharded
+        shard_key_param = self.get_endpoint_shard_key_param(endpoint_name)
+        if shard_key_param in self.shard_key_pools and not (param_overrides and shard_key_param in param_overrides):
+            processed_params[shard_key_param] = self.shard_key_pools[shard_key_param].next_key()
+
+        if param_overrides:
+            processed_params = {**processed_params, **param_overrides}
         full_url = self.generate_full_url(endpoint_name, params=processed_params)
 
-        # Load and map payload if it exists for the endpoint
-        payload = self.get_endpoint_payload(endpoint_name)
-        if payload:
-            payload_json = locust_helper.load_json(payload)
-            payload = locust_helper.map_schema_payload(payload_json)
+        # Send the payload from memory if the endpoint has one, and report each payload size bucket separately
+        headers = runtime_config.HEADER
+        body = None
+        payload_file = self.get_endpoint_payload(endpoint_name)
+        if payload_file:
+            payload_size = self.get_endpoint_payload_size(endpoint_name, runtime_config)
+            body = load_payload_body(payload_file, **payload_size) if payload_size else load_payload_body(payload_file)
+            headers = {**(headers or {}), **JSON_PAYLOAD_HEADERS}
+            group_name = f"{group_name} [payload {get_payload_size_bucket(len(body))}]"
+
+        # Validate a sample of the responses the caller does not validate itself
+        response_validator = runtime_config.RESPONSE_VALIDATOR
+        validate = not catch_response and response_validator is not None and response_validator.is_sampled()
+        # Stream and discard the bodies of the read responses nobody reads, if set
+        stream = bool(runtime_config.BODY_CHUNK_SIZE) and method == "GET" and not catch_response and not validate
+
+        # Record the phase timings of the request if the client is instrumented for it
+        with track_request_phases(client, group_name):
+            response = client.request(
+                method=method,
+                url=full_url,
+                headers=headers,
+                name=group_name,
+                data=body,
+                catch_response=catch_response or validate or stream,
+                stream=stream,
+            )
+
+            # The request is reported on exiting the response context
+            if stream:
+                with response:
+                    discard_response_body(response, group_name, runtime_config.BODY_CHUNK_SIZE)
+            elif validate:
+                with response:
+                    error = response_validator.validate(
+                        endpoint_name,
+                        full_url,
+                        response.status_code,
+                        response.content or b"",
+                        self.get_endpoint_response_size_bounds(endpoint_name),
+                    )
+                    if error:
+                        response.failure(error)
 
-        return client.request(method=method, url=full_url, headers=runtime_config.HEADER, name=group_name, json=payload)
+        return response
 
@@ -0,0 +1,111 @@
+from typing import TypedDict
+
+from performance_tests.configs.config import App
+from performance_tests.configs.endpoints_config import (
+    GET_CI_METADATA,
+    GET_CI_SCHEMA,
+    GET_DATASET_METADATA,
+    GET_SCHEMA_METADATA,
+    GET_SCHEMA_V2,
+    GET_UNIT_DATA,
+)
+
+
+class JourneyStep(TypedDict):
+    endpoint: str # Key of the endpoint in the endpoints config
+    bind: dict[str, str] | None # URL parameters to be set from journey values, as {param: journey value name}
+    extract: dict[str, str] | None # Journey values to be extracted from the JSON response, as {journey value name: path}
+    cache_ttl: float # Seconds the extracted values are reused for by the user before the step is sent again
+
+
+class JourneyConfig(TypedDict):
+    name: str # Name of the journey in the result, reporting its end-to-end latency
+    steps: list[JourneyStep] # Steps of the journey, in order
+
+
+# Method used to report the end-to-end latency of the journeys in the stats
+JOURNEY_REQUEST_TYPE: str = "JOURNEY"
+
+# SDS Journeys
+
+UNIT_DATA_JOURNEY: str = "unit_data_journey"
+SCHEMA_JOURNEY: str = "schema_journey"
+
+# CIR Journeys
+
+CI_SCHEMA_JOURNEY: str = "ci_schema_journey"
+
+
+SDS_JOURNEYS: dict[str, JourneyConfig] = {
+    UNIT_DATA_JOURNEY: {
+        "name": "/journey/dataset_metadata->unit_data",
+        "steps": [
+            {
+                "endpoint": GET_DATASET_METADATA,
+                "bind": None,
+                "extract": {"dataset_id": "0.dataset_id"},
+                "cache_ttl": 0,
+            },
+            {
+                "endpoint": GET_UNIT_DATA,
+                "bind": {"dataset_id": "dataset_id"},
+                "extract": None,
+                "cache_ttl": 0,
+            },
+        ],
+    },
+    SCHEMA_JOURNEY: {
+        "name": "/journey/schema_metadata->schema_v2",
+        "steps": [
+            {
+                "endpoint": GET_SCHEMA_METADATA,
+                "bind": None,
+                "extract": {"guid": "0.guid"},
+                "cache_ttl": 0,
+            },
+            {
+                "endpoint": GET_SCHEMA_V2,
+                "bind": {"guid": "guid"},
+                "extract": None,
+                "cache_ttl": 0,
+            },
+        ],
+    },
+}
+
+
+CIR_JOURNEYS: dict[str, JourneyConfig] = {
+    CI_SCHEMA_JOURNEY: {
+        "name": "/journey/ci_metadata->ci_schema",
+        "steps": [
+            {
+                "endpoint": GET_CI_METADATA,
+                "bind": None,
+                "extract": {"guid": "0.guid"},
+                "cache_ttl": 0,
+            },
+            {
+                "endpoint": GET_CI_SCHEMA,
+                "bind": {"guid": "guid"},
+                "extract": None,
+                "cache_ttl": 0,
+            },
+        ],
+    },
+}
+
+ALL_JOURNEYS: dict[str, JourneyConfig] = {**SDS_JOURNEYS, **CIR_JOURNEYS}
+
+SDS_JOURNEYS_CHOICE: list = ["none", "all", *list(SDS_JOURNEYS.keys())]
+CIR_JOURNEYS_CHOICE: list = ["none", "all", *list(CIR_JOURNEYS.keys())]
+
+JOURNEYS_CONFIG = {
+    App.SDS: {
+        "test_journeys": SDS_JOURNEYS,
+        "test_journeys_choice": SDS_JOURNEYS_CHOICE,
+    },
+    App.CIR: {
+        "test_journeys": CIR_JOURNEYS,
+        "test_journeys_choice": CIR_JOURNEYS_CHOICE,
+    },
+}
@@ -0,0 +1,120 @@
+import time
+from typing import Any, TypedDict
+
+from locust import User
+
+from performance_tests.configs.config import config
+from performance_tests.configs.journeys_config import JOURNEY_REQUEST_TYPE, JourneyConfig, JourneyStep
+from performance_tests.configs.runtime_config import RuntimeConfig
+
+
+class JourneyCacheEntry(TypedDict):
+    value: str # Value extracted from a response
+    extracted_at: float # Time the value was extracted at
+
+
+class JourneyStepError(Exception):
+    pass
+
+
+class JourneysHelpers:
+    def __init__(self, journeys: dict[str, JourneyConfig]):
+        self.journeys = journeys
+        self.journey_cache: dict[str, JourneyCacheEntry] = {} # Values extracted by the journeys of the user
+
+    def get_journey_request_name(self, journey_name: str) -> str:
+        """Get the name the end-to-end latency of a given journey is reported under in the stats"""
+        return f"{config.BASE_URL}{self.journeys[journey_name]['name']}"
+
+    @staticmethod
+    def extract_value(body: Any, path: str) -> str:
+        """
+        Extract a value from a JSON response body following a dot separated path of keys and list indexes,
+        e.g. "0.dataset_id" for the dataset_id of the first item of a list.
+        """
+        value = body
+        for key in path.split("."):
+            value = value[int(key)] if isinstance(value, list) else value[key]
+
+        return str(value)
+
+    def is_step_cached(self, step: JourneyStep) -> bool:
+        """Check if all the values extracted by a step are cached and still fresh"""
+        if not step["extract"] or step["cache_ttl"] <= 0:
+            return False
+
+        now = time.time()
+        return all(
+            name in self.journey_cache and now - self.journey_cache[name]["extracted_at"] < step["cache_ttl"]
+            for name in step["extract"]
+        )
+
+    def send_step(self, user: User, step: JourneyStep, runtime_config: RuntimeConfig) -> int:
+        """
+        Send the request of a journey step, with its parameters bound to the cached journey values, and cache the
+        values extracted from its response.
+
+        Returns:
+            int: the length of the response
+        """
+        try:
+            param_overrides = {
+                param: self.journey_cache[name]["value"] for param, name in (step["bind"] or {}).items()
+            }
+        except KeyError as e:
+            raise JourneyStepError(f"Journey value {e} is not available for endpoint {step['endpoint']}") from e
+
+        with user.endpoint_helpers.send_request(
+            client=user.client,
+            endpoint_name=step["endpoint"],
+            runtime_config=runtime_config,
+            param_overrides=param_overrides,
+            catch_response=True,
+        ) as response:
+            if not response.ok:
+                response.failure(f"Journey step {step['endpoint']} failed with status code {response.status_code}")
+                raise JourneyStepError(f"Journey step {step['endpoint']} failed with status code {response.status_code}")
+
+            try:
+                for name, path in (step["extract"] or {}).items():
+                    self.journey_cache[name] = JourneyCacheEntry(
+                        value=self.extract_value(response.json(), path),
+                        extracted_at=time.time(),
+                    )
+            except (ValueError, KeyError, IndexError, TypeError) as e:
+                response.failure(f"Journey step {step['endpoint']} response has no value at {step['extract']}: {e}")
+                raise JourneyStepError(f"Journey step {step['endpoint']} response has no value at {step['extract']}") from e
+
+            return len(response.content or b"")
+
+    def run_journey(self, user: User, journey_name: str, runtime_config: RuntimeConfig) -> None:
+        """
+        Run the steps of a journey in order and report its end-to-end latency as a stats entry of its own.
+        The journey stops at the first failed step.
+        """
+        start_time = time.time()
+        start_perf_counter = time.perf_counter()
+        response_length = 0
+        exception = None
+
+        for step in self.journeys[journey_name]["steps"]:
+            if self.is_step_cached(step):
+                continue
+
+            try:
+                response_length += self.send_step(user, step, runtime_config)
+            except JourneyStepError as e:
+                exception = e
+                break
+
+        user.environment.events.request.fire(
+            request_type=JOURNEY_REQUEST_TYPE,
+            name=self.get_journey_request_name(journey_name),
+            response_time=(time.perf_counter() - start_perf_counter) * 1000,
+            response_length=response_length,
+            response=None,
+            context={},
+            exception=exception,
+            start_time=start_time,
+            url=None,
+        )
@@ -1,16 +1,107 @@
+from argparse import Namespace
+from typing import Any, Final
+
+from locust.env import Environment
+from locust.runners import WorkerRunner
+
+from performance_tests.cache_key_pool import WARM_CACHE_MODE, ColdCacheKeyPool, get_cold_ratio
+from performance_tests.ci_schema_generator import (
+    CI_SCHEMA_VARIANTS,
+    MEDIUM_CI_SCHEMA_VARIANT,
+    CISchemaSize,
+    parse_ci_schema_size,
+)
+from performance_tests.configs.config import App, config
+from performance_tests.json_generator import (
+    get_dataset_identifiers,
+    get_dataset_period_id,
+    get_dataset_variant,
+    has_known_identifiers,
+)
+from performance_tests.locust_test import FIXED_IDENTIFIERS
 from performance_tests.preprocess.preprocess_base import PreProcessBase
+from performance_tests.preprocess.preprocess_cold_pool import PreProcessColdPool, get_worker_cold_pool_keys
 from performance_tests.preprocess.preprocess_sds_dataset import PreProcessSDSDataset
 from performance_tests.preprocess.preprocess_sds_schema import PreProcessSDSSchema
+from performance_tests.preprocess_manifest import PreprocessManifest
+from performance_tests.response_validation import ResponseValidator
+from performance_tests.test_data_shard import ShardedTestData, create_test_data_shard
+
+# Options the test data is preprocessed from. The test data is only preprocessed again when one of them changes
+PREPROCESS_OPTIONS: Final[tuple[str, ...]] = (
+    "dataset_entries", "cache_mode", "cold_pool_size", "seed_records", "seed_surveys", "unit_data_size_distribution",
+    "unit_data_size", "unit_data_size_sigma", "unit_data_entropy", "unit_data_seed", "unit_data_sizes_file",
+    "shard_test_data", "shard_overlap", "load_model",
+)
 
 
 class RuntimeConfig:
     DATASET_ID: str = "UNASSIGNED"  # To be set during initiation
     SCHEMA_GUID: str = "UNASSIGNED"  # To be set during initiation
+    PERIOD_ID: str = "UNASSIGNED"  # Period of the dataset of the tested size (SDS only), to be set during initiation
+    DATASET_IDENTIFIERS: list[str] = FIXED_IDENTIFIERS  # Identifiers of the dataset known to every process (SDS only), to be set during initiation
     HEADER: dict[str,str] | None = None  # To be set during initiation
+    CACHE_MODE: str = WARM_CACHE_MODE  # To be set during initiation
+    COLD_RATIO: float = 0.0  # Share of the read requests sent on the cold path, to be set during initiation
+    COLD_CACHE_KEY_POOL: ColdCacheKeyPool | None = None  # To be set during initiation if the cache mode is not warm
+    TEST_DATA_SHARD: ShardedTestData | None = None  # Shard of the test data of the process, to be set during initiation if sharded
+    RESPONSE_VALIDATOR: ResponseValidator | None = None  # To be set during initiation if the responses are validated
+    BODY_CHUNK_SIZE: int = 0  # Chunk size the read response bodies are streamed and discarded in, 0 to buffer them
+    PREPROCESS_KEY: tuple | None = None  # Values of the preprocess options the test data was preprocessed from
+    CI_SCHEMA_SIZE: CISchemaSize = CI_SCHEMA_VARIANTS[MEDIUM_CI_SCHEMA_VARIANT]  # Size of the custom CI schema variant (CIR only)
+
+    @staticmethod
+    def get_preprocess_key(parsed_options: Namespace) -> tuple:
+        return tuple(getattr(parsed_options, option, None) for option in PREPROCESS_OPTIONS)
+
+    @staticmethod
+    def get_preprocess_parameters(parsed_options: Namespace) -> dict[str, Any]:
+        """Get the parameters the test data is preprocessed from, recorded in the preprocess manifest"""
+        return {
+            "app": config.APP,
+            "base_url": config.BASE_URL,
+            **{option: getattr(parsed_options, option, None) for option in PREPROCESS_OPTIONS},
+        }
 
-    def set_config_from_preprocessors(self, preprocessors: list[PreProcessBase]):
+    def set_config_from_options(self, parsed_options: Namespace):
+        self.CACHE_MODE = parsed_options.cache_mode
+        self.COLD_RATIO = get_cold_ratio(parsed_options.cache_mode, parsed_options.cold_ratio)
+        self.BODY_CHUNK_SIZE = parsed_options.response_body_chunk_size if parsed_options.stream_response_body else 0
+        if getattr(parsed_options, "ci_schema_size", None):
+            self.CI_SCHEMA_SIZE = parse_ci_schema_size(parsed_options.ci_schema_size)
+        if getattr(parsed_options, "dataset_entries", None):
+            self.PERIOD_ID = get_dataset_period_id(parsed_options.dataset_entries, get_dataset_variant(parsed_options))
+            self.DATASET_IDENTIFIERS = (
+                get_dataset_identifiers(parsed_options.dataset_entries)
+                if has_known_identifiers(parsed_options)
+                else FIXED_IDENTIFIERS
+            )
+
+    def set_config_from_preprocessors(self, preprocessors: list[PreProcessBase], parsed_options: Namespace):
+        self.PREPROCESS_KEY = self.get_preprocess_key(parsed_options)
         for preprocessor in preprocessors:
             if isinstance(preprocessor, PreProcessSDSDataset):
                 self.DATASET_ID = preprocessor.get_dataset_id()
             elif isinstance(preprocessor, PreProcessSDSSchema):
                 self.SCHEMA_GUID = preprocessor.get_schema_guid()
+            elif isinstance(preprocessor, PreProcessColdPool):
+                self.COLD_CACHE_KEY_POOL = preprocessor.get_cold_pool()
+
+    def set_config_from_manifest(self, manifest: PreprocessManifest, environment: Environment):
+        self.PREPROCESS_KEY = self.get_preprocess_key(environment.parsed_options)
+        self.DATASET_ID = manifest["dataset_id"] or self.DATASET_ID
+        self.SCHEMA_GUID = manifest["schema_guid"]
+        if manifest["cold_pool_guids"]:
+            # Each worker walks its own shard of the pool, as when the cold pool is pre-processed
+            worker_index = environment.runner.worker_index if isinstance(environment.runner, WorkerRunner) else None
+            self.COLD_CACHE_KEY_POOL = ColdCacheKeyPool(
+                get_worker_cold_pool_keys(manifest["cold_pool_guids"], environment), seed=worker_index
+            )
+
+    def set_test_data_shard(self, environment: Environment):
+        """Set the shard of the dataset identifiers of the process, if the test data is sharded (SDS only)"""
+        keys = {}
+        if config.APP == App.SDS:
+            keys["identifier"] = self.DATASET_IDENTIFIERS
+
+        self.TEST_DATA_SHARD = create_test_data_shard(keys, environment)
@@ -0,0 +1,62 @@
+import functools
+import json
+from typing import NotRequired, TypedDict
+
+from performance_tests.configs.config import App
+
+
+class TrafficProfileEntry(TypedDict):
+    weight: NotRequired[int] # Relative share of the endpoint in the traffic mix
+    rate: NotRequired[float] # Fixed target arrival rate of the endpoint in requests per second (open model only)
+
+
+@functools.cache
+def load_traffic_profile(file_path: str, app: App, available_endpoints: tuple[str, ...]) -> dict[str, TrafficProfileEntry]:
+    """
+    Load the traffic profile of the app from a JSON file, in the format
+    {"<app>": {"<endpoint>": {"weight": <int>, "rate": <float>}, ...}, ...}. Each endpoint needs a weight, a rate or
+    both. The profile is loaded once per process.
+
+    Args:
+        file_path (str): the path of the traffic profile file
+        app (App): the app under test
+        available_endpoints (tuple[str, ...]): the endpoints that can be tested for the app
+
+    Returns:
+        dict[str, TrafficProfileEntry]: the traffic profile entries keyed by endpoint
+    """
+    with open(file_path) as f:
+        traffic_profile = json.load(f)
+
+    app_profile: dict[str, TrafficProfileEntry] = traffic_profile.get(app, {})
+    if not app_profile:
+        raise ValueError(f"Traffic profile {file_path} has no endpoints for app {app}")
+
+    for endpoint, entry in app_profile.items():
+        if endpoint not in available_endpoints:
+            raise ValueError(f"Traffic profile endpoint {endpoint} is not a valid {app} endpoint")
+
+        if "weight" not in entry and "rate" not in entry:
+            raise ValueError(f"Traffic profile endpoint {endpoint} must have a weight or a rate")
+
+        # The weights are the task counts of the task table, reduced by their greatest common divisor
+        weight = entry.get("weight", 1)
+        if isinstance(weight, bool) or not isinstance(weight, int) or weight <= 0:
+            raise ValueError(f"Traffic profile endpoint {endpoint} must have a positive integer weight, got {weight!r}")
+
+        rate = entry.get("rate", 1)
+        if isinstance(rate, bool) or not isinstance(rate, int | float) or rate <= 0:
+            raise ValueError(f"Traffic profile endpoint {endpoint} must have a positive rate, got {rate!r}")
+
+    return app_profile
+
+
+def get_traffic_profile_weights(traffic_profile: dict[str, TrafficProfileEntry]) -> dict[str, int]:
+    """
+    Get the task weight of each endpoint of the traffic profile. Endpoints without a weight are weighted by their
+    rate, so that the closed model keeps the same mix.
+    """
+    return {
+        endpoint: entry["weight"] if "weight" in entry else max(1, round(entry["rate"]))
+        for endpoint, entry in traffic_profile.items()
+    }
@@ -0,0 +1,298 @@
+import csv
+import itertools
+import json
+import logging
+from argparse import Namespace
+from typing import Any, Final, NotRequired, TypedDict
+
+import gevent
+from locust.env import Environment
+from locust.event import Events
+from locust.runners import STATE_INIT, STATE_STOPPING, MasterRunner, WorkerRunner
+
+from performance_tests.configs.config import App, config
+from performance_tests.json_generator import MAX_DATASET_ENTRIES, MIN_DATASET_ENTRIES
+from performance_tests.load_shape import NO_LOAD_SHAPE
+from performance_tests.metrics.custom_request_stats import PERCENTILES_TO_REPORT
+from performance_tests.postprocess.postprocess_custom_stats import PostProcessCustomStats
+from performance_tests.postprocess.postprocess_result_archive import PostProcessResultArchive
+from performance_tests.postprocess.postprocess_result_evaluator import PostProcessResultEvaluator
+from performance_tests.total_users import set_total_users
+
+logger = logging.getLogger(__name__)
+
+# Run time of each cell in seconds when neither the matrix nor the run time option sets it
+DEFAULT_CELL_RUN_TIME: Final[float] = 60.0
+
+# Post-processors writing and evaluating the result of each cell, under the CSV prefix of the cell
+CELL_POSTPROCESSORS: Final[tuple[type, ...]] = (PostProcessCustomStats, PostProcessResultArchive, PostProcessResultEvaluator)
+
+MATRIX_REPORT_SUFFIX: Final[str] = "_matrix.csv"
+
+
+class EndpointMatrix(TypedDict):
+    test_endpoints: list[str] # Endpoint selections to test, as values of the test endpoints option
+    users: list[int] # Numbers of users to test each endpoint selection with
+    dataset_entries: NotRequired[list[int]] # Sizes of the dataset to test with (SDS only)
+    run_time: NotRequired[float] # Run time of each cell in seconds, the run time option if unset
+    spawn_rate: NotRequired[float] # Users started per second in each cell, the spawn rate option if unset
+
+
+class MatrixCell(TypedDict):
+    label: str # Label of the cell, suffixed to the CSV prefix of its result files
+    test_endpoints: str
+    users: int
+    dataset_entries: int | None # SDS only
+
+
+class MatrixCellResult(TypedDict):
+    cell: MatrixCell
+    exit_code: int # Exit code of the evaluation of the cell, 0 if passed
+    stats: list[dict[str, Any]] # Stats of each request of the cell, as rows of the combined report
+
+
+# Results of the cells run by the orchestrator of this process, in order, for the combined report
+matrix_cell_results: list[MatrixCellResult] = []
+
+
+def load_endpoint_matrix(file_path: str, app: App) -> EndpointMatrix:
+    """
+    Load the endpoint matrix of the app from a JSON file, in the format
+    {"<app>": {"test_endpoints": [<str>, ...], "users": [<int>, ...], "dataset_entries": [<int>, ...],
+    "run_time": <seconds>, "spawn_rate": <float>}, ...}.
+
+    Args:
+        file_path (str): the path of the endpoint matrix file
+        app (App): the app under test
+
+    Returns:
+        EndpointMatrix: the endpoint matrix of the app
+    """
+    with open(file_path) as f:
+        matrix = json.load(f)
+
+    app_matrix: EndpointMatrix = matrix.get(app, {})
+    if not app_matrix.get("test_endpoints") or not app_matrix.get("users"):
+        raise ValueError(f"Endpoint matrix {file_path} needs test endpoints and users for app {app}")
+
+    return app_matrix
+
+
+def parse_dataset_sweep(dataset_sweep: str) -> list[int]:
+    """Parse the dataset sizes of a sweep in the format "<entries>,<entries>,...", e.g. "10,1000,10000,90000" """
+    try:
+        sizes = [int(size) for size in dataset_sweep.split(",")]
+    except ValueError as e:
+        raise ValueError(f"Invalid dataset sweep: {dataset_sweep}. Expected format <entries>,<entries>,...") from e
+
+    for size in sizes:
+        if size < MIN_DATASET_ENTRIES or size > MAX_DATASET_ENTRIES:
+            raise ValueError(f"Invalid dataset sweep size: {size}. Must be between {MIN_DATASET_ENTRIES} "
+                             f"and {MAX_DATASET_ENTRIES}")
+
+    return sizes
+
+
+def get_endpoint_matrix(options: Namespace) -> EndpointMatrix | None:
+    """
+    Get the endpoint matrix to run from the options: the matrix of the endpoint matrix file, or the tested endpoints
+    and users for every size of the dataset sweep. None if neither is set.
+    """
+    dataset_sweep = getattr(options, "dataset_sweep", "")
+    if options.endpoint_matrix and dataset_sweep:
+        raise ValueError("The endpoint matrix cannot be combined with a dataset sweep")
+
+    if options.endpoint_matrix:
+        return load_endpoint_matrix(options.endpoint_matrix, config.APP)
+
+    if dataset_sweep:
+        return EndpointMatrix(
+            test_endpoints=[options.test_endpoints],
+            users=[options.num_users or 1],
+            dataset_entries=parse_dataset_sweep(dataset_sweep),
+        )
+
+    return None
+
+
+def is_endpoint_matrix_run(options: Namespace | None) -> bool:
+    """Check if the test runs the cells of an endpoint matrix or of a dataset sweep"""
+    return options is not None and bool(options.endpoint_matrix or getattr(options, "dataset_sweep", ""))
+
+
+def build_matrix_cells(matrix: EndpointMatrix) -> list[MatrixCell]:
+    """
+    Build the cells of the matrix, every endpoint selection with every number of users for every dataset size.
+    The cells are ordered by dataset size first, so that the test data is only preprocessed again when it changes.
+    """
+    cells = []
+    for dataset_entries, test_endpoints, users in itertools.product(
+        matrix.get("dataset_entries") or [None], matrix["test_endpoints"], matrix["users"]
+    ):
+        label = f"{test_endpoints}_u{users}" + (f"_d{dataset_entries}" if dataset_entries is not None else "")
+        cells.append(MatrixCell(label=label, test_endpoints=test_endpoints, users=users, dataset_entries=dataset_entries))
+
+    return cells
+
+
+def apply_matrix_cell(environment: Environment, cell: MatrixCell) -> None:
+    """
+    Set the options of a cell, sent by the master to the workers with the users to start, and the label of the cell,
+    for the files each process writes during the cell to be suffixed with it. The users option is not sent to the
+    workers, so the users of the cell are also set as the total number of users of the test.
+    """
+    options = environment.parsed_options
+    options.matrix_cell = cell["label"]
+    options.test_endpoints = cell["test_endpoints"]
+    options.num_users = cell["users"]
+    set_total_users(environment, cell["users"])
+    if cell["dataset_entries"] is not None:
+        options.dataset_entries = cell["dataset_entries"]
+
+
+def get_matrix_report_rows(cell: MatrixCell, environment: Environment) -> list[dict[str, Any]]:
+    """Get the stats of each request of a cell, as rows of the combined report"""
+    rows = []
+    for entry in [*environment.stats.entries.values(), environment.stats.total]:
+        rows.append({
+            "Cell": cell["label"],
+            "Endpoints": cell["test_endpoints"],
+            "Users": cell["users"],
+            "Dataset Entries": cell["dataset_entries"] if cell["dataset_entries"] is not None else "",
+            "Type": entry.method or "",
+            "Name": entry.name,
+            "Request Count": entry.num_requests,
+            "Failure Count": entry.num_failures,
+            "Average Response Time": entry.avg_response_time, # Rounded when the report is written
+            **{
+                f"{int(percentile * 100)}%": entry.get_response_time_percentile(percentile)
+                for percentile in PERCENTILES_TO_REPORT
+            },
+            "Requests/s": round(entry.total_rps, 2),
+        })
+
+    return rows
+
+
+def write_matrix_report(file_path: str, results: list[MatrixCellResult]) -> str:
+    """
+    Write the combined report of the matrix, one row per request of each cell with the outcome of the cell.
+
+    Args:
+        file_path (str): the path of the report
+        results (list[MatrixCellResult]): the results of the cells, in order
+
+    Returns:
+        str: the path of the report
+    """
+    rows = [
+        {**row, "Average Response Time": round(row["Average Response Time"], 2), "Passed": result["exit_code"] == 0}
+        for result in results
+        for row in result["stats"]
+    ]
+
+    with open(file_path, "w", newline="") as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=list(rows[0]) if rows else ["Cell", "Passed"])
+        writer.writeheader()
+        writer.writerows(rows)
+
+    return file_path
+
+
+def get_matrix_report_path(csv_prefix: str) -> str:
+    """Get the combined report of a matrix run, next to its CSV result files"""
+    return f"{csv_prefix}{MATRIX_REPORT_SUFFIX}"
+
+
+class EndpointMatrixOrchestrator:
+    """
+    Run the cells of an endpoint matrix one after the other in the same test: the users of a cell are started with
+    the options of the cell, stopped at the end of its run time, and its result is written and evaluated under its
+    own CSV prefix before the next cell starts. The workers stay connected across the cells, and the test data is
+    only preprocessed again when the dataset size changes.
+    """
+
+    def __init__(self, environment: Environment, cells: list[MatrixCell], run_time: float, spawn_rate: float):
+        self.environment = environment
+        self.cells = cells
+        self.run_time = run_time
+        self.spawn_rate = spawn_rate
+        self.csv_prefix = environment.parsed_options.csv_prefix
+
+    def run(self) -> None:
+        runner = self.environment.runner
+
+        # The first cell is started by Locust with the options of the cell
+        while runner.state == STATE_INIT:
+            gevent.sleep(0.1)
+
+        for index, cell in enumerate(self.cells):
+            logger.info(f"Running endpoint matrix cell {index + 1}/{len(self.cells)} {cell['label']} "
+                        f"for {self.run_time:g}s")
+            if index > 0:
+                apply_matrix_cell(self.environment, cell)
+                runner.start(cell["users"], self.spawn_rate)
+
+            gevent.sleep(self.run_time)
+
+            runner.stop()
+            while runner.state == STATE_STOPPING:
+                gevent.sleep(0.1)
+
+            matrix_cell_results.append(self.evaluate_cell(cell))
+
+        runner.quit()
+
+    def evaluate_cell(self, cell: MatrixCell) -> MatrixCellResult:
+        """Write and evaluate the result of a cell under its own CSV prefix"""
+        options = self.environment.parsed_options
+        options.run_time = self.run_time
+        options.csv_prefix = f"{self.csv_prefix}_{cell['label']}" if self.csv_prefix else None
+        try:
+            for postprocessor in CELL_POSTPROCESSORS:
+                postprocessor(None, self.environment).postprocess_master()
+        finally:
+            options.csv_prefix = self.csv_prefix
+
+        exit_code = self.environment.process_exit_code or 0
+        self.environment.process_exit_code = None
+        logger.info(f"Endpoint matrix cell {cell['label']} completed with exit code {exit_code}")
+
+        return MatrixCellResult(cell=cell, exit_code=exit_code, stats=get_matrix_report_rows(cell, self.environment))
+
+
+def register_endpoint_matrix(events: Events) -> None:
+    """
+    Run the cells of the endpoint matrix or of the dataset sweep from the master (or local) node, if either is set.
+
+    Args:
+        events (Events): the Locust events to register the listeners to
+    """
+
+    @events.init.add_listener
+    def _(environment: Environment, **kwargs):
+        options = environment.parsed_options
+        if not is_endpoint_matrix_run(options) or isinstance(environment.runner, WorkerRunner):
+            return
+
+        if not config.HEADLESS_MODE:
+            raise ValueError("The endpoint matrix and the dataset sweep require the headless mode")
+
+        if options.load_shape != NO_LOAD_SHAPE:
+            raise ValueError("The endpoint matrix and the dataset sweep cannot be combined with a load shape")
+
+        matrix = get_endpoint_matrix(options)
+        cells = build_matrix_cells(matrix)
+        run_time = matrix.get("run_time") or options.run_time or DEFAULT_CELL_RUN_TIME
+        spawn_rate = matrix.get("spawn_rate") or options.spawn_rate or 1
+
+        # Locust starts the first cell, the orchestrator stops the test after the last one
+        apply_matrix_cell(environment, cells[0])
+        options.spawn_rate = spawn_rate
+        options.run_time = None
+
+        runner_type = "master" if isinstance(environment.runner, MasterRunner) else "local"
+        logger.info(f"Running {len(cells)} endpoint matrix cells of {run_time:g}s from the {runner_type} node")
+
+        orchestrator = EndpointMatrixOrchestrator(environment, cells, run_time, spawn_rate)
+        gevent.spawn(orchestrator.run)
@@ -1,15 +1,78 @@
+import itertools
 import json
 import logging
 import random
+from argparse import Namespace
 from pathlib import Path
+from typing import Final
 
 from performance_tests.configs.config import config
+from performance_tests.locust_test import FIXED_IDENTIFIERS
+from performance_tests.open_model import REPLAY_LOAD_MODEL
+from performance_tests.unit_data_generator import UnitDataGenerator, get_unit_data_variant
 
 logger = logging.getLogger(__name__)
 
 MIN_DATASET_ENTRIES = 10
 MAX_DATASET_ENTRIES = 90000
 
+# Variant of the datasets generated with the identifiers known to every process, for the test data to be sharded or
+# the identifiers of a replayed access log to be rewritten to the identifiers of the dataset
+SHARDED_DATASET_VARIANT: Final[str] = "sharded"
+
+# First identifier of the sequence the identifiers of a sharded dataset are taken from after the fixed identifiers
+FIRST_SEQUENCE_IDENTIFIER: Final[int] = 10000
+
+
+def has_known_identifiers(options: Namespace) -> bool:
+    """
+    Check if the dataset is generated with the identifiers known to every process, which the test data is sharded
+    by and the identifiers of a replayed access log are rewritten to.
+    """
+    return getattr(options, "shard_test_data", False) or getattr(options, "load_model", None) == REPLAY_LOAD_MODEL
+
+
+def get_dataset_variant(options: Namespace) -> str:
+    """
+    Get the variant of the dataset generated for the options, from the unit data variant and whether its identifiers
+    are known to every process. Empty for the unit data file without known identifiers, the dataset then being named
+    after its size only.
+    """
+    variants = [get_unit_data_variant(options)]
+    if has_known_identifiers(options):
+        variants.append(SHARDED_DATASET_VARIANT)
+
+    return "_".join(variant for variant in variants if variant)
+
+
+def get_dataset_identifiers(dataset_entries: int) -> list[str]:
+    """
+    Get the identifiers of the sharded dataset of the given size: the fixed identifiers, then a sequence of 5 digit
+    identifiers. The identifiers are set by the size only, so that every process knows them without reading the
+    dataset.
+    """
+    sequence = (str(identifier) for identifier in itertools.count(FIRST_SEQUENCE_IDENTIFIER))
+    identifiers = itertools.chain(
+        FIXED_IDENTIFIERS, (identifier for identifier in sequence if identifier not in FIXED_IDENTIFIERS)
+    )
+
+    return list(itertools.islice(identifiers, dataset_entries))
+
+
+def get_dataset_period_id(dataset_entries: int, variant: str = "") -> str:
+    """
+    Get the period the dataset of the given size and unit data variant is published under, so that datasets of
+    different sizes are published side by side and a dataset is never reused for another size or unit data.
+    """
+    return f"{config.TEST_PERIOD_ID}_{dataset_entries}" + (f"_{variant}" if variant else "")
+
+
+def get_dataset_file(dataset_entries: int, variant: str = "") -> str:
+    """Get the file the dataset of the given size and unit data variant is generated to, and reused from by the next runs"""
+    suffix = f"_{dataset_entries}" + (f"_{variant}" if variant else "")
+
+    return config.TEST_DATASET_FILE.replace(".json", f"{suffix}.json")
+
 
 class JsonGenerator:
     def __init__(
@@ -17,8 +80,12 @@ class JsonGenerator:
         survey_id: str,
         file_name: str,
         fixed_identifiers: list[str],
+        period_id: str | None = None,
+        unit_data_generator: UnitDataGenerator | None = None,
     ):
         self.survey_id = survey_id
+        self.period_id = period_id or survey_id
+        self.unit_data_generator = unit_data_generator
         self.file_name = file_name
         self.fixed_identifiers = fixed_identifiers
         self.unit_data_from_str = None
@@ -33,7 +100,7 @@ class JsonGenerator:
         try:
             if not Path(self.file_name).is_file():
                 json_data = self._generate_json_data(
-                    dataset_entries, self.survey_id, self.fixed_identifiers
+                    dataset_entries, self.survey_id, self.fixed_identifiers, self.period_id
                 )
 
                 # Write the JSON data to a file
@@ -49,7 +116,7 @@ class JsonGenerator:
 
 
     def _generate_json_data(
-        self, dataset_entries: int, survey_id: str, fixed_identifiers: list[str]
+        self, dataset_entries: int, survey_id: str, fixed_identifiers: list[str], period_id: str | None = None
     ) -> dict[str, any]:
         """
         Generate the JSON data for the dataset file.
@@ -58,13 +125,14 @@ class JsonGenerator:
             dataset_entries (int): the number of unit data entries to generate
             survey_id (str): the survey id (locust test id)
             fixed_identifiers (list[str]): the list of fixed identifiers
+            period_id (str | None): the period id of the dataset, the survey id if unset
 
         Returns:
             dict[str, any]: the JSON data for the dataset file
         """
         data = {
             "survey_id": survey_id,
-            "period_id": survey_id,
+            "period_id": period_id or survey_id,
             "form_types": ["0001"],
             "schema_version": "v1.0.0",
             "data": [],
@@ -110,6 +178,9 @@ class JsonGenerator:
         """
         # Customize this function to generate whatever unit data you need
         # return "Example data " + str(random.randint(1, dataset_entries))
+        if self.unit_data_generator is not None:
+            return self.unit_data_generator.generate()
+
         if self.unit_data_from_str is not None:
             return self.unit_data_from_str
 
@@ -0,0 +1,354 @@
+import json
+import logging
+import re
+from argparse import Namespace
+from typing import Any, Final, NotRequired, TypedDict
+
+from locust import LoadTestShape
+from locust.env import Environment
+from locust.event import Events
+from locust.rpc import Message
+from locust.runners import MasterRunner, WorkerRunner
+
+from performance_tests.metrics.custom_request_stats import CustomRequestStats
+
+logger = logging.getLogger(__name__)
+
+NO_LOAD_SHAPE: Final[str] = "none"
+RAMP_LOAD_SHAPE: Final[str] = "ramp"
+STAIRCASE_LOAD_SHAPE: Final[str] = "staircase"
+SPIKE_LOAD_SHAPE: Final[str] = "spike"
+SOAK_LOAD_SHAPE: Final[str] = "soak"
+DIURNAL_LOAD_SHAPE: Final[str] = "diurnal"
+CUSTOM_LOAD_SHAPE: Final[str] = "custom"
+LOAD_SHAPE_CHOICES: Final[list[str]] = [
+    NO_LOAD_SHAPE,
+    RAMP_LOAD_SHAPE,
+    STAIRCASE_LOAD_SHAPE,
+    SPIKE_LOAD_SHAPE,
+    SOAK_LOAD_SHAPE,
+    DIURNAL_LOAD_SHAPE,
+    CUSTOM_LOAD_SHAPE,
+]
+
+# Duration of the shape in seconds when no run time is set
+DEFAULT_SHAPE_DURATION: Final[float] = 600.0
+
+# Parameters of each shape, overridable from the load shape file. The peak users, the spawn rate and the duration of the
+# shapes are the --users, --spawn-rate and --run-time options.
+DEFAULT_SHAPE_PARAMETERS: Final[dict[str, Any]] = {
+    "ramp_share": 0.5, # Share of the duration spent ramping up to the peak users (ramp)
+    "steps": 5, # Number of steps up to the peak users (staircase)
+    "baseline_share": 0.2, # Share of the peak users before and after the spike (spike), between the bursts (soak)
+    "spike_start": 0.3, # Share of the duration before the spike (spike)
+    "spike_share": 0.2, # Share of the duration the spike is held for (spike)
+    "burst_interval": 600.0, # Seconds between the start of two bursts (soak)
+    "burst_duration": 60.0, # Seconds each burst is held for (soak)
+    # Share of the peak users in each hour of the day, replayed over the duration (diurnal). Collection windows open at
+    # 9am, when the respondents start submitting.
+    "hourly_shares": (
+        0.05, 0.05, 0.05, 0.05, 0.05, 0.05, 0.1, 0.2, 0.5, 1.0, 0.9, 0.8,
+        0.7, 0.8, 0.8, 0.7, 0.6, 0.5, 0.4, 0.3, 0.2, 0.15, 0.1, 0.05,
+    ),
+}
+
+# Bounds of the shape parameters and of the fields of the custom stages, checked before the stages are built so that
+# every stage has a positive duration and target users
+SHARE: Final[str] = "a share between 0 and 1"
+POSITIVE_SHARE: Final[str] = "a share above 0 and up to 1"
+POSITIVE_INTEGER: Final[str] = "a positive integer"
+POSITIVE_NUMBER: Final[str] = "a positive number"
+SHAPE_PARAMETER_BOUNDS: Final[dict[str, dict[str, str]]] = {
+    RAMP_LOAD_SHAPE: {"ramp_share": POSITIVE_SHARE},
+    STAIRCASE_LOAD_SHAPE: {"steps": POSITIVE_INTEGER},
+    SPIKE_LOAD_SHAPE: {"baseline_share": SHARE, "spike_start": SHARE, "spike_share": POSITIVE_SHARE},
+    SOAK_LOAD_SHAPE: {"baseline_share": SHARE, "burst_interval": POSITIVE_NUMBER, "burst_duration": POSITIVE_NUMBER},
+}
+LOAD_STAGE_BOUNDS: Final[dict[str, str]] = {
+    "duration": POSITIVE_NUMBER,
+    "users": POSITIVE_INTEGER,
+    "spawn_rate": POSITIVE_NUMBER, # Optional
+}
+
+# Message sent by the master to the workers when the load stage changes
+LOAD_STAGE_MESSAGE: Final[str] = "load_stage"
+
+# Response times of the requests of each load stage, one stats entry per stage and request
+load_stage_stats = CustomRequestStats("load_stages")
+
+# Name of the load stage stats entries, the stage label followed by the request name
+LOAD_STAGE_REQUEST_NAME_PATTERN: Final[re.Pattern] = re.compile(r"^\[(?P<label>[^\]]+)\] (?P<name>.*)$")
+
+
+class LoadStage(TypedDict):
+    label: str # Label of the stage the requests are reported under, <kind> or <kind>_<index>
+    duration: float # Duration of the stage in seconds
+    users: int # Target number of users of the stage
+    spawn_rate: NotRequired[float] # Users started or stopped per second to reach the target, the spawn rate option if unset
+
+
+def get_stage_kind(label: str) -> str:
+    """Get the kind of a stage from its label, e.g. step for step_3, to look up its thresholds"""
+    return label.split("_")[0]
+
+
+def get_load_stage_request_name(label: str, name: str) -> str:
+    """Get the name of the load stage stats entry of a request"""
+    return f"[{label}] {name}"
+
+
+def split_load_stage_request_name(stage_request_name: str) -> tuple[str, str]:
+    """Get the stage label and the request name of a load stage stats entry"""
+    match = LOAD_STAGE_REQUEST_NAME_PATTERN.match(stage_request_name)
+    if match is None:
+        raise ValueError(f"{stage_request_name} is not a load stage request name")
+
+    return match["label"], match["name"]
+
+
+def is_within_bounds(value: Any, bounds: str) -> bool:
+    """Check if a shape parameter or a stage field is a number within the given bounds"""
+    if isinstance(value, bool) or not isinstance(value, int | float):
+        return False
+
+    if bounds == POSITIVE_INTEGER:
+        return isinstance(value, int) and value > 0
+
+    if bounds == POSITIVE_NUMBER:
+        return value > 0
+
+    return 0 <= value <= 1 and (value > 0 or bounds == SHARE)
+
+
+def check_bounds(name: str, value: Any, bounds: str) -> None:
+    if not is_within_bounds(value, bounds):
+        raise ValueError(f"Load shape parameter {name} must be {bounds}, got {value!r}")
+
+
+def validate_load_stage(stage: dict[str, Any]) -> None:
+    """Check that a stage of the custom load shape has a label, a positive duration, users and spawn rate"""
+    if not isinstance(stage.get("label"), str) or not stage["label"]:
+        raise ValueError(f"Load stage {stage!r} must have a label")
+
+    for field, bounds in LOAD_STAGE_BOUNDS.items():
+        if (field in stage or field != "spawn_rate") and not is_within_bounds(stage.get(field), bounds):
+            raise ValueError(f"Load stage {stage['label']} {field} must be {bounds}, got {stage.get(field)!r}")
+
+
+def validate_shape_parameters(shape: str, duration: float, parameters: dict[str, Any]) -> None:
+    """
+    Check the parameters of a load shape, so that every stage has a positive duration and target users.
+
+    Raises:
+        ValueError: if a parameter of the shape is out of its bounds, or a stage of the custom shape is invalid
+    """
+    if not is_within_bounds(duration, POSITIVE_NUMBER):
+        raise ValueError(f"The load shape duration must be {POSITIVE_NUMBER}, got {duration!r}")
+
+    for name, bounds in SHAPE_PARAMETER_BOUNDS.get(shape, {}).items():
+        check_bounds(name, parameters[name], bounds)
+
+    if shape == SPIKE_LOAD_SHAPE and parameters["spike_start"] + parameters["spike_share"] > 1:
+        raise ValueError(f"Load shape parameters spike_start and spike_share must add up to at most 1, got "
+                         f"{parameters['spike_start']!r} and {parameters['spike_share']!r}")
+
+    if shape == DIURNAL_LOAD_SHAPE:
+        hourly_shares = parameters["hourly_shares"]
+        if not isinstance(hourly_shares, list | tuple) or not hourly_shares:
+            raise ValueError(f"Load shape parameter hourly_shares must be a list of shares, got {hourly_shares!r}")
+
+        for hour, share in enumerate(hourly_shares):
+            check_bounds(f"hourly_shares[{hour}]", share, SHARE)
+
+    if shape == CUSTOM_LOAD_SHAPE:
+        if not parameters.get("stages"):
+            raise ValueError("The custom load shape requires the stages in the load shape file")
+
+        for stage in parameters["stages"]:
+            validate_load_stage(stage)
+
+
+def build_load_stages(
+        shape: str,
+        users: int,
+        spawn_rate: float,
+        duration: float,
+        parameters: dict[str, Any] | None = None,
+) -> list[LoadStage]:
+    """
+    Build the stages of a load shape.
+
+    Args:
+        shape (str): the load shape, one of LOAD_SHAPE_CHOICES
+        users (int): the peak number of users
+        spawn_rate (float): the spawn rate of the stages that do not set their own
+        duration (float): the duration of the shape in seconds
+        parameters (dict | None): the shape parameters overriding the defaults, and the stages of the custom shape
+
+    Returns:
+        list[LoadStage]: the stages of the shape
+
+    Raises:
+        ValueError: if the shape is unknown, or its parameters are invalid
+    """
+    parameters = {**DEFAULT_SHAPE_PARAMETERS, **(parameters or {})}
+    validate_shape_parameters(shape, duration, parameters)
+    baseline_users = max(1, round(users * parameters["baseline_share"]))
+
+    if shape == RAMP_LOAD_SHAPE:
+        ramp_duration = duration * parameters["ramp_share"]
+        return [
+            LoadStage(label="ramp", duration=ramp_duration, users=users, spawn_rate=users / ramp_duration),
+            LoadStage(label="hold", duration=duration - ramp_duration, users=users),
+        ]
+
+    if shape == STAIRCASE_LOAD_SHAPE:
+        steps = int(parameters["steps"])
+        return [
+            LoadStage(label=f"step_{step}", duration=duration / steps, users=max(1, round(users * step / steps)))
+            for step in range(1, steps + 1)
+        ]
+
+    if shape == SPIKE_LOAD_SHAPE:
+        # The spike starts and ends as fast as the users can be started and stopped
+        spike_start = duration * parameters["spike_start"]
+        spike_duration = duration * parameters["spike_share"]
+        return [
+            LoadStage(label="baseline", duration=spike_start, users=baseline_users),
+            LoadStage(label="spike", duration=spike_duration, users=users, spawn_rate=users),
+            LoadStage(label="recovery", duration=duration - spike_start - spike_duration, users=baseline_users,
+                      spawn_rate=users),
+        ]
+
+    if shape == SOAK_LOAD_SHAPE:
+        stages = []
+        burst_interval = parameters["burst_interval"]
+        burst_duration = min(parameters["burst_duration"], burst_interval)
+        elapsed = 0.0
+        while elapsed < duration:
+            soak_duration = min(burst_interval - burst_duration, duration - elapsed)
+            stages.append(LoadStage(label="soak", duration=soak_duration, users=baseline_users))
+            elapsed += soak_duration
+            if elapsed < duration:
+                stages.append(LoadStage(label="burst", duration=min(burst_duration, duration - elapsed), users=users,
+                                        spawn_rate=users))
+                elapsed += burst_duration
+
+        return stages
+
+    if shape == DIURNAL_LOAD_SHAPE:
+        hourly_shares = parameters["hourly_shares"]
+        return [
+            LoadStage(label=f"hour_{hour:02d}", duration=duration / len(hourly_shares), users=max(1, round(users * share)))
+            for hour, share in enumerate(hourly_shares)
+        ]
+
+    if shape == CUSTOM_LOAD_SHAPE:
+        return [LoadStage(**stage) for stage in parameters["stages"]]
+
+    raise ValueError(f"Unknown load shape: {shape}")
+
+
+def load_shape_parameters(file_path: str) -> dict[str, Any]:
+    """
+    Load the shape parameters from a JSON file, in the format {"<parameter>": <value>, ...} with the parameters of
+    DEFAULT_SHAPE_PARAMETERS, and {"stages": [{"label": <str>, "duration": <seconds>, "users": <int>,
+    "spawn_rate": <float>}, ...]} for the custom shape.
+    """
+    if not file_path:
+        return {}
+
+    with open(file_path) as f:
+        return json.load(f)
+
+
+def get_load_stages(options: Namespace) -> list[LoadStage]:
+    """Build the stages of the load shape selected with the options, from the peak users, spawn rate and run time"""
+    return build_load_stages(
+        options.load_shape,
+        options.num_users or 1,
+        options.spawn_rate or 1,
+        options.run_time or DEFAULT_SHAPE_DURATION,
+        load_shape_parameters(options.load_shape_file),
+    )
+
+
+class LoadShape(LoadTestShape):
+    """
+    Load shape selected with the --load-shape option, built from the peak users, spawn rate and run time options.
+    The master labels the requests of each stage by sending the stage to the workers as it starts.
+    Without a load shape the class is removed from the environment and the users are started as usual.
+    """
+
+    use_common_options = True
+
+    def __init__(self):
+        super().__init__()
+        self.stages: list[LoadStage] | None = None
+        self.current_label: str | None = None
+
+    def get_stages(self) -> list[LoadStage]:
+        return get_load_stages(self.runner.environment.parsed_options)
+
+    def tick(self) -> tuple[int, float] | None:
+        if self.stages is None:
+            self.stages = self.get_stages()
+
+        run_time = self.get_run_time()
+        stage_end = 0.0
+        for stage in self.stages:
+            stage_end += stage["duration"]
+            if run_time < stage_end:
+                spawn_rate = stage.get("spawn_rate", self.runner.environment.parsed_options.spawn_rate or 1)
+                self.start_stage(stage, spawn_rate)
+                return stage["users"], spawn_rate
+
+        return None
+
+    def start_stage(self, stage: LoadStage, spawn_rate: float) -> None:
+        if stage["label"] == self.current_label:
+            return
+
+        self.current_label = stage["label"]
+        logger.info(f"Load stage {stage['label']} started: {stage['users']} users at {spawn_rate:g} users/s "
+                    f"for {stage['duration']:g}s")
+        self.runner.send_message(LOAD_STAGE_MESSAGE, stage["label"])
+
+
+def register_load_stages(events: Events) -> None:
+    """
+    Register the load stage stats to be merged on the master node and written to the CSV result, and label the
+    requests of every process generating load with the current stage, if a load shape is selected.
+    Without a load shape, the load shape class is removed so that the users are started from the users option.
+
+    Args:
+        events (Events): the Locust events to register the listeners to
+    """
+    load_stage_stats.register(events)
+
+    @events.init.add_listener
+    def _(environment: Environment, **kwargs):
+        if environment.parsed_options is None or environment.parsed_options.load_shape == NO_LOAD_SHAPE:
+            environment.shape_class = None
+            return
+
+        if not isinstance(environment.runner, WorkerRunner):
+            # Check the shape parameters as the test is set up, rather than once the shape has started
+            get_load_stages(environment.parsed_options)
+
+        current_stage: dict[str, str | None] = {"label": None}
+
+        def on_load_stage(msg: Message, **kwargs) -> None:
+            current_stage["label"] = msg.data
+
+        def on_request(request_type: str, name: str, response_time: float, **kwargs) -> None:
+            if current_stage["label"]:
+                load_stage_stats.log(request_type, get_load_stage_request_name(current_stage["label"], name), response_time)
+
+        if not isinstance(environment.runner, MasterRunner):
+            environment.runner.register_message(LOAD_STAGE_MESSAGE, on_load_stage)
+            environment.events.request.add_listener(on_request)
+
+        if isinstance(environment.runner, WorkerRunner):
+            # The worker does not run the shape, the master does
+            environment.shape_class = None
@@ -3,15 +3,19 @@ import json
 import logging
 import os
 import subprocess
-import time
 from http import HTTPStatus
 
+import gevent
 import google.oauth2.id_token
 import requests
+from gevent import Greenlet
 from google.cloud import exceptions, storage
 from google.cloud.storage import Bucket
 
 from performance_tests.configs.config import config
+from performance_tests.delete_firestore_locust_test_data import delete_firestore_locust_test_data
+from performance_tests.mock_service.mock_providers import LocalBucket, get_mock_header
+from performance_tests.setup_engine import setup_engine
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +25,9 @@ class LocustHelper:
     sds_get_dataset_metadata_url: str = "/v1/dataset_metadata"
     sds_get_schema_metadata_url: str = "/v1/schema_metadata"
 
+    mock_scheduler_run_url: str = "/mock/scheduler/run"
+    mock_schemas_url: str = "/mock/schemas"
+
     cir_schema_url: str = "/collection-instruments"
     cir_schema_metadata_url: str = "/collection-instruments/metadata"
 
@@ -44,6 +51,9 @@ class LocustHelper:
     @staticmethod
     def set_header() -> dict:
         """Set header for SDS requests"""
+        if config.MOCK_MODE:
+            return get_mock_header()
+
         auth_req = google.auth.transport.requests.Request()
         auth_token = google.oauth2.id_token.fetch_id_token(
             auth_req, audience=config.OAUTH_CLIENT_ID
@@ -55,13 +65,16 @@ class LocustHelper:
         }
 
     @staticmethod
-    def get_bucket(bucket_name: str) -> Bucket | None:
+    def get_bucket(bucket_name: str) -> Bucket | LocalBucket | None:
         """
-        Get bucket
+        Get bucket, or its local stand-in in mock mode
 
         Args:
             bucket_name (str): the name of the bucket
         """
+        if config.MOCK_MODE:
+            return LocalBucket(bucket_name)
+
         storage_client = storage.Client()
         try:
             bucket = storage_client.get_bucket(
@@ -129,7 +142,7 @@ class LocustHelper:
                     return 1
 
             attempts -= 1
-            time.sleep(backoff)
+            gevent.sleep(backoff)
             backoff += backoff
 
         logger.error(f"Error. Uploaded file is not found: {file}.")
@@ -167,7 +180,7 @@ class LocustHelper:
                     return dataset_metadata["dataset_id"]
 
             attempts -= 1
-            time.sleep(backoff)
+            gevent.sleep(backoff)
             backoff += backoff
 
         logger.error(f"Error getting dataset id using survey_id: {survey_id} and period_id: {period_id}.")
@@ -193,6 +206,10 @@ class LocustHelper:
         A script to force run the schedule job to trigger the new dataset upload function.
         """
         # Note: This is a workaround to force run the cloud scheduler to trigger the new dataset upload function.
+        if config.MOCK_MODE:
+            requests.post(f"{config.BASE_URL}{LocustHelper.mock_scheduler_run_url}", headers=get_mock_header(), timeout=60)
+            return
+
         subprocess.run(
             [
                 "python",
@@ -254,7 +271,7 @@ class LocustHelper:
                     return schema_metadata["guid"]
 
             attempts -= 1
-            time.sleep(backoff)
+            gevent.sleep(backoff)
             backoff += backoff
 
         logger.error(f"Error getting schema guid using survey_id: {survey_id}.")
@@ -280,6 +297,29 @@ class LocustHelper:
 
         return response
 
+    def get_sds_schema_guids(
+        self,
+        headers: dict,
+        base_url: str,
+        survey_id: str,
+    ) -> list[str] | None:
+        """
+        Get the guids of all the schema versions of a survey from SDS
+
+        Returns:
+            list[str] | None: the schema guids, empty if the survey has no schema, None if the request failed
+        """
+        response = self.get_sds_schema_metadata(headers, base_url, survey_id)
+
+        if response.status_code == HTTPStatus.NOT_FOUND:
+            return []
+
+        if response.status_code != HTTPStatus.OK:
+            logger.error(f"Error getting schema guids using survey_id: {survey_id}. Status code: {response.status_code}")
+            return None
+
+        return [schema_metadata["guid"] for schema_metadata in response.json()]
+
     def get_sds_dataset_metadata(
         self,
         headers: dict,
@@ -334,17 +374,29 @@ class LocustHelper:
         return 1
 
 
-    def map_schema_payload(self, payload: dict) -> dict:
+    def map_schema_payload(
+            self,
+            payload: dict,
+            survey_id: str = config.TEST_SURVEY_ID,
+            form_type: str = config.TEST_CI_CLASSIFIER_VALUE,
+            language: str = config.TEST_CI_LANGUAGE,
+    ) -> dict:
         """Maps schema payload with the actual values
 
+        Args:
+            payload (dict): the payload with placeholders
+            survey_id (str): the survey id to set in the payload
+            form_type (str): the form type to set in the payload
+            language (str): the language to set in the payload
+
         Returns:
             dict: the mapped payload
         """
         # replace placeholders in payload with actual values
         payload_str = json.dumps(payload)
-        payload_str = payload_str.replace(self.cir_ci_survey_id_placeholder, config.TEST_SURVEY_ID)
-        payload_str = payload_str.replace(self.cir_ci_form_type_placeholder, config.TEST_CI_CLASSIFIER_VALUE)
-        payload_str = payload_str.replace(self.cir_ci_language_placeholder, config.TEST_CI_LANGUAGE)
+        payload_str = payload_str.replace(self.cir_ci_survey_id_placeholder, survey_id)
+        payload_str = payload_str.replace(self.cir_ci_form_type_placeholder, form_type)
+        payload_str = payload_str.replace(self.cir_ci_language_placeholder, language)
         payload_mapped = json.loads(payload_str)
 
         return payload_mapped
@@ -356,7 +408,10 @@ class LocustHelper:
             base_url: str,
             guid: str,
             validator_version: str,
-            payload: dict
+            payload: dict,
+            survey_id: str = config.TEST_SURVEY_ID,
+            form_type: str = config.TEST_CI_CLASSIFIER_VALUE,
+            language: str = config.TEST_CI_LANGUAGE,
     ) -> int:
         """Creates CI schema for testing purposes
 
@@ -366,11 +421,14 @@ class LocustHelper:
             guid (str): the guid for the CI schema
             validator_version (str): the validator version for the CI schema
             payload (json): json to be sent to API
+            survey_id (str): the survey id of the CI schema
+            form_type (str): the form type of the CI schema
+            language (str): the language of the CI schema
 
         Returns:
             int: 1 if the CI schema record is created successfully, -1 otherwise
         """
-        payload_mapped = self.map_schema_payload(payload)
+        payload_mapped = self.map_schema_payload(payload, survey_id, form_type, language)
 
         response = requests.post(
             f"{base_url}{self.cir_schema_url}?guid={guid}&validator_version={validator_version}",
@@ -409,6 +467,39 @@ class LocustHelper:
 
         return response
 
+    def get_cir_schema_guids(
+        self,
+        headers: dict,
+        base_url: str,
+        classifier_type: str,
+        classifier_value: str,
+        language: str,
+        survey_id: str,
+    ) -> list[str] | None:
+        """
+        Get the guids of all the CI schemas matching the classifier, language and survey from CIR
+
+        Returns:
+            list[str] | None: the CI schema guids, empty if there is no CI schema, None if the request failed
+        """
+        response = self.get_cir_schema_metadata(
+            headers=headers,
+            base_url=base_url,
+            classifier_type=classifier_type,
+            classifier_value=classifier_value,
+            language=language,
+            survey_id=survey_id,
+        )
+
+        if response.status_code == HTTPStatus.NOT_FOUND:
+            return []
+
+        if response.status_code != HTTPStatus.OK:
+            logger.error(f"Error getting CI schema guids using survey_id: {survey_id}. Status code: {response.status_code}")
+            return None
+
+        return [schema_metadata["guid"] for schema_metadata in response.json()]
+
     # Wait and get schema guid from SDS
     def wait_and_get_cir_schema_guid(
             self,
@@ -452,7 +543,7 @@ class LocustHelper:
                     return schema_metadata["guid"]
 
             attempts -= 1
-            time.sleep(backoff)
+            gevent.sleep(backoff)
             backoff += backoff
 
         logger.error(f"Error getting CI schema guid using survey_id: {survey_id} form_type: {classifier_value} and language: {language}.")
@@ -488,3 +579,76 @@ class LocustHelper:
         logger.info(f"Called delete CI schema. Status code: {response.status_code}.")
 
         return 1
+
+    @staticmethod
+    def delete_sds_schema_records_after_test(survey_id: str) -> int:
+        """Deletes the schema records of a survey from the SDS database after test
+
+        Args:
+            survey_id (str): the survey id
+
+        Returns:
+            int: 1 if the schema records are deleted successfully, -1 otherwise
+        """
+        if config.MOCK_MODE:
+            response = requests.delete(
+                f"{config.BASE_URL}{LocustHelper.mock_schemas_url}?survey_id={survey_id}",
+                headers=get_mock_header(),
+                timeout=60,
+            )
+            if response.status_code != HTTPStatus.OK:
+                logger.error(f"Error deleting schema records using survey_id: {survey_id}. Status code: {response.status_code}")
+                return -1
+
+            return 1
+
+        try:
+            delete_firestore_locust_test_data(config.PROJECT_ID, config.FIRESTORE_DB_NAME, survey_id)
+        except RuntimeError:
+            logger.error(f"Error deleting schema records using survey_id: {survey_id}.")
+            return -1
+
+        logger.info(f"Deleted schema records using survey_id: {survey_id}.")
+
+        return 1
+
+    # Async variants of the HTTP, storage and Firestore calls, started within the concurrency limit of the setup engine.
+    # Each returns the greenlet of the call, whose `get` returns the result of the blocking variant.
+
+    def get_sds_schema_guids_async(self, *args, **kwargs) -> Greenlet:
+        """Get the guids of all the schema versions of a survey from SDS without blocking"""
+        return setup_engine.spawn(self.get_sds_schema_guids, *args, **kwargs)
+
+    def get_cir_schema_guids_async(self, *args, **kwargs) -> Greenlet:
+        """Get the guids of the CI schemas matching the classifier, language and survey from CIR without blocking"""
+        return setup_engine.spawn(self.get_cir_schema_guids, *args, **kwargs)
+
+    def create_sds_schema_record_before_test_async(self, *args, **kwargs) -> Greenlet:
+        """Create a schema for testing purposes without blocking"""
+        return setup_engine.spawn(self.create_sds_schema_record_before_test, *args, **kwargs)
+
+    def create_cir_schema_record_before_test_async(self, *args, **kwargs) -> Greenlet:
+        """Create a CI schema for testing purposes without blocking"""
+        return setup_engine.spawn(self.create_cir_schema_record_before_test, *args, **kwargs)
+
+    def delete_cir_schema_record_after_test_async(self, *args, **kwargs) -> Greenlet:
+        """Delete the CI schema records of a survey after test without blocking"""
+        return setup_engine.spawn(self.delete_cir_schema_record_after_test, *args, **kwargs)
+
+    def upload_file_to_bucket_async(self, *args, **kwargs) -> Greenlet:
+        """Upload a file to the specified bucket without blocking"""
+        return setup_engine.spawn(self.upload_file_to_bucket, *args, **kwargs)
+
+    def delete_all_files_from_bucket_async(self, *args, **kwargs) -> Greenlet:
+        """Delete all files from the specified bucket without blocking"""
+        return setup_engine.spawn(self.delete_all_files_from_bucket, *args, **kwargs)
+
+    def delete_sds_schema_records_after_test_async(self, survey_id: str) -> Greenlet:
+        """
+        Delete the schema records of a survey from the SDS database after test without blocking. The Firestore client
+        blocks the gevent loop, so the deletion runs in the thread pool outside of mock mode.
+        """
+        if config.MOCK_MODE:
+            return setup_engine.spawn(self.delete_sds_schema_records_after_test, survey_id)
+
+        return setup_engine.spawn_blocking(self.delete_sds_schema_records_after_test, survey_id)
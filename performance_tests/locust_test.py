@@ -1,2 +1,4 @@
 LOCUST_TEST_ID = "locust_test_123"
 FIXED_IDENTIFIERS = ["43532", "65871"]
+LOCUST_COLD_POOL_ID = "locust_test_123_cold"
+LOCUST_SEED_ID = "locust_test_123_seed"
@@ -1,37 +1,231 @@
+import json
 import logging
+import math
 from collections.abc import Callable
+from typing import Any, ClassVar
 
+import gevent
+
+from performance_tests.access_log_replay import AccessLogReplay, ReplayRequest, get_replay_partition
+from performance_tests.configs.config import config
 from performance_tests.configs.endpoints_config import EndpointConfig
+from performance_tests.configs.journeys_config import JOURNEY_REQUEST_TYPE, JourneyConfig
 from performance_tests.configs.runtime_config import RuntimeConfig
+from performance_tests.configs.traffic_profile import TrafficProfileEntry, get_traffic_profile_weights
+from performance_tests.open_model import (
+    OPEN_LOAD_MODEL,
+    REPLAY_LOAD_MODEL,
+    ArrivalRateSchedule,
+    ArrivalRateScheduler,
+    get_user_rate_share,
+    parse_arrival_rate_schedule,
+)
 
 logger = logging.getLogger(__name__)
 
 
 class LocustTestsFactory:
-    def __init__(self, endpoint_configs: dict[str, EndpointConfig]):
+    # Task tables compiled once per process, keyed by load model, endpoints and journeys, and traffic profile
+    _task_tables: ClassVar[dict[tuple[str, tuple[str, ...], str], list[Callable]]] = {}
+
+    def __init__(
+            self,
+            endpoint_configs: dict[str, EndpointConfig],
+            traffic_profile: dict[str, TrafficProfileEntry] | None = None,
+            journey_configs: dict[str, JourneyConfig] | None = None,
+    ):
         self.endpoint_configs = endpoint_configs
+        self.traffic_profile = traffic_profile
+        self.journey_configs = journey_configs or {}
+
+    def get_task_keys(self) -> list[str]:
+        """Get the keys of the endpoints and journeys to create tasks for, in order"""
+        return [*self.endpoint_configs, *self.journey_configs]
+
+    def get_task_table(self, runtime_config: RuntimeConfig, load_model: str) -> list[Callable]:
+        """
+        Get the task table of the user for the given load model. The table is compiled on first use and then
+        shared by all the users of the process.
+        """
+        task_table_key = (load_model, tuple(self.get_task_keys()), json.dumps(self.traffic_profile, sort_keys=True))
+
+        if task_table_key not in self._task_tables:
+            if load_model == OPEN_LOAD_MODEL:
+                task_table = self.populate_open_model_tasks(runtime_config)
+            elif load_model == REPLAY_LOAD_MODEL:
+                task_table = self.populate_replay_tasks(runtime_config)
+            else:
+                task_table = self.compile_weighted_task_table(self.populate_locust_tasks(runtime_config))
+
+            self._task_tables[task_table_key] = task_table
+
+        return self._task_tables[task_table_key]
+
+    def compile_weighted_task_table(self, locust_tasks: list[Callable]) -> list[Callable]:
+        """
+        Compile the tasks into a table where each task appears in proportion to the traffic profile weight of its
+        endpoint or journey. Without a traffic profile, every endpoint and journey has the same weight.
+
+        Args:
+            locust_tasks (list[Callable]): the tasks in the order of the task keys
+
+        Returns:
+            list[Callable]: the weighted task table Locust picks the tasks from at random
+        """
+        if not self.traffic_profile:
+            return locust_tasks
+
+        weights = get_traffic_profile_weights(self.traffic_profile)
+        task_weights = [weights[task_key] for task_key in self.get_task_keys()]
+        weights_gcd = math.gcd(*task_weights)
+
+        task_table = []
+        for locust_task, weight in zip(locust_tasks, task_weights, strict=True):
+            task_table.extend([locust_task] * (weight // weights_gcd))
+
+        logger.info(f"Compiled weighted task table of {len(task_table)} entries for endpoints and journeys: "
+                    f"{dict(zip(self.get_task_keys(), task_weights, strict=True))}")
+
+        return task_table
+
+    def send_task(self, user, task_key: str, runtime_config: RuntimeConfig) -> None:
+        """Send the request of an endpoint, or run the steps of a journey"""
+        if task_key in self.journey_configs:
+            user.journeys_helpers.run_journey(user, task_key, runtime_config)
+        else:
+            user.endpoint_helpers.send_request(
+                client=user.client,
+                endpoint_name=task_key,
+                runtime_config=runtime_config,
+            )
+
+    def get_task_stats_key(self, user, task_key: str) -> tuple[str, str]:
+        """Get the method and name the requests of an endpoint or journey are reported under in the stats"""
+        if task_key in self.journey_configs:
+            return JOURNEY_REQUEST_TYPE, user.journeys_helpers.get_journey_request_name(task_key)
+
+        return user.endpoint_helpers.get_endpoint_method(task_key), user.endpoint_helpers.get_request_name(task_key)
 
     def populate_locust_tasks(self, runtime_config: RuntimeConfig) -> list[Callable]:
         locust_tasks = []
-        for endpoint_name in self.endpoint_configs:
-            logger.info(f"Creating test method for endpoint: {endpoint_name}")
+        for task_key in self.get_task_keys():
+            logger.info(f"Creating test method for: {task_key}")
 
-            # Closure function to create a test method for an endpoint
-            def create_test_method(endpoint):
+            # Closure function to create a test method for an endpoint or journey
+            def create_test_method(key):
                 def test_method(user):
-                    selected_endpoints = user.environment.parsed_options.test_endpoints
-
-                    if selected_endpoints not in ("all", endpoint):
-                        pass
-                    else:
-                        user.endpoint_helpers.send_request(
-                            client=user.client,
-                            endpoint_name=endpoint,
-                            runtime_config=runtime_config,
-                        )
+                    self.send_task(user, key, runtime_config)
 
                 return test_method
 
-            locust_tasks.append(create_test_method(endpoint_name))
+            locust_tasks.append(create_test_method(task_key))
 
         return locust_tasks
+
+    def get_open_model_arrival_rates(self, base_schedule: ArrivalRateSchedule) -> dict[str, tuple[ArrivalRateSchedule, float]]:
+        """
+        Get the arrival rate schedule and rate factor of each endpoint and journey. Without a traffic profile, each
+        of them follows the base schedule. With a traffic profile, the base schedule is the total arrival rate split
+        across them by weight, and the ones with a rate are held at that rate instead.
+
+        Args:
+            base_schedule (ArrivalRateSchedule): the schedule set by the arrival rate options
+
+        Returns:
+            dict[str, tuple[ArrivalRateSchedule, float]]: the schedule and the factor applied to it for each task key
+        """
+        if not self.traffic_profile:
+            return dict.fromkeys(self.get_task_keys(), (base_schedule, 1.0))
+
+        total_weight = sum(entry.get("weight", 0) for entry in self.traffic_profile.values() if "rate" not in entry)
+
+        arrival_rates = {}
+        for task_key in self.get_task_keys():
+            entry = self.traffic_profile[task_key]
+            if "rate" in entry:
+                arrival_rates[task_key] = (ArrivalRateSchedule(parse_arrival_rate_schedule(None, entry["rate"])), 1.0)
+            else:
+                arrival_rates[task_key] = (base_schedule, entry["weight"] / total_weight)
+
+        return arrival_rates
+
+    def populate_open_model_tasks(self, runtime_config: RuntimeConfig) -> list[Callable]:
+        """
+        Populate a single task driving all the endpoints and journeys at their target arrival rate. The task never
+        returns, the requests are sent from their own greenlets at the intended send times until the user is stopped.
+        """
+        task_keys = self.get_task_keys()
+        logger.info(f"Creating open model test method for: {task_keys}")
+
+        def open_model_test_method(user):
+            parsed_options = user.environment.parsed_options
+            base_schedule = ArrivalRateSchedule(
+                parse_arrival_rate_schedule(parsed_options.arrival_rate_schedule, parsed_options.arrival_rate)
+            )
+            arrival_rates = self.get_open_model_arrival_rates(base_schedule)
+            user_rate_share = get_user_rate_share(user.environment)
+
+            def create_send_method(key):
+                def send_method():
+                    self.send_task(user, key, runtime_config)
+
+                return send_method
+
+            schedulers = []
+            for task_key in task_keys:
+                schedule, rate_factor = arrival_rates[task_key]
+                scheduler = ArrivalRateScheduler(schedule, user_rate_share * rate_factor, config.OPEN_MODEL_MAX_IN_FLIGHT)
+                schedulers.append(
+                    gevent.spawn(scheduler.run, create_send_method(task_key), *self.get_task_stats_key(user, task_key))
+                )
+
+            try:
+                gevent.joinall(schedulers)
+            finally:
+                gevent.killall(schedulers)
+
+        return [open_model_test_method]
+
+    def populate_replay_tasks(self, runtime_config: RuntimeConfig) -> list[Callable]:
+        """
+        Populate a single task replaying the slice of the access log of the process onto the endpoints. The replay is
+        shared by the users of the process: one user sends the requests while the others idle, and another user
+        resumes the replay where it stopped if that user is stopped.
+        """
+        logger.info(f"Creating replay test method for: {list(self.endpoint_configs)}")
+        replay_state: dict[str, Any] = {"replay": None, "user": None}
+
+        def replay_test_method(user):
+            if replay_state["user"] is not None:
+                # Another user of the process is replaying the log
+                gevent.sleep(1)
+                return
+
+            parsed_options = user.environment.parsed_options
+            if replay_state["replay"] is None:
+                replay_state["replay"] = AccessLogReplay(
+                    parsed_options.replay_log,
+                    self.endpoint_configs,
+                    runtime_config,
+                    parsed_options.replay_speedup,
+                    *get_replay_partition(user.environment),
+                )
+
+            def send_method(request: ReplayRequest):
+                user.endpoint_helpers.send_request(
+                    client=user.client,
+                    endpoint_name=request["endpoint_name"],
+                    runtime_config=runtime_config,
+                    param_overrides=request["param_overrides"],
+                )
+
+            def get_stats_key(endpoint_name: str) -> tuple[str, str]:
+                return self.get_task_stats_key(user, endpoint_name)
+
+            replay_state["user"] = user
+            try:
+                replay_state["replay"].run(send_method, get_stats_key, config.OPEN_MODEL_MAX_IN_FLIGHT)
+            finally:
+                replay_state["user"] = None
+
+        return [replay_test_method]
@@ -5,22 +5,59 @@ from typing import Final
 import gevent
 from locust import FastHttpUser, between, events
 from locust.env import Environment
-from locust.runners import MasterRunner
+from locust.runners import MasterRunner, WorkerRunner
 
+from performance_tests.cache_key_pool import CACHE_MODE_CHOICES, WARM_CACHE_MODE
 from performance_tests.configs.config import App, config
 from performance_tests.configs.endpoints_config import ENDPOINTS_CONFIG, EndpointConfig
 from performance_tests.configs.endpoints_helpers import EndpointsHelpers
+from performance_tests.configs.journeys_config import JOURNEYS_CONFIG, JourneyConfig
+from performance_tests.configs.journeys_helpers import JourneysHelpers
 from performance_tests.configs.runtime_config import RuntimeConfig
+from performance_tests.configs.traffic_profile import load_traffic_profile
+from performance_tests.endpoint_matrix import register_endpoint_matrix
+from performance_tests.load_shape import (  # LoadShape is picked up by Locust as the load shape of the locustfile
+    LOAD_SHAPE_CHOICES,
+    NO_LOAD_SHAPE,
+    LoadShape,  # noqa: F401
+    register_load_stages,
+)
 from performance_tests.locust_helper import LocustHelper
 from performance_tests.locust_tests_factory import LocustTestsFactory
+from performance_tests.metrics.body_streaming import DEFAULT_BODY_CHUNK_SIZE, body_streaming_stats
+from performance_tests.metrics.client_health import register_client_health_sampler
+from performance_tests.metrics.http_phase_timing import http_phase_stats, instrument_session
+from performance_tests.metrics.openmetrics_exporter import register_openmetrics_exporter
+from performance_tests.metrics.trace_log import register_trace_log
+from performance_tests.open_model import (
+    CLOSED_LOAD_MODEL,
+    LOAD_MODEL_CHOICES,
+    corrected_latency_stats,
+    schedule_lag_stats,
+)
 from performance_tests.postprocess.postprocess_mapper import PostprocessMapper
 from performance_tests.preprocess.preprocess_mapper import PreprocessMapper
+from performance_tests.preprocess_manifest import (
+    DEFAULT_PREPROCESS_MANIFEST_MAX_AGE,
+    load_reusable_preprocess_manifest,
+    save_preprocess_manifest,
+)
+from performance_tests.response_validation import DEFAULT_RESPONSE_VALIDATION_RATE, ResponseValidator
+from performance_tests.result_evaluation.thresholds import THRESHOLDS_BASELINE_TOLERANCE
+from performance_tests.setup_engine import DEFAULT_SETUP_CONCURRENCY, run_concurrently, setup_engine
+from performance_tests.test_data_shard import DEFAULT_SHARD_OVERLAP
+from performance_tests.total_users import register_total_users
+from performance_tests.unique_value_generator import register_unique_value_generator
+from performance_tests.unit_data_generator import FILE_UNIT_DATA_SIZE, UNIT_DATA_SIZE_CHOICES
 
 logger = logging.getLogger(__name__)
 
 # Set test endpoints
 TEST_ENDPOINTS_CONFIG: Final[dict] = ENDPOINTS_CONFIG.get(config.APP)
 
+# Set test journeys
+TEST_JOURNEYS_CONFIG: Final[dict] = JOURNEYS_CONFIG.get(config.APP)
+
 # Set up runtime config to store runtime values that are needed across different test methods and processes
 runtime_config: RuntimeConfig = RuntimeConfig()
 
@@ -30,6 +67,31 @@ locust_helper: LocustHelper = LocustHelper()
 # Set the path for CSV result files for headless mode.
 locust_helper.set_csv_result_path()
 
+# Register the open model stats to be merged on the master node and written to the CSV result
+schedule_lag_stats.register(events)
+corrected_latency_stats.register(events)
+
+# Register the HTTP phase timing stats to be merged on the master node and written to the CSV result
+http_phase_stats.register(events)
+
+# Register the body streaming stats to be merged on the master node and written to the CSV result
+body_streaming_stats.register(events)
+
+# Sample the health of the load generator processes, to detect a saturated load generator
+register_client_health_sampler(events)
+
+# Log a sample of the requests of each process to a binary trace file, if a trace sample rate is set
+register_trace_log(events)
+register_openmetrics_exporter(events)
+register_load_stages(events)
+register_endpoint_matrix(events)
+
+# Namespace the unique values of the writes by the run id and the worker index
+register_unique_value_generator(events)
+
+# Send the total number of users to the workers, to split the arrival rate and the test data between all the users
+register_total_users(events)
+
 
 @events.init_command_line_parser.add_listener
 def _(parser):
@@ -42,6 +104,260 @@ def _(parser):
         default=TEST_ENDPOINTS_CONFIG["test_endpoints_default"],
         help="Choose endpoints to test",
     )
+    # Add custom argument to run every combination of endpoints, users and dataset sizes of a matrix in one test
+    parser.add_argument(
+        "--endpoint-matrix",
+        type=str,
+        env_var="LOCUST_ENDPOINT_MATRIX",
+        default="",
+        help="Path of an endpoint matrix JSON file, running each combination of its endpoints, users and dataset sizes "
+             "in turn with its own result and evaluation, e.g. performance_tests/endpoint_matrices/nightly_sweep.json",
+    )
+    # Add custom arguments to shape the number of users over time, peaking at the users option over the run time
+    parser.add_argument(
+        "--load-shape",
+        type=str,
+        env_var="LOCUST_LOAD_SHAPE",
+        choices=LOAD_SHAPE_CHOICES,
+        default=NO_LOAD_SHAPE,
+        help="Shape of the number of users over the run time, reported and evaluated per stage. "
+             "None: the users are started at the spawn rate and held",
+    )
+    parser.add_argument(
+        "--load-shape-file",
+        type=str,
+        env_var="LOCUST_LOAD_SHAPE_FILE",
+        default="",
+        help="Path of a JSON file overriding the load shape parameters, or setting the stages of the custom load shape, "
+             "e.g. performance_tests/load_shapes/survey_window_opening.json",
+    )
+    # Add custom argument to choose multi-step user journeys to test, in addition to the endpoints
+    parser.add_argument(
+        "--test-journeys",
+        type=str,
+        env_var="LOCUST_TEST_JOURNEYS",
+        choices=TEST_JOURNEYS_CONFIG["test_journeys_choice"],
+        default="none",
+        help="Choose journeys to test, where the response of a request feeds the next one",
+    )
+    # Add custom argument to set the endpoint mix from a traffic profile file, overriding the selected endpoints
+    parser.add_argument(
+        "--traffic-profile",
+        type=str,
+        env_var="LOCUST_TRAFFIC_PROFILE",
+        default="",
+        help="Path of a traffic profile JSON file setting the weight or rate of each endpoint and journey, "
+             "e.g. performance_tests/traffic_profiles/production_mix.json",
+    )
+    # Add custom arguments to choose between a closed (fixed users) and open (fixed arrival rate) load model
+    parser.add_argument(
+        "--load-model",
+        type=str,
+        env_var="LOCUST_LOAD_MODEL",
+        choices=LOAD_MODEL_CHOICES,
+        default=CLOSED_LOAD_MODEL,
+        help="Closed model: users wait for responses. Open model: requests are sent at a target arrival rate. "
+             "Replay: the requests of an access log are sent at their original timing",
+    )
+    parser.add_argument(
+        "--arrival-rate",
+        type=float,
+        env_var="LOCUST_ARRIVAL_RATE",
+        default=10.0,
+        help="Target arrival rate in requests per second for each tested endpoint (open model only)",
+    )
+    parser.add_argument(
+        "--arrival-rate-schedule",
+        type=str,
+        env_var="LOCUST_ARRIVAL_RATE_SCHEDULE",
+        default="",
+        help="Arrival rate schedule as <duration>:<rate>,... in seconds and requests per second, e.g. 60:10,120:50 "
+             "(open model only). The last rate is held until the end of the test",
+    )
+    # Add custom arguments to replay the requests of an access log at their original timing (replay load model)
+    parser.add_argument(
+        "--replay-log",
+        type=str,
+        env_var="LOCUST_REPLAY_LOG",
+        default="",
+        help="Path of the access log to replay, as CSV timestamp,method,path,query lines or JSON lines, optionally "
+             "gzipped, e.g. performance_tests/access_logs/sds_sample.csv (replay load model only)",
+    )
+    parser.add_argument(
+        "--replay-speedup",
+        type=float,
+        env_var="LOCUST_REPLAY_SPEEDUP",
+        default=1.0,
+        help="Factor the time between the requests of the access log is divided by, e.g. 10 to replay an hour "
+             "in 6 minutes (replay load model only)",
+    )
+    # Add custom arguments to test read endpoints on the warm (same key) or cold (distinct keys) cache path
+    parser.add_argument(
+        "--cache-mode",
+        type=str,
+        env_var="LOCUST_CACHE_MODE",
+        choices=CACHE_MODE_CHOICES,
+        default=WARM_CACHE_MODE,
+        help="Warm: read the same schema/CI. Cold: read distinct schemas/CIs from a seeded pool. Mixed: both",
+    )
+    parser.add_argument(
+        "--cold-ratio",
+        type=float,
+        env_var="LOCUST_COLD_RATIO",
+        default=0.5,
+        help="Share of the read requests sent on the cold path between 0 and 1 (mixed cache mode only)",
+    )
+    parser.add_argument(
+        "--cold-pool-size",
+        type=int,
+        env_var="LOCUST_COLD_POOL_SIZE",
+        default=50,
+        help="Number of distinct schemas/CIs seeded for the cold path (cold and mixed cache modes only)",
+    )
+    # Add custom arguments to split the test data between the workers and users, instead of all reading the same keys
+    parser.add_argument(
+        "--shard-test-data",
+        action="store_true",
+        env_var="LOCUST_SHARD_TEST_DATA",
+        default=False,
+        help="Split the dataset identifiers (SDS) and the cold pool schemas/CIs between the workers by worker index, "
+             "and the dataset identifiers of each worker between its users",
+    )
+    parser.add_argument(
+        "--shard-overlap",
+        type=float,
+        env_var="LOCUST_SHARD_OVERLAP",
+        default=DEFAULT_SHARD_OVERLAP,
+        help="Share of the test data of the other workers/users each worker/user also reads between 0 and 1, "
+             "from 0 for disjoint shards to 1 for all reading the whole test data (sharded test data only)",
+    )
+    # Add custom arguments to seed schemas/CIs across many surveys for testing the listing endpoints at scale
+    parser.add_argument(
+        "--seed-records",
+        type=int,
+        env_var="LOCUST_SEED_RECORDS",
+        default=0,
+        help="Number of schemas/CIs to seed before the test (0 to disable seeding)",
+    )
+    parser.add_argument(
+        "--seed-surveys",
+        type=int,
+        env_var="LOCUST_SEED_SURVEYS",
+        default=10,
+        help="Number of surveys the seeded schemas/CIs are spread across",
+    )
+    # Add custom arguments to record the preprocessed test data, and reuse it in the next runs with the same parameters
+    parser.add_argument(
+        "--preprocess-manifest",
+        type=str,
+        env_var="LOCUST_PREPROCESS_MANIFEST",
+        default="",
+        help="Path of the manifest of the preprocessed test data, e.g. in the mounted results bucket. The test data "
+             "of the manifest is reused if it matches the parameters of the run and is still served",
+    )
+    parser.add_argument(
+        "--preprocess-manifest-max-age",
+        type=float,
+        env_var="LOCUST_PREPROCESS_MANIFEST_MAX_AGE",
+        default=DEFAULT_PREPROCESS_MANIFEST_MAX_AGE,
+        help="Age in hours after which the test data of the preprocess manifest is preprocessed again",
+    )
+    # Add custom argument to limit the calls of the setup and teardown of the test in flight at once
+    parser.add_argument(
+        "--setup-concurrency",
+        type=int,
+        env_var="LOCUST_SETUP_CONCURRENCY",
+        default=DEFAULT_SETUP_CONCURRENCY,
+        help="Maximum number of concurrent calls of the pre/post-processors of each process, e.g. publishing, "
+             "verifying and deleting the test data",
+    )
+    parser.add_argument(
+        "--seed-concurrency",
+        type=int,
+        env_var="LOCUST_SEED_CONCURRENCY",
+        default=10,
+        help="Maximum number of concurrent requests when seeding the schemas/CIs, within the setup concurrency",
+    )
+    parser.add_argument(
+        "--seed-keep",
+        action="store_true",
+        env_var="LOCUST_SEED_KEEP",
+        default=False,
+        help="Keep the seeded schemas/CIs after the test, to be reused by the next run",
+    )
+    # Add custom argument to namespace the unique values of the writes, e.g. guids and validator versions
+    parser.add_argument(
+        "--run-id",
+        type=str,
+        env_var="LOCUST_RUN_ID",
+        default="",
+        help="Id of the run the unique values of the writes are namespaced by with the worker index, e.g. the job "
+             "execution number. The seconds since epoch the run started at if unset",
+    )
+    # Add custom argument to validate a sample of the responses on their status, size and body digest
+    parser.add_argument(
+        "--response-validation-rate",
+        type=float,
+        env_var="LOCUST_RESPONSE_VALIDATION_RATE",
+        default=DEFAULT_RESPONSE_VALIDATION_RATE,
+        help="Share of the responses validated between 0 and 1, failing the responses with an unexpected status, a "
+             "size out of the bounds of the endpoint or a body not matching the reference response. 0 to disable",
+    )
+    # Add custom arguments to stream the bodies of the read responses in chunks and discard them, instead of buffering them
+    parser.add_argument(
+        "--stream-response-body",
+        action="store_true",
+        env_var="LOCUST_STREAM_RESPONSE_BODY",
+        default=False,
+        help="Read the bodies of the GET responses in chunks and discard them, reporting their time to last byte, "
+             "bytes and throughput in MB/s. The sampled validated responses are still buffered",
+    )
+    parser.add_argument(
+        "--response-body-chunk-size",
+        type=int,
+        env_var="LOCUST_RESPONSE_BODY_CHUNK_SIZE",
+        default=DEFAULT_BODY_CHUNK_SIZE,
+        help="Size in bytes of the chunks the streamed response bodies are read in (streamed response bodies only)",
+    )
+    # Add custom argument to break the response times down into DNS, connect, TLS, time to first byte and body phases
+    parser.add_argument(
+        "--http-phase-timing",
+        action="store_true",
+        env_var="LOCUST_HTTP_PHASE_TIMING",
+        default=False,
+        help="Record the DNS, connect, TLS, time to first byte and body timings and the connection reuse of each request",
+    )
+    # Add custom argument to log a sample of the requests to a binary trace file per process
+    parser.add_argument(
+        "--trace-sample-rate",
+        type=float,
+        env_var="LOCUST_TRACE_SAMPLE_RATE",
+        default=0.0,
+        help="Share of the requests logged to the trace file of each process between 0 and 1 (0 to disable)",
+    )
+    # Add custom argument to serve the live metrics of the test on the master node
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        env_var="LOCUST_METRICS_PORT",
+        default=0,
+        help="Port of the OpenMetrics endpoint served at /metrics by the master node while the test runs (0 to disable)",
+    )
+    # Add custom arguments to evaluate the response time distributions against a baseline run
+    parser.add_argument(
+        "--baseline-result",
+        type=str,
+        env_var="LOCUST_BASELINE_RESULT",
+        default="",
+        help="Result archive of the baseline run, or directory of the runs to take the latest one from as baseline",
+    )
+    parser.add_argument(
+        "--baseline-tolerance",
+        type=float,
+        env_var="LOCUST_BASELINE_TOLERANCE",
+        default=THRESHOLDS_BASELINE_TOLERANCE,
+        help="Relative increase of the response time percentiles over the baseline run tolerated before a regression",
+    )
     if config.APP == App.SDS:
         parser.add_argument(
             "--dataset_entries",
@@ -50,6 +366,73 @@ def _(parser):
             default=1000,
             help="Number of unit data in the generated dataset between 10 to 90000",
         )
+        # Add custom arguments to generate unit data of varying size and entropy, instead of the unit data file
+        parser.add_argument(
+            "--unit-data-size-distribution",
+            type=str,
+            env_var="LOCUST_UNIT_DATA_SIZE_DISTRIBUTION",
+            choices=UNIT_DATA_SIZE_CHOICES,
+            default=FILE_UNIT_DATA_SIZE,
+            help="File: every unit data is the unit data file. Fixed: every unit data is of the unit data size. "
+                 "Lognormal: sizes are log-normally distributed around the unit data size. "
+                 "Sampled: sizes are drawn from the unit data sizes file",
+        )
+        parser.add_argument(
+            "--unit-data-size",
+            type=int,
+            env_var="LOCUST_UNIT_DATA_SIZE",
+            default=17000,
+            help="Size of the unit data in bytes (fixed), or median size (lognormal), up to 1000000",
+        )
+        parser.add_argument(
+            "--unit-data-size-sigma",
+            type=float,
+            env_var="LOCUST_UNIT_DATA_SIZE_SIGMA",
+            default=1.0,
+            help="Standard deviation of the logarithm of the unit data sizes (lognormal only)",
+        )
+        parser.add_argument(
+            "--unit-data-sizes-file",
+            type=str,
+            env_var="LOCUST_UNIT_DATA_SIZES_FILE",
+            default="",
+            help="Path of a file of unit data sizes in bytes sampled from production, as a JSON list or one size per "
+                 "line (sampled only)",
+        )
+        parser.add_argument(
+            "--unit-data-entropy",
+            type=float,
+            env_var="LOCUST_UNIT_DATA_ENTROPY",
+            default=0.5,
+            help="Share of the unit data that is random between 0 and 1, the rest repeating the unit data file. "
+                 "The higher, the less the unit data compresses",
+        )
+        parser.add_argument(
+            "--unit-data-seed",
+            type=int,
+            env_var="LOCUST_UNIT_DATA_SEED",
+            default=0,
+            help="Seed of the unit data sizes and content, the same seed generating the same unit data",
+        )
+        # Add custom argument to run the same load against datasets of each size, and fit their latency to the size
+        parser.add_argument(
+            "--dataset-sweep",
+            type=str,
+            env_var="LOCUST_DATASET_SWEEP",
+            default="",
+            help="Dataset sizes to run the test against in turn, as <entries>,<entries>,... between 10 and 90000, "
+                 "e.g. 10,1000,10000,90000. Each size is published under its own period",
+        )
+    if config.APP == App.CIR:
+        # Add custom argument to set the size of the CI schema sent by the custom payload variant endpoints
+        parser.add_argument(
+            "--ci-schema-size",
+            type=str,
+            env_var="LOCUST_CI_SCHEMA_SIZE",
+            default="5,20,3",
+            help="Size of the CI schema generated for the *_custom endpoints, as <sections>,<questions>,<answers> "
+                 "with the number of questions of each section and answers of each question",
+        )
 
 
 @events.test_start.add_listener
@@ -59,6 +442,41 @@ def on_test_start(environment: Environment, **kwargs):
     """
     logger.info("Setting header for requests")
     runtime_config.HEADER = locust_helper.set_header()
+    runtime_config.set_config_from_options(environment.parsed_options)
+    runtime_config.set_test_data_shard(environment)
+
+    preprocess_test_data(environment)
+
+    # Fetch the reference responses the sampled responses are validated against, on the nodes running the users
+    runtime_config.RESPONSE_VALIDATOR = None
+    response_validation_rate = environment.parsed_options.response_validation_rate
+    if response_validation_rate > 0 and not isinstance(environment.runner, MasterRunner):
+        endpoint_helpers = EndpointsHelpers(config.BASE_URL, TEST_ENDPOINTS_CONFIG["test_endpoints"])
+        response_digests = endpoint_helpers.fetch_response_digests(runtime_config)
+        runtime_config.RESPONSE_VALIDATOR = ResponseValidator(response_validation_rate, response_digests)
+        logger.info(f"Validating {response_validation_rate:.0%} of the responses, against the reference responses "
+                    f"of {list(response_digests)}")
+
+
+def preprocess_test_data(environment: Environment):
+    """
+    Preprocess the test data of the test, or reuse the test data already preprocessed with the same options
+    """
+    # A test started again with the same options, e.g. the next cell of an endpoint matrix, reuses the test data
+    if runtime_config.get_preprocess_key(environment.parsed_options) == runtime_config.PREPROCESS_KEY:
+        logger.info("Test data already preprocessed with the same options. Skipping pre-processing.")
+        return
+
+    # A run with the same parameters as a previous one reuses its test data, if the test data is still served
+    parsed_options = environment.parsed_options
+    preprocess_parameters = runtime_config.get_preprocess_parameters(parsed_options)
+    if parsed_options.preprocess_manifest:
+        manifest = load_reusable_preprocess_manifest(
+            parsed_options, runtime_config.HEADER, preprocess_parameters, runtime_config.PERIOD_ID
+        )
+        if manifest is not None:
+            runtime_config.set_config_from_manifest(manifest, environment)
+            return
 
     preprocess_mapper = PreprocessMapper()
 
@@ -67,10 +485,22 @@ def on_test_start(environment: Environment, **kwargs):
         environment=environment
     )
 
-    for preprocessor in preprocessors_required:
-        preprocessor.preprocess()
+    # The pre-processors do not depend on each other, their calls are made concurrently within the setup concurrency
+    setup_engine.set_concurrency(environment.parsed_options.setup_concurrency)
+    run_concurrently([preprocessor.preprocess for preprocessor in preprocessors_required])
+
+    runtime_config.set_config_from_preprocessors(preprocessors_required, environment.parsed_options)
 
-    runtime_config.set_config_from_preprocessors(preprocessors_required)
+    # The master records the preprocessed test data in the background, without delaying the start of the users
+    is_worker = isinstance(environment.runner, WorkerRunner)
+    if parsed_options.preprocess_manifest and not is_worker and not environment.process_exit_code:
+        gevent.spawn(
+            save_preprocess_manifest,
+            parsed_options,
+            runtime_config.HEADER,
+            preprocess_parameters,
+            runtime_config.PERIOD_ID,
+        )
 
 
 @events.quitting.add_listener
@@ -105,21 +535,51 @@ class PerformanceTests(FastHttpUser):
     host: str = config.BASE_URL # Required by Locust
     endpoint_configs: dict[str, EndpointConfig] # Endpoint configurations for the selected endpoints to be tested
     endpoint_helpers: EndpointsHelpers
+    journey_configs: dict[str, JourneyConfig] # Journey configurations for the selected journeys to be tested
+    journeys_helpers: JourneysHelpers
     locust_tests_factory: LocustTestsFactory
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, environment: Environment, *args, **kwargs):
         """Override default init to save some additional class attributes"""
-        super().__init__(*args, **kwargs)
+        # The users of the open model and replay send concurrent requests, each needing a connection of the pool of the
+        # user. The users of the closed model send one request at a time and keep the default pool size.
+        if environment.parsed_options.load_model != CLOSED_LOAD_MODEL:
+            self.concurrency = config.OPEN_MODEL_MAX_IN_FLIGHT
+
+        super().__init__(environment, *args, **kwargs)
+
+        parsed_options = self.environment.parsed_options
+
+        # Define endpoints and journeys to be tested, from the traffic profile if set
+        traffic_profile = load_traffic_profile(
+            parsed_options.traffic_profile,
+            config.APP,
+            (*TEST_ENDPOINTS_CONFIG["test_endpoints"], *TEST_JOURNEYS_CONFIG["test_journeys"]),
+        ) if parsed_options.traffic_profile else None
+        selected_endpoints = list(traffic_profile) if traffic_profile else [parsed_options.test_endpoints]
+        selected_journeys = list(traffic_profile) if traffic_profile else [parsed_options.test_journeys]
 
-        # Define endpoints to be tested
         self.endpoint_helpers = EndpointsHelpers(config.BASE_URL, TEST_ENDPOINTS_CONFIG["test_endpoints"])
-        self.endpoint_configs = self.endpoint_helpers.get_endpoint_configs_from_selection(
-            [self.environment.parsed_options.test_endpoints]
-        )
+        self.endpoint_configs = self.endpoint_helpers.get_endpoint_configs_from_selection(selected_endpoints)
+
+        # Values extracted by the journeys are cached per user
+        self.journeys_helpers = JourneysHelpers(TEST_JOURNEYS_CONFIG["test_journeys"])
+        self.journey_configs = {
+            journey: journey_config for journey, journey_config in TEST_JOURNEYS_CONFIG["test_journeys"].items()
+            if "all" in selected_journeys or journey in selected_journeys
+        }
+
+        # Instrument the client of the user to record the phase timings and the connection of its requests
+        if parsed_options.http_phase_timing or parsed_options.trace_sample_rate > 0:
+            instrument_session(self.client, record_phases=parsed_options.http_phase_timing)
+
+        # Take the next shard of the test data of the process, if the test data is sharded
+        if runtime_config.TEST_DATA_SHARD:
+            self.endpoint_helpers.shard_key_pools = runtime_config.TEST_DATA_SHARD.next_user_key_pools()
 
-        # Populate tasks
-        self.locust_tests_factory = LocustTestsFactory(self.endpoint_configs)
-        self.tasks = self.locust_tests_factory.populate_locust_tasks(runtime_config)
+        # Populate tasks from the task table compiled once per process
+        self.locust_tests_factory = LocustTestsFactory(self.endpoint_configs, traffic_profile, self.journey_configs)
+        self.tasks = self.locust_tests_factory.get_task_table(runtime_config, parsed_options.load_model)
 
     def on_start(self):
         super().on_start()
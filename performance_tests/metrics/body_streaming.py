@@ -0,0 +1,56 @@
+import time
+from typing import Final
+
+from locust.contrib.fasthttp import FAILURE_EXCEPTIONS, ResponseContextManager
+from locust.stats import StatsEntry
+
+from performance_tests.metrics.custom_request_stats import CustomRequestStats
+
+# Size in bytes of the chunks the streamed response bodies are read and discarded in
+DEFAULT_BODY_CHUNK_SIZE: Final[int] = 64 * 1024
+
+# Time to last byte of the streamed responses, reported as the method of the body streaming stats, with the size of
+# their body as content length
+TIME_TO_LAST_BYTE: Final[str] = "ttlb_ms"
+
+# Time to last byte and body size of each streamed response, one stats entry per endpoint
+body_streaming_stats = CustomRequestStats("body_streaming")
+
+
+def discard_response_body(response: ResponseContextManager, request_name: str, chunk_size: int) -> None:
+    """
+    Read the body of a streamed response in chunks of at most `chunk_size` bytes and discard it, so that the body is
+    never held in memory as a whole. The request, reported by Locust once the response headers are received when
+    streamed, is reported on exiting the response context with its time to last byte and body size instead, and
+    recorded in the body streaming stats.
+
+    The body size is the number of bytes received, compressed if the response is.
+
+    Args:
+        response (ResponseContextManager): the response of a request sent with stream and catch_response set, within
+            its context
+        request_name (str): the name the request is reported under
+        chunk_size (int): the maximum size of the chunks in bytes
+    """
+    request_meta = response.request_meta
+    body_start = time.perf_counter()
+
+    body_size = 0
+    try:
+        while chunk := response.read(chunk_size):
+            body_size += len(chunk)
+    except FAILURE_EXCEPTIONS as e:
+        response.failure(e)
+
+    request_meta["response_time"] += (time.perf_counter() - body_start) * 1000
+    request_meta["response_length"] = body_size
+
+    body_streaming_stats.log(TIME_TO_LAST_BYTE, request_name, request_meta["response_time"], body_size)
+
+
+def get_body_throughput(stats: StatsEntry) -> float:
+    """Get the throughput of the streamed responses of a stats entry in MB/s, their bytes over their times to last byte"""
+    if not stats.total_response_time:
+        return 0.0
+
+    return stats.total_content_length / stats.total_response_time / 1000
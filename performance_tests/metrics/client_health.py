@@ -0,0 +1,99 @@
+import logging
+import time
+from typing import Final
+
+import gevent
+import psutil
+from locust.env import Environment
+from locust.event import Events
+from locust.runners import MasterRunner, WorkerRunner
+
+from performance_tests.metrics.custom_request_stats import CustomRequestStats
+
+logger = logging.getLogger(__name__)
+
+# Client health metrics, reported as the methods of the client health stats
+CPU_PERCENT_METRIC: Final[str] = "cpu_percent"
+LOOP_LAG_METRIC: Final[str] = "loop_lag_ms"
+OPEN_CONNECTIONS_METRIC: Final[str] = "open_connections"
+RSS_METRIC: Final[str] = "rss_mb"
+
+# Seconds between two samples of the client health metrics
+CLIENT_HEALTH_SAMPLE_INTERVAL: Final[float] = 1.0
+
+# Samples of the load generator processes, one stats entry per metric and process
+client_health_stats = CustomRequestStats("client_health", unit=None)
+
+
+class ClientHealthSampler:
+    """
+    Sample the health of the load generator process while the test runs: its CPU use, the lag of the gevent loop
+    (how late a greenlet wakes up after its scheduled sleep), its open connections and its memory.
+    A saturated process sends requests late and measures response times that include its own queueing.
+    """
+
+    def __init__(self, process_name: str, interval: float = CLIENT_HEALTH_SAMPLE_INTERVAL):
+        self.process_name = process_name
+        self.interval = interval
+        self.process = psutil.Process()
+        self.greenlet: gevent.Greenlet | None = None
+
+    def start(self) -> None:
+        # The first CPU percent call only sets the reference time of the next one
+        self.process.cpu_percent(None)
+        self.greenlet = gevent.spawn(self._run)
+
+    def stop(self) -> None:
+        if self.greenlet:
+            self.greenlet.kill(block=False)
+            self.greenlet = None
+
+    def _run(self) -> None:
+        while True:
+            scheduled_wakeup = time.perf_counter() + self.interval
+            gevent.sleep(self.interval)
+            loop_lag = max(0.0, (time.perf_counter() - scheduled_wakeup) * 1000)
+
+            self.sample(loop_lag)
+
+    def sample(self, loop_lag: float) -> None:
+        """Log a sample of each client health metric of the process"""
+        client_health_stats.log(CPU_PERCENT_METRIC, self.process_name, self.process.cpu_percent(None))
+        client_health_stats.log(LOOP_LAG_METRIC, self.process_name, loop_lag)
+        client_health_stats.log(OPEN_CONNECTIONS_METRIC, self.process_name, len(self.process.net_connections(kind="tcp")))
+        client_health_stats.log(RSS_METRIC, self.process_name, self.process.memory_info().rss / (1024 * 1024))
+
+
+def get_process_name(environment: Environment) -> str:
+    """Get the name the client health of the process is reported under"""
+    if isinstance(environment.runner, WorkerRunner):
+        return f"worker_{environment.runner.worker_index}"
+
+    return "local"
+
+
+def register_client_health_sampler(events: Events) -> None:
+    """
+    Register the client health stats to be merged on the master node and written to the CSV result, and sample them
+    on every process generating load while the test runs.
+
+    Args:
+        events (Events): the Locust events to register the listeners to
+    """
+    client_health_stats.register(events)
+    samplers: dict[int, ClientHealthSampler] = {}
+
+    @events.test_start.add_listener
+    def _(environment: Environment, **kwargs):
+        if isinstance(environment.runner, MasterRunner) or id(environment) in samplers:
+            return
+
+        sampler = ClientHealthSampler(get_process_name(environment))
+        sampler.start()
+        samplers[id(environment)] = sampler
+
+    @events.test_stop.add_listener
+    def _(environment: Environment, **kwargs):
+        sampler = samplers.pop(id(environment), None)
+        if sampler:
+            sampler.stop()
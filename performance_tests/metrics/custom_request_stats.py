@@ -0,0 +1,108 @@
+import csv
+import logging
+from typing import Any
+
+from locust.event import Events
+from locust.stats import RequestStats, StatsEntry
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES_TO_REPORT: list[float] = [0.5, 0.9, 0.95, 0.99]
+
+# Custom request stats registered for reporting, keyed by their report key
+_REGISTERED_CUSTOM_REQUEST_STATS: dict[str, "CustomRequestStats"] = {}
+
+
+class CustomRequestStats:
+    """
+    Request stats kept apart from the Locust request stats, so they do not affect the request counts and fail ratio
+    of the test. Stats of worker nodes are merged on the master node through the worker reports.
+    """
+
+    def __init__(self, key: str, unit: str | None = "ms"):
+        self.key = key # Key of the stats in the worker report and suffix of the CSV result file
+        self.unit = unit # Unit of the logged values in the CSV result header, None if it varies by method
+        self.stats = RequestStats(use_response_times_cache=False)
+
+    def log(self, method: str, name: str, response_time: float, content_length: int = 0) -> None:
+        """Log a value, in milliseconds unless the stats have another unit, for the given request name and method"""
+        self.stats.log_request(method, name, round(response_time), content_length)
+
+    def entries(self) -> dict[tuple[str, str], StatsEntry]:
+        """Get the stats entries keyed by (name, method)"""
+        return self.stats.entries
+
+    def register(self, events: Events) -> None:
+        """
+        Register the stats to be sent to the master node with the worker reports and to be written to the CSV result,
+        and to be reset when a test starts.
+
+        Args:
+            events (Events): the Locust events to register the listeners to
+        """
+        _REGISTERED_CUSTOM_REQUEST_STATS[self.key] = self
+
+        events.test_start.add_listener(self._on_test_start)
+        events.report_to_master.add_listener(self._on_report_to_master)
+        events.worker_report.add_listener(self._on_worker_report)
+
+    def _on_test_start(self, **kwargs) -> None:
+        # Reset along with the Locust request stats when a test is started again
+        self.stats.clear_all()
+
+    def _on_report_to_master(self, client_id: str, data: dict[str, Any]) -> None:
+        data[self.key] = self.stats.serialize_stats()
+
+    def _on_worker_report(self, client_id: str, data: dict[str, Any]) -> None:
+        for stats_data in data.get(self.key, []):
+            entry = StatsEntry.unserialize(stats_data)
+            request_key = (entry.name, entry.method)
+            if request_key not in self.stats.entries:
+                self.stats.entries[request_key] = StatsEntry(self.stats, entry.name, entry.method)
+            self.stats.entries[request_key].extend(entry)
+
+    def write_csv(self, csv_prefix: str) -> str:
+        """
+        Write the stats to a CSV file next to the Locust CSV result files.
+
+        Args:
+            csv_prefix (str): the Locust CSV prefix of the test
+
+        Returns:
+            str: the path of the written file
+        """
+        file_path = f"{csv_prefix}_{self.key}.csv"
+        unit_suffix = f" ({self.unit})" if self.unit else ""
+
+        with open(file_path, "w", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(
+                [
+                    "Type",
+                    "Name",
+                    "Count",
+                    f"Average{unit_suffix}",
+                    f"Min{unit_suffix}",
+                    f"Max{unit_suffix}",
+                    *[f"{int(percentile * 100)}%" for percentile in PERCENTILES_TO_REPORT],
+                ]
+            )
+            for (name, method), entry in self.stats.entries.items():
+                writer.writerow(
+                    [
+                        method,
+                        name,
+                        entry.num_requests,
+                        round(entry.avg_response_time, 2),
+                        entry.min_response_time or 0,
+                        entry.max_response_time,
+                        *[entry.get_response_time_percentile(percentile) for percentile in PERCENTILES_TO_REPORT],
+                    ]
+                )
+
+        return file_path
+
+
+def get_registered_custom_request_stats() -> list[CustomRequestStats]:
+    """Get all custom request stats registered for reporting"""
+    return list(_REGISTERED_CUSTOM_REQUEST_STATS.values())
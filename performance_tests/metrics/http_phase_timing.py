@@ -0,0 +1,264 @@
+import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import cache, wraps
+from typing import Any, Final
+
+from gevent.local import local
+from geventhttpclient.client import HTTPClient
+from locust.contrib.fasthttp import FastHttpSession
+
+from performance_tests.metrics.custom_request_stats import CustomRequestStats
+
+logger = logging.getLogger(__name__)
+
+# Phases of a request, reported as the methods of the HTTP phase stats, the connection setup phases in microseconds as
+# they are mostly under a millisecond
+DNS_PHASE: Final[str] = "dns_us"
+CONNECT_PHASE: Final[str] = "connect_us"
+TLS_PHASE: Final[str] = "tls_ms"
+TTFB_PHASE: Final[str] = "ttfb_ms"
+BODY_PHASE: Final[str] = "body_ms"
+NEW_CONNECTION: Final[str] = "new_connection" # 1 if the request opened a connection, 0 if it reused one
+HTTP_PHASES: Final[list[str]] = [DNS_PHASE, CONNECT_PHASE, TLS_PHASE, TTFB_PHASE, BODY_PHASE, NEW_CONNECTION]
+
+# Private attributes of the Locust session and of the geventhttpclient client and connection pool the phase timing
+# wraps, as of the pinned locust and geventhttpclient versions. If any is missing, the phase timing is turned off.
+SESSION_INTERNALS: Final[tuple[str, ...]] = ("client.clientpool.get_client", "_send_request_safe_mode")
+CLIENT_INTERNALS: Final[tuple[str, ...]] = (
+    "request",
+    "_connection_pool._resolve",
+    "_connection_pool._connect_socket",
+    "_connection_pool.get_socket",
+)
+
+# Timings of each request phase, one stats entry per phase and endpoint
+http_phase_stats = CustomRequestStats("http_phases", unit=None)
+
+# Timings of the request in flight, per greenlet, as a user can have concurrent requests in open model
+_current_request = local()
+
+
+class RequestPhaseTimings:
+    """Phase timings of a single request, in seconds, filled in by the instrumented connection pool and client"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.dns = 0.0
+        self.connect = 0.0
+        self.tls = 0.0
+        self.headers_received_at: float | None = None
+        self.body_read_at: float | None = None # End of the last read of the response body
+        self.new_connection = False
+        self.connection_id = 0 # Local port of the connection the request was sent on
+
+
+def get_missing_attributes(obj: Any, attributes: tuple[str, ...]) -> list[str]:
+    """Get the dotted attribute paths missing from an object, e.g. _connection_pool.get_socket"""
+    missing = []
+    for path in attributes:
+        target = obj
+        for name in path.split("."):
+            if not hasattr(target, name):
+                missing.append(path)
+                break
+
+            target = getattr(target, name)
+
+    return missing
+
+
+@cache
+def _warn_phase_timing_off(owner: str, missing: tuple[str, ...]) -> None:
+    """Warn once per set of missing attributes that the phase timing is turned off"""
+    logger.warning(f"HTTP phase timing turned off: the {owner} has no {', '.join(missing)}, "
+                   "check the pinned locust and geventhttpclient versions")
+
+
+def _timed(phase: str, func: Callable) -> Callable:
+    """Wrap a connection setup step to add its duration to the given phase of the request in flight"""
+    @wraps(func)
+    def wrapper(*args, **kwargs) -> Any:
+        timings: RequestPhaseTimings | None = getattr(_current_request, "timings", None)
+        if timings is None:
+            return func(*args, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            setattr(timings, phase, getattr(timings, phase) + time.perf_counter() - start)
+            timings.new_connection = True
+
+    return wrapper
+
+
+def _mark_body_read(read: Callable, timings: RequestPhaseTimings) -> Callable:
+    """Wrap the body read of a response to stamp the end of each read, the last one ending the body"""
+    @wraps(read)
+    def wrapper(*args, **kwargs) -> Any:
+        data = read(*args, **kwargs)
+        timings.body_read_at = time.perf_counter()
+
+        return data
+
+    return wrapper
+
+
+def _mark_headers_received(func: Callable) -> Callable:
+    """
+    Wrap the request of a client, which returns once the response headers are received, and the body read of its
+    response, so that the body ends when it is read and not when the session is done handling the response.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs) -> Any:
+        response = func(*args, **kwargs)
+
+        timings: RequestPhaseTimings | None = getattr(_current_request, "timings", None)
+        if timings is not None:
+            timings.headers_received_at = time.perf_counter()
+            response.read = _mark_body_read(response.read, timings)
+
+        return response
+
+    return wrapper
+
+
+def _identify_connection(func: Callable) -> Callable:
+    """Wrap the socket checkout of a connection pool to identify the connection of the request in flight"""
+    @wraps(func)
+    def wrapper(*args, **kwargs) -> Any:
+        sock = func(*args, **kwargs)
+
+        timings: RequestPhaseTimings | None = getattr(_current_request, "timings", None)
+        if timings is not None:
+            timings.connection_id = sock.getsockname()[1]
+
+        return sock
+
+    return wrapper
+
+
+def _carry_connection_id(func: Callable) -> Callable:
+    """
+    Wrap the request sending of a session to carry the connection id of the request in flight on its response, so
+    that it reaches the request event listeners whenever the request is reported.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs) -> Any:
+        response = func(*args, **kwargs)
+
+        timings: RequestPhaseTimings | None = getattr(_current_request, "timings", None)
+        if timings is not None:
+            response.connection_id = timings.connection_id
+
+        return response
+
+    return wrapper
+
+
+def _instrument_client(client: HTTPClient) -> HTTPClient:
+    """Instrument a client and its connection pool to time the phases of its requests"""
+    connection_pool = client._connection_pool
+    connect_socket = connection_pool._connect_socket
+
+    connection_pool._resolve = _timed("dns", connection_pool._resolve)
+    connection_pool.get_socket = _identify_connection(connection_pool.get_socket)
+
+    ssl_context = getattr(connection_pool, "ssl_context", None)
+    if ssl_context is not None:
+        # The TLS handshake is done in the connect step, time it apart and take it out of the TCP connect time
+        ssl_context.wrap_socket = _timed("tls", ssl_context.wrap_socket)
+        timed_connect_socket = _timed("connect", connect_socket)
+
+        def connect_socket_without_tls(*args, **kwargs) -> Any:
+            timings: RequestPhaseTimings | None = getattr(_current_request, "timings", None)
+            tls_before = timings.tls if timings else 0.0
+            try:
+                return timed_connect_socket(*args, **kwargs)
+            finally:
+                if timings:
+                    timings.connect -= timings.tls - tls_before
+
+        connection_pool._connect_socket = connect_socket_without_tls
+    else:
+        connection_pool._connect_socket = _timed("connect", connect_socket)
+
+    client.request = _mark_headers_received(client.request)
+
+    return client
+
+
+def instrument_session(session: FastHttpSession, record_phases: bool = True) -> None:
+    """
+    Instrument a user session so that the timings and connection of the requests sent within
+    `track_request_phases` are tracked, and recorded in the HTTP phase stats if `record_phases` is set.
+    The clients of the session are instrumented as they are created, one per host.
+
+    The instrumentation wraps private attributes of the session and clients: if any is missing, a warning is logged
+    and the requests of the session are sent without phase timing.
+    """
+    missing = get_missing_attributes(session, SESSION_INTERNALS)
+    if missing:
+        _warn_phase_timing_off("session", tuple(missing))
+        return
+
+    client_pool = session.client.clientpool
+    get_client = client_pool.get_client
+
+    def get_instrumented_client(url) -> HTTPClient:
+        client = get_client(url)
+        if not getattr(client, "_phase_timing_instrumented", False):
+            missing_internals = get_missing_attributes(client, CLIENT_INTERNALS)
+            if missing_internals:
+                _warn_phase_timing_off("client", tuple(missing_internals))
+                session.phase_timing_instrumented = False
+                return client
+
+            _instrument_client(client)
+            client._phase_timing_instrumented = True
+
+        return client
+
+    client_pool.get_client = get_instrumented_client
+    session._send_request_safe_mode = _carry_connection_id(session._send_request_safe_mode)
+    session.phase_timing_instrumented = True
+    session.record_phases = record_phases
+
+
+def get_connection_id(response: Any) -> int:
+    """Get the connection id a response was received on, 0 if its session is not instrumented"""
+    return getattr(response, "connection_id", 0)
+
+
+@contextmanager
+def track_request_phases(session: FastHttpSession, request_name: str) -> Iterator[None]:
+    """
+    Record the phase timings of the request sent within the context, if the session is instrumented.
+    The time to first byte excludes the connection setup, and the body is the time from the response headers to the
+    end of the last read of the body, excluding the handling of the response after it is read.
+    """
+    if not getattr(session, "phase_timing_instrumented", False):
+        yield
+        return
+
+    timings = RequestPhaseTimings()
+    _current_request.timings = timings
+    try:
+        yield
+    finally:
+        _current_request.timings = None
+
+        if session.record_phases and timings.headers_received_at is not None:
+            setup = timings.dns + timings.connect + timings.tls
+            http_phase_stats.log(TTFB_PHASE, request_name, (timings.headers_received_at - timings.start - setup) * 1000)
+            if timings.body_read_at is not None:
+                http_phase_stats.log(BODY_PHASE, request_name, (timings.body_read_at - timings.headers_received_at) * 1000)
+            http_phase_stats.log(NEW_CONNECTION, request_name, int(timings.new_connection))
+
+            if timings.new_connection:
+                http_phase_stats.log(DNS_PHASE, request_name, timings.dns * 1_000_000)
+                http_phase_stats.log(CONNECT_PHASE, request_name, timings.connect * 1_000_000)
+                if timings.tls:
+                    http_phase_stats.log(TLS_PHASE, request_name, timings.tls * 1000)
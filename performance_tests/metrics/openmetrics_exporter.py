@@ -0,0 +1,198 @@
+import logging
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from typing import Any, Final
+
+import gevent
+from gevent.pywsgi import WSGIServer
+from locust.env import Environment
+from locust.event import Events
+from locust.runners import LocalRunner, MasterRunner
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the request duration histogram buckets in milliseconds, the last bucket being +Inf
+REQUEST_DURATION_BUCKETS_MS: Final[tuple[int, ...]] = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+OPENMETRICS_CONTENT_TYPE: Final[str] = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+class RequestMetrics:
+    """Cumulative counters and request duration histogram of a request, updated incrementally"""
+
+    def __init__(self):
+        self.requests = 0
+        self.failures = 0
+        self.duration_sum_ms = 0.0
+        self.bucket_counts = [0] * (len(REQUEST_DURATION_BUCKETS_MS) + 1) # Non cumulative, the last one is +Inf
+
+    def add_response_times(self, response_times: dict[int, int]) -> None:
+        """Add the response times of a stats delta, keyed by rounded response time in milliseconds, to the buckets"""
+        for response_time, count in response_times.items():
+            self.bucket_counts[bisect_left(REQUEST_DURATION_BUCKETS_MS, response_time)] += count
+
+
+def escape_label_value(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: dict[str, Any]) -> str:
+    return "{" + ",".join(f'{key}="{escape_label_value(value)}"' for key, value in labels.items()) + "}"
+
+
+class OpenMetricsExporter:
+    """
+    Live metrics of the test, served in the OpenMetrics text format by the master (or the local runner) while the test
+    runs: per request counters and duration histograms, the active users and the health of the workers.
+
+    The request metrics are cumulative and updated from the stats deltas of the worker reports (or from each request
+    on a local runner), so that a scrape formats the current state without going through the stats entries.
+    """
+
+    def __init__(self, environment: Environment):
+        self.environment = environment
+        self.requests: dict[tuple[str, str], RequestMetrics] = {}
+
+    def get_request_metrics(self, name: str, method: str) -> RequestMetrics:
+        request_metrics = self.requests.get((name, method))
+        if request_metrics is None:
+            request_metrics = self.requests[(name, method)] = RequestMetrics()
+
+        return request_metrics
+
+    def on_worker_report(self, client_id: str, data: dict[str, Any]) -> None:
+        for stats_data in data.get("stats", []):
+            request_metrics = self.get_request_metrics(stats_data["name"], stats_data["method"])
+            request_metrics.requests += stats_data["num_requests"]
+            request_metrics.failures += stats_data["num_failures"]
+            request_metrics.duration_sum_ms += stats_data["total_response_time"]
+            request_metrics.add_response_times(stats_data["response_times"])
+
+    def on_request(
+            self,
+            request_type: str,
+            name: str,
+            response_time: float,
+            exception: Exception | None = None,
+            **kwargs,
+    ) -> None:
+        request_metrics = self.get_request_metrics(name, request_type)
+        request_metrics.requests += 1
+        request_metrics.duration_sum_ms += response_time or 0
+        request_metrics.bucket_counts[bisect_left(REQUEST_DURATION_BUCKETS_MS, response_time or 0)] += 1
+        if exception:
+            request_metrics.failures += 1
+
+    def render(self) -> str:
+        """Format the current metrics in the OpenMetrics text format"""
+        lines = [
+            "# TYPE locust_requests counter",
+            "# HELP locust_requests Requests sent, failed or not.",
+        ]
+        for (name, method), request_metrics in self.requests.items():
+            lines.append(f"locust_requests_total{format_labels({'name': name, 'method': method})} {request_metrics.requests}")
+
+        lines += [
+            "# TYPE locust_request_failures counter",
+            "# HELP locust_request_failures Failed requests.",
+        ]
+        for (name, method), request_metrics in self.requests.items():
+            lines.append(f"locust_request_failures_total{format_labels({'name': name, 'method': method})} {request_metrics.failures}")
+
+        lines += [
+            "# TYPE locust_request_duration_seconds histogram",
+            "# UNIT locust_request_duration_seconds seconds",
+            "# HELP locust_request_duration_seconds Response times of the requests.",
+        ]
+        for (name, method), request_metrics in self.requests.items():
+            cumulative_count = 0
+            for bound, count in zip((*REQUEST_DURATION_BUCKETS_MS, None), request_metrics.bucket_counts, strict=True):
+                cumulative_count += count
+                le = "+Inf" if bound is None else f"{bound / 1000:g}"
+                labels = format_labels({"name": name, "method": method, "le": le})
+                lines.append(f"locust_request_duration_seconds_bucket{labels} {cumulative_count}")
+
+            labels = format_labels({"name": name, "method": method})
+            lines.append(f"locust_request_duration_seconds_count{labels} {cumulative_count}")
+            lines.append(f"locust_request_duration_seconds_sum{labels} {request_metrics.duration_sum_ms / 1000}")
+
+        runner = self.environment.runner
+        lines += [
+            "# TYPE locust_users gauge",
+            "# HELP locust_users Active users.",
+            f"locust_users {runner.user_count if runner else 0}",
+        ]
+
+        if isinstance(runner, MasterRunner):
+            workers = list(runner.clients.values())
+            lines += [
+                "# TYPE locust_workers gauge",
+                "# HELP locust_workers Connected workers by state.",
+            ]
+            for state in dict.fromkeys(worker.state for worker in workers):
+                count = sum(worker.state == state for worker in workers)
+                lines.append(f"locust_workers{format_labels({'state': state})} {count}")
+
+            lines += self._render_worker_gauge(
+                "locust_worker_users", "Active users of the worker.", workers, lambda worker: worker.user_count
+            )
+            lines += self._render_worker_gauge(
+                "locust_worker_cpu_percent", "CPU use of the worker process.", workers, lambda worker: worker.cpu_usage
+            )
+            lines += self._render_worker_gauge(
+                "locust_worker_memory_bytes", "Memory of the worker process.", workers, lambda worker: worker.memory_usage
+            )
+
+        lines.append("# EOF")
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _render_worker_gauge(metric: str, help_text: str, workers: Iterable, get_value: Callable) -> list[str]:
+        lines = [f"# TYPE {metric} gauge", f"# HELP {metric} {help_text}"]
+        for worker in workers:
+            lines.append(f"{metric}{format_labels({'worker': worker.id})} {get_value(worker)}")
+
+        return lines
+
+    def __call__(self, environ: dict, start_response: Callable) -> Iterable[bytes]:
+        if environ.get("PATH_INFO") != "/metrics":
+            start_response("404 Not Found", [("Content-Type", "text/plain")])
+            return [b"Not found"]
+
+        body = self.render().encode()
+        start_response("200 OK", [("Content-Type", OPENMETRICS_CONTENT_TYPE), ("Content-Length", str(len(body)))])
+        return [body]
+
+
+def register_openmetrics_exporter(events: Events) -> None:
+    """
+    Serve the live metrics of the test on the master (or local) node, if a metrics port is set.
+
+    Args:
+        events (Events): the Locust events to register the listeners to
+    """
+    servers: list[WSGIServer] = []
+
+    @events.init.add_listener
+    def _(environment: Environment, **kwargs):
+        port = environment.parsed_options.metrics_port if environment.parsed_options else 0
+        if not port or not isinstance(environment.runner, MasterRunner | LocalRunner):
+            return
+
+        exporter = OpenMetricsExporter(environment)
+        if isinstance(environment.runner, MasterRunner):
+            environment.events.worker_report.add_listener(exporter.on_worker_report)
+        else:
+            environment.events.request.add_listener(exporter.on_request)
+
+        server = WSGIServer(("0.0.0.0", port), exporter, log=None) # noqa: S104
+        gevent.spawn(server.serve_forever)
+        servers.append(server)
+
+        logger.info(f"Serving OpenMetrics on port {port} at /metrics")
+
+    @events.quitting.add_listener
+    def _(environment: Environment, **kwargs):
+        while servers:
+            servers.pop().stop(timeout=1)
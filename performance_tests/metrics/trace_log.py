@@ -0,0 +1,215 @@
+import json
+import logging
+import mmap
+import os
+import random
+import struct
+from array import array
+from typing import Any, Final
+
+from gevent.threadpool import ThreadPool
+from locust.env import Environment
+from locust.event import Events
+from locust.runners import MasterRunner, WorkerRunner
+
+from performance_tests.metrics.client_health import get_process_name
+from performance_tests.metrics.http_phase_timing import get_connection_id
+
+logger = logging.getLogger(__name__)
+
+# Columns of the trace log, as (name, array typecode), in the order they are written in each chunk
+TRACE_COLUMNS: Final[list[tuple[str, str]]] = [
+    ("timestamp", "d"), # Start time of the request in seconds since epoch
+    ("endpoint", "H"), # Index of the request name in the endpoints of the metadata file
+    ("status", "H"), # HTTP status code, 0 if no response was received
+    ("latency_ms", "f"), # Response time in milliseconds
+    ("bytes", "I"), # Response length in bytes
+    ("worker", "H"), # Index of the worker the request was sent from
+    ("connection", "H"), # Local port of the connection the request was sent on, 0 if unknown
+]
+
+TRACE_FILE_MAGIC: Final[bytes] = b"LTRC"
+TRACE_CHUNK_MAGIC: Final[bytes] = b"CHNK"
+TRACE_FILE_VERSION: Final[int] = 1
+TRACE_FILE_HEADER: Final[struct.Struct] = struct.Struct("<4sHH") # Magic, version, number of columns
+TRACE_COLUMN_HEADER: Final[struct.Struct] = struct.Struct("<16sc") # Column name, array typecode
+TRACE_CHUNK_HEADER: Final[struct.Struct] = struct.Struct("<4sI") # Magic, number of rows
+
+# Number of requests buffered by each process before a chunk is flushed to the trace file
+TRACE_RING_SIZE: Final[int] = 65536
+
+
+class TraceLog:
+    """
+    Sampled per-request log of a load generator process, buffered in a preallocated columnar ring and flushed to a
+    binary file in chunks of contiguous columns from a background thread, so that logging a request neither allocates
+    nor blocks the gevent loop on I/O.
+
+    The trace file is a file header, the column headers, then chunks of a chunk header followed by each column of the
+    chunk rows in native little endian layout, to be memory-mapped by `read_trace_file`. The request names are written
+    to a JSON metadata file next to it.
+    """
+
+    def __init__(self, file_path: str, sample_rate: float, worker_id: int, ring_size: int = TRACE_RING_SIZE):
+        self.file_path = file_path
+        self.sample_rate = sample_rate
+        self.worker_id = worker_id
+        self.ring_size = ring_size
+        self.columns = [array(typecode, bytes(array(typecode).itemsize * ring_size)) for _, typecode in TRACE_COLUMNS]
+        self.rows = 0
+        self.endpoints: dict[str, int] = {} # Index of each request name in the endpoint column
+        self.writer = ThreadPool(1) # A single thread, so that the chunks are written in order
+
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        with open(file_path, "wb") as trace_file:
+            trace_file.write(TRACE_FILE_HEADER.pack(TRACE_FILE_MAGIC, TRACE_FILE_VERSION, len(TRACE_COLUMNS)))
+            for name, typecode in TRACE_COLUMNS:
+                trace_file.write(TRACE_COLUMN_HEADER.pack(name.encode(), typecode.encode()))
+
+    def on_request(
+            self,
+            name: str,
+            response_time: float,
+            response_length: int,
+            start_time: float | None = None,
+            response: Any = None,
+            **kwargs,
+    ) -> None:
+        if random.random() >= self.sample_rate:
+            return
+
+        endpoint = self.endpoints.get(name)
+        if endpoint is None:
+            endpoint = self.endpoints[name] = len(self.endpoints)
+
+        row = self.rows
+        timestamp, endpoint_column, status, latency, length, worker, connection = self.columns
+        timestamp[row] = start_time or 0.0
+        endpoint_column[row] = endpoint
+        status[row] = getattr(response, "status_code", 0) or 0
+        latency[row] = response_time or 0.0
+        length[row] = response_length or 0
+        worker[row] = self.worker_id
+        connection[row] = get_connection_id(response)
+
+        self.rows += 1
+        if self.rows == self.ring_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Copy the buffered rows into a chunk and write it to the trace file from the writer thread"""
+        if not self.rows:
+            return
+
+        chunk = TRACE_CHUNK_HEADER.pack(TRACE_CHUNK_MAGIC, self.rows) + b"".join(
+            column[:self.rows].tobytes() for column in self.columns
+        )
+        self.rows = 0
+        self.writer.spawn(self._write_chunk, chunk)
+
+    def _write_chunk(self, chunk: bytes) -> None:
+        with open(self.file_path, "ab") as trace_file:
+            trace_file.write(chunk)
+
+    def close(self) -> None:
+        """Flush the buffered rows, wait for the writes to complete and write the metadata file"""
+        self.flush()
+        self.writer.join()
+        self.writer.kill()
+
+        with open(f"{self.file_path}.json", "w") as metadata_file:
+            json.dump(
+                {
+                    "worker": self.worker_id,
+                    "sample_rate": self.sample_rate,
+                    "columns": dict(TRACE_COLUMNS),
+                    "endpoints": list(self.endpoints),
+                },
+                metadata_file,
+                indent=2,
+            )
+
+
+def read_trace_file(file_path: str) -> dict[str, list[memoryview]]:
+    """
+    Memory-map a trace file and get the chunks of each column as typed views into the file, without copying them.
+    The views are valid as long as they are referenced.
+
+    Args:
+        file_path (str): the path of the trace file
+
+    Returns:
+        dict[str, list[memoryview]]: the views of the chunks of each column, in file order
+    """
+    with open(file_path, "rb") as trace_file:
+        mapped = mmap.mmap(trace_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    view = memoryview(mapped)
+    magic, version, column_count = TRACE_FILE_HEADER.unpack_from(view, 0)
+    if magic != TRACE_FILE_MAGIC or version != TRACE_FILE_VERSION:
+        raise ValueError(f"{file_path} is not a version {TRACE_FILE_VERSION} trace file")
+
+    offset = TRACE_FILE_HEADER.size
+    columns = []
+    for _ in range(column_count):
+        name, typecode = TRACE_COLUMN_HEADER.unpack_from(view, offset)
+        columns.append((name.rstrip(b"\0").decode(), typecode.decode()))
+        offset += TRACE_COLUMN_HEADER.size
+
+    chunks: dict[str, list[memoryview]] = {name: [] for name, _ in columns}
+    while offset < len(view):
+        magic, rows = TRACE_CHUNK_HEADER.unpack_from(view, offset)
+        if magic != TRACE_CHUNK_MAGIC:
+            raise ValueError(f"Corrupted chunk in {file_path} at offset {offset}")
+        offset += TRACE_CHUNK_HEADER.size
+
+        for name, typecode in columns:
+            size = rows * array(typecode).itemsize
+            chunks[name].append(view[offset:offset + size].cast(typecode))
+            offset += size
+
+    return chunks
+
+
+def get_trace_file_path(environment: Environment) -> str:
+    """
+    Get the trace file of the process, next to the CSV result files if set. With an endpoint matrix, each cell has its
+    own trace file, next to the result files of the cell.
+    """
+    csv_prefix = environment.parsed_options.csv_prefix
+    prefix = csv_prefix if csv_prefix else os.path.join("locust_trace_result", "result")
+    matrix_cell = getattr(environment.parsed_options, "matrix_cell", None)
+    if matrix_cell:
+        prefix = f"{prefix}_{matrix_cell}"
+
+    return f"{prefix}_trace_{get_process_name(environment)}.bin"
+
+
+def register_trace_log(events: Events) -> None:
+    """
+    Log a sample of the requests of every process generating load while the test runs, if a trace sample rate is set.
+
+    Args:
+        events (Events): the Locust events to register the listeners to
+    """
+    trace_logs: dict[int, TraceLog] = {}
+
+    @events.test_start.add_listener
+    def _(environment: Environment, **kwargs):
+        sample_rate = environment.parsed_options.trace_sample_rate
+        if sample_rate <= 0 or isinstance(environment.runner, MasterRunner) or id(environment) in trace_logs:
+            return
+
+        worker_id = environment.runner.worker_index if isinstance(environment.runner, WorkerRunner) else 0
+        trace_log = TraceLog(get_trace_file_path(environment), sample_rate, worker_id)
+        environment.events.request.add_listener(trace_log.on_request)
+        trace_logs[id(environment)] = trace_log
+
+        logger.info(f"Logging {sample_rate:.1%} of the requests to {trace_log.file_path}")
+
+    @events.test_stop.add_listener
+    def _(environment: Environment, **kwargs):
+        trace_log = trace_logs.pop(id(environment), None)
+        if trace_log:
+            environment.events.request.remove_listener(trace_log.on_request)
+            trace_log.close()
@@ -0,0 +1,52 @@
+import shutil
+from pathlib import Path
+
+from performance_tests.configs.config import config
+
+# Token accepted by the mock service in place of an IAP id token
+MOCK_TOKEN: str = "mock-token"  # noqa: S105
+
+
+class LocalBlob:
+    """Stand-in for a GCS blob, stored as a file under the directory of its local bucket"""
+
+    def __init__(self, bucket_path: Path, name: str):
+        self.name = name
+        self.path = bucket_path / name
+
+    def upload_from_filename(self, filename: str, content_type: str | None = None) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(filename, self.path)
+
+    def download_as_bytes(self) -> bytes:
+        return self.path.read_bytes()
+
+    def delete(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+class LocalBucket:
+    """Stand-in for a GCS bucket, stored as a directory under the mock bucket directory"""
+
+    def __init__(self, bucket_name: str):
+        self.name = bucket_name
+        self.path = Path(config.MOCK_BUCKET_DIR) / bucket_name
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def blob(self, name: str) -> LocalBlob:
+        return LocalBlob(self.path, name)
+
+    def list_blobs(self) -> list[LocalBlob]:
+        return [
+            LocalBlob(self.path, str(file.relative_to(self.path)))
+            for file in sorted(self.path.rglob("*"))
+            if file.is_file()
+        ]
+
+
+def get_mock_header() -> dict:
+    """Set header for requests to the mock service"""
+    return {
+        "Authorization": f"Bearer {MOCK_TOKEN}",
+        "Content-Type": "application/json",
+    }
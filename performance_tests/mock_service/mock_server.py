@@ -0,0 +1,361 @@
+"""
+Local stand-in for the SDS and CIR services, to run the full preprocess -> load -> postprocess cycle offline and to
+measure the throughput of the load generator itself.
+
+Usage:
+    python -m performance_tests.mock_service.mock_server --port 3033 --latency-ms 5 --error-rate 0.01
+"""
+import argparse
+import datetime
+import json
+import logging
+import random
+import socket
+import uuid
+from collections.abc import Callable, Iterable
+from http import HTTPStatus
+from urllib.parse import parse_qs
+
+import gevent
+from gevent.pywsgi import WSGIServer
+
+from performance_tests.configs.config import config
+from performance_tests.mock_service.mock_providers import MOCK_TOKEN, LocalBucket
+
+logger = logging.getLogger(__name__)
+
+DATASET_BUCKET_NAME = f"{config.PROJECT_ID}-sds-europe-west2-dataset"
+
+
+class FaultInjection:
+    """Latency and errors injected into the responses of the mock service"""
+
+    def __init__(
+            self,
+            latency_ms: float = 0.0,
+            latency_jitter_ms: float = 0.0,
+            route_latency_ms: dict[str, float] | None = None,
+            error_rate: float = 0.0,
+            error_status: int = HTTPStatus.SERVICE_UNAVAILABLE,
+    ):
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.route_latency_ms = route_latency_ms or {}
+        self.error_rate = error_rate
+        self.error_status = error_status
+
+    def get_latency(self, path: str) -> float:
+        """Get the latency in seconds to inject into a response of the given route"""
+        latency_ms = self.route_latency_ms.get(path, self.latency_ms)
+        if self.latency_jitter_ms:
+            latency_ms += random.uniform(0, self.latency_jitter_ms)
+
+        return latency_ms / 1000
+
+    def is_error(self) -> bool:
+        return self.error_rate > 0 and random.random() < self.error_rate
+
+
+class MockStore:
+    """In-memory records of the mock service, standing in for Firestore"""
+
+    def __init__(self):
+        self.schemas: list[dict] = [] # SDS schema metadata, in publish order
+        self.schema_payloads: dict[str, bytes] = {} # SDS schemas by guid
+        self.datasets: list[dict] = [] # SDS dataset metadata, in publish order
+        self.unit_data: dict[tuple[str, str], bytes] = {} # SDS unit data by dataset id and identifier
+        self.cis: list[dict] = [] # CIR CI metadata, in publish order
+        self.ci_payloads: dict[str, bytes] = {} # CIR CIs by guid
+
+    @staticmethod
+    def now() -> str:
+        return datetime.datetime.now(datetime.UTC).isoformat()
+
+    def add_schema(self, survey_id: str, schema: dict) -> dict:
+        version = sum(1 for metadata in self.schemas if metadata["survey_id"] == survey_id) + 1
+        guid = str(uuid.uuid4())
+        metadata = {
+            "guid": guid,
+            "survey_id": survey_id,
+            "schema_location": f"{survey_id}/{guid}.json",
+            "sds_schema_version": version,
+            "sds_published_at": self.now(),
+            "schema_version": "v1.0.0",
+            "title": schema.get("title", ""),
+        }
+        self.schemas.append(metadata)
+        self.schema_payloads[guid] = json.dumps(schema).encode()
+
+        return metadata
+
+    def delete_schemas(self, survey_id: str) -> int:
+        deleted = [metadata for metadata in self.schemas if metadata["survey_id"] == survey_id]
+        self.schemas = [metadata for metadata in self.schemas if metadata["survey_id"] != survey_id]
+        for metadata in deleted:
+            self.schema_payloads.pop(metadata["guid"], None)
+
+        return len(deleted)
+
+    def add_dataset(self, dataset: dict, filename: str) -> dict:
+        dataset_id = str(uuid.uuid4())
+        version = sum(
+            1 for metadata in self.datasets
+            if metadata["survey_id"] == dataset["survey_id"] and metadata["period_id"] == dataset["period_id"]
+        ) + 1
+        metadata = {
+            "dataset_id": dataset_id,
+            "survey_id": dataset["survey_id"],
+            "period_id": dataset["period_id"],
+            "form_types": dataset.get("form_types", []),
+            "schema_version": dataset.get("schema_version", ""),
+            "sds_published_at": self.now(),
+            "total_reporting_units": len(dataset["data"]),
+            "sds_dataset_version": version,
+            "filename": filename,
+        }
+        self.datasets.append(metadata)
+        for unit in dataset["data"]:
+            self.unit_data[(dataset_id, unit["identifier"])] = json.dumps({
+                "dataset_id": dataset_id,
+                "survey_id": dataset["survey_id"],
+                "period_id": dataset["period_id"],
+                "form_types": metadata["form_types"],
+                "schema_version": metadata["schema_version"],
+                "data": unit["unit_data"],
+            }).encode()
+
+        return metadata
+
+    def add_ci(self, guid: str, validator_version: str, ci: dict) -> dict:
+        ci_version = sum(
+            1 for metadata in self.cis
+            if (metadata["survey_id"], metadata["classifier_value"], metadata["language"])
+               == (ci.get("survey_id"), ci.get("form_type"), ci.get("language"))
+        ) + 1
+        metadata = {
+            "guid": guid,
+            "survey_id": ci.get("survey_id"),
+            "classifier_type": config.TEST_CI_CLASSIFIER_TYPE,
+            "classifier_value": ci.get("form_type"),
+            "language": ci.get("language"),
+            "validator_version": validator_version,
+            "ci_version": ci_version,
+            "data_version": ci.get("data_version"),
+            "title": ci.get("title"),
+            "published_at": self.now(),
+        }
+        self.cis = [existing for existing in self.cis if existing["guid"] != guid]
+        self.cis.append(metadata)
+        self.ci_payloads[guid] = json.dumps(ci).encode()
+
+        return metadata
+
+    def delete_cis(self, survey_id: str) -> int:
+        deleted = [metadata for metadata in self.cis if metadata["survey_id"] == survey_id]
+        self.cis = [metadata for metadata in self.cis if metadata["survey_id"] != survey_id]
+        for metadata in deleted:
+            self.ci_payloads.pop(metadata["guid"], None)
+
+        return len(deleted)
+
+
+class MockService:
+    """WSGI application implementing the SDS and CIR routes used by the load tests"""
+
+    def __init__(self, fault_injection: FaultInjection | None = None):
+        self.fault_injection = fault_injection or FaultInjection()
+        self.store = MockStore()
+        self.routes: dict[tuple[str, str], Callable[[dict, bytes], tuple[int, bytes | list | dict]]] = {
+            ("POST", "/v1/schema"): self.post_schema,
+            ("GET", "/v1/schema"): self.get_schema,
+            ("GET", "/v1/schema_metadata"): self.get_schema_metadata,
+            ("GET", "/v2/schema"): self.get_schema_v2,
+            ("GET", "/v1/survey_list"): self.get_survey_list,
+            ("GET", "/v1/dataset_metadata"): self.get_dataset_metadata,
+            ("GET", "/v1/unit_data"): self.get_unit_data,
+            ("POST", "/collection-instruments"): self.post_ci,
+            ("DELETE", "/collection-instruments"): self.delete_ci,
+            ("GET", "/collection-instruments/metadata"): self.get_ci_metadata,
+            ("GET", "/collection-instruments/schema"): self.get_ci_schema,
+            ("PUT", "/collection-instruments/validator-version"): self.put_validator_version,
+            # Mock only routes, standing in for Cloud Scheduler and Firestore
+            ("POST", "/mock/scheduler/run"): self.run_schedule_job,
+            ("DELETE", "/mock/schemas"): self.delete_schemas,
+        }
+
+    def __call__(self, environ: dict, start_response: Callable) -> Iterable[bytes]:
+        method = environ["REQUEST_METHOD"]
+        path = environ["PATH_INFO"]
+
+        latency = self.fault_injection.get_latency(path)
+        if latency:
+            gevent.sleep(latency)
+
+        if environ.get("HTTP_AUTHORIZATION") != f"Bearer {MOCK_TOKEN}":
+            status, body = HTTPStatus.UNAUTHORIZED, {"message": "Invalid token"}
+        elif self.fault_injection.is_error():
+            status, body = self.fault_injection.error_status, {"message": "Injected error"}
+        elif (method, path) not in self.routes:
+            status, body = HTTPStatus.NOT_FOUND, {"message": f"No route for {method} {path}"}
+        else:
+            params = {key: values[0] for key, values in parse_qs(environ.get("QUERY_STRING", "")).items()}
+            content_length = int(environ.get("CONTENT_LENGTH") or 0)
+            request_body = environ["wsgi.input"].read(content_length) if content_length else b""
+            try:
+                status, body = self.routes[(method, path)](params, request_body)
+            except (KeyError, ValueError) as e:
+                status, body = HTTPStatus.BAD_REQUEST, {"message": f"Invalid request: {e}"}
+
+        response_body = body if isinstance(body, bytes) else json.dumps(body).encode()
+        start_response(
+            f"{status} {HTTPStatus(status).phrase}",
+            [("Content-Type", "application/json"), ("Content-Length", str(len(response_body)))],
+        )
+
+        return [response_body]
+
+    # SDS routes
+
+    def post_schema(self, params: dict, body: bytes) -> tuple[int, dict]:
+        return HTTPStatus.OK, self.store.add_schema(params["survey_id"], json.loads(body))
+
+    def get_schema_metadata(self, params: dict, body: bytes) -> tuple[int, list | dict]:
+        schemas = [metadata for metadata in self.store.schemas if metadata["survey_id"] == params["survey_id"]]
+        if not schemas:
+            return HTTPStatus.NOT_FOUND, {"message": "No results found"}
+
+        return HTTPStatus.OK, schemas
+
+    def get_schema(self, params: dict, body: bytes) -> tuple[int, bytes | dict]:
+        schemas = [metadata for metadata in self.store.schemas if metadata["survey_id"] == params["survey_id"]]
+        if "version" in params:
+            schemas = [metadata for metadata in schemas if str(metadata["sds_schema_version"]) == params["version"]]
+        if not schemas:
+            return HTTPStatus.NOT_FOUND, {"message": "No results found"}
+
+        return HTTPStatus.OK, self.store.schema_payloads[schemas[-1]["guid"]]
+
+    def get_schema_v2(self, params: dict, body: bytes) -> tuple[int, bytes | dict]:
+        if params["guid"] not in self.store.schema_payloads:
+            return HTTPStatus.NOT_FOUND, {"message": "No results found"}
+
+        return HTTPStatus.OK, self.store.schema_payloads[params["guid"]]
+
+    def get_survey_list(self, params: dict, body: bytes) -> tuple[int, list]:
+        survey_ids = dict.fromkeys(metadata["survey_id"] for metadata in self.store.schemas)
+        return HTTPStatus.OK, [{"survey_id": survey_id} for survey_id in survey_ids]
+
+    def get_dataset_metadata(self, params: dict, body: bytes) -> tuple[int, list | dict]:
+        datasets = [
+            metadata for metadata in self.store.datasets
+            if metadata["survey_id"] == params["survey_id"] and metadata["period_id"] == params["period_id"]
+        ]
+        if not datasets:
+            return HTTPStatus.NOT_FOUND, {"message": "No results found"}
+
+        return HTTPStatus.OK, datasets
+
+    def get_unit_data(self, params: dict, body: bytes) -> tuple[int, bytes | dict]:
+        unit_data = self.store.unit_data.get((params["dataset_id"], params["identifier"]))
+        if unit_data is None:
+            return HTTPStatus.NOT_FOUND, {"message": "No results found"}
+
+        return HTTPStatus.OK, unit_data
+
+    # CIR routes
+
+    def post_ci(self, params: dict, body: bytes) -> tuple[int, dict]:
+        return HTTPStatus.OK, self.store.add_ci(params["guid"], params["validator_version"], json.loads(body))
+
+    def delete_ci(self, params: dict, body: bytes) -> tuple[int, dict]:
+        if not self.store.delete_cis(params["survey_id"]):
+            return HTTPStatus.NOT_FOUND, {"message": "No CI found"}
+
+        return HTTPStatus.OK, {"message": f"Deleted CIs of survey {params['survey_id']}"}
+
+    def get_ci_metadata(self, params: dict, body: bytes) -> tuple[int, list | dict]:
+        filters = {key: params[key] for key in ("survey_id", "classifier_type", "classifier_value", "language") if key in params}
+        cis = [metadata for metadata in self.store.cis if all(metadata[key] == value for key, value in filters.items())]
+        if not cis:
+            return HTTPStatus.NOT_FOUND, {"message": "No CI found"}
+
+        return HTTPStatus.OK, cis
+
+    def get_ci_schema(self, params: dict, body: bytes) -> tuple[int, bytes | dict]:
+        if params["guid"] not in self.store.ci_payloads:
+            return HTTPStatus.NOT_FOUND, {"message": "No CI found"}
+
+        return HTTPStatus.OK, self.store.ci_payloads[params["guid"]]
+
+    def put_validator_version(self, params: dict, body: bytes) -> tuple[int, dict]:
+        for metadata in self.store.cis:
+            if metadata["guid"] == params["guid"]:
+                metadata["validator_version"] = params["validator_version"]
+                return HTTPStatus.OK, metadata
+
+        return HTTPStatus.NOT_FOUND, {"message": "No CI found"}
+
+    # Mock only routes
+
+    def run_schedule_job(self, params: dict, body: bytes) -> tuple[int, dict]:
+        """Publish the dataset files of the local dataset bucket, as the scheduled dataset upload function does"""
+        published = []
+        for blob in LocalBucket(DATASET_BUCKET_NAME).list_blobs():
+            published.append(self.store.add_dataset(json.loads(blob.download_as_bytes()), blob.name)["dataset_id"])
+            blob.delete()
+
+        return HTTPStatus.OK, {"published_dataset_ids": published}
+
+    def delete_schemas(self, params: dict, body: bytes) -> tuple[int, dict]:
+        deleted = self.store.delete_schemas(params["survey_id"])
+        return HTTPStatus.OK, {"message": f"Deleted {deleted} schemas of survey {params['survey_id']}"}
+
+
+class NoDelayWSGIServer(WSGIServer):
+    """
+    WSGI server disabling Nagle's algorithm on every accepted connection, so that a response written in several sends
+    is not held back until the client acknowledges the first one, which, with delayed acknowledgements, stalls every
+    keep-alive request by tens of milliseconds.
+    """
+
+    def handle(self, client_socket, address):
+        # The server only goes through wrap_socket_and_handle over TLS, handle is called for every connection
+        client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return super().handle(client_socket, address)
+
+
+def parse_route_latency(route_latency: list[str] | None) -> dict[str, float]:
+    """Parse route latency overrides given as <path>=<milliseconds>"""
+    route_latency_ms = {}
+    for override in route_latency or []:
+        path, _, latency_ms = override.partition("=")
+        route_latency_ms[path] = float(latency_ms)
+
+    return route_latency_ms
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1", help="Host to listen on")
+    parser.add_argument("--port", type=int, default=3033, help="Port to listen on")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latency injected into every response")
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0, help="Maximum random latency added to the latency")
+    parser.add_argument("--route-latency", action="append", help="Latency of a route as <path>=<milliseconds>, repeatable")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of the responses replaced by an error")
+    parser.add_argument("--error-status", type=int, default=HTTPStatus.SERVICE_UNAVAILABLE, help="Status code of the injected errors")
+    args = parser.parse_args()
+
+    service = MockService(
+        FaultInjection(
+            latency_ms=args.latency_ms,
+            latency_jitter_ms=args.latency_jitter_ms,
+            route_latency_ms=parse_route_latency(args.route_latency),
+            error_rate=args.error_rate,
+            error_status=args.error_status,
+        )
+    )
+
+    logger.info(f"Mock SDS/CIR service listening on http://{args.host}:{args.port}")
+    NoDelayWSGIServer((args.host, args.port), service, log=None).serve_forever()
@@ -0,0 +1,154 @@
+import logging
+import random
+import time
+from collections.abc import Callable
+from typing import Final, TypedDict
+
+import gevent
+from gevent.pool import Pool
+from locust.env import Environment
+
+from performance_tests.metrics.custom_request_stats import CustomRequestStats
+from performance_tests.total_users import get_total_users
+
+logger = logging.getLogger(__name__)
+
+CLOSED_LOAD_MODEL: Final[str] = "closed"
+OPEN_LOAD_MODEL: Final[str] = "open"
+REPLAY_LOAD_MODEL: Final[str] = "replay" # Arrival times of an access log, see access_log_replay
+LOAD_MODEL_CHOICES: Final[list[str]] = [CLOSED_LOAD_MODEL, OPEN_LOAD_MODEL, REPLAY_LOAD_MODEL]
+
+# Stats of the open model and the replay. Schedule lag is the delay between the intended and the actual send time of a request,
+# the corrected latency is the response time measured from the intended send time (coordinated omission correction).
+schedule_lag_stats: CustomRequestStats = CustomRequestStats("schedule_lag")
+corrected_latency_stats: CustomRequestStats = CustomRequestStats("corrected_latency")
+
+
+class ArrivalRateStage(TypedDict):
+    duration: float # Duration of the stage in seconds
+    rate: float # Target arrival rate of the stage in requests per second
+
+
+def parse_arrival_rate_schedule(schedule: str | None, default_rate: float) -> list[ArrivalRateStage]:
+    """
+    Parse an arrival rate schedule in the format "<duration>:<rate>,<duration>:<rate>,...", e.g. "60:10,120:50".
+    The rate of the last stage is held once the schedule is exhausted. Without a schedule the default rate is held.
+
+    Args:
+        schedule (str | None): the arrival rate schedule
+        default_rate (float): the arrival rate to hold if no schedule is given
+
+    Returns:
+        list[ArrivalRateStage]: the stages of the schedule
+    """
+    if not schedule:
+        return [ArrivalRateStage(duration=float("inf"), rate=default_rate)]
+
+    stages = []
+    for stage in schedule.split(","):
+        try:
+            duration, rate = (float(value) for value in stage.split(":"))
+        except ValueError as e:
+            raise ValueError(f"Invalid arrival rate schedule stage: {stage}. Expected format <duration>:<rate>") from e
+
+        if duration <= 0 or rate < 0:
+            raise ValueError(f"Invalid arrival rate schedule stage: {stage}. Duration must be > 0 and rate >= 0")
+
+        stages.append(ArrivalRateStage(duration=duration, rate=rate))
+
+    return stages
+
+
+class ArrivalRateSchedule:
+    def __init__(self, stages: list[ArrivalRateStage]):
+        self.stages = stages
+
+    def rate_at(self, elapsed: float) -> float:
+        """Get the target arrival rate at the given number of seconds since the start of the schedule"""
+        stage_end = 0.0
+        for stage in self.stages:
+            stage_end += stage["duration"]
+            if elapsed < stage_end:
+                return stage["rate"]
+
+        return self.stages[-1]["rate"]
+
+    def next_stage_start(self, elapsed: float) -> float | None:
+        """Get the start time of the stage after the given number of seconds, None if there is no next stage"""
+        stage_end = 0.0
+        for stage in self.stages[:-1]:
+            stage_end += stage["duration"]
+            if elapsed < stage_end:
+                return stage_end
+
+        return None
+
+
+class ArrivalRateScheduler:
+    """
+    Send requests at intended send times following an arrival rate schedule, regardless of the response times.
+    Each request is sent in its own greenlet, bounded by the maximum number of requests in flight.
+    """
+
+    def __init__(self, schedule: ArrivalRateSchedule, rate_share: float, max_in_flight: int):
+        self.schedule = schedule
+        self.rate_share = rate_share # Share of the target arrival rate handled by this scheduler
+        self.pool = Pool(max_in_flight)
+
+    def run(self, send: Callable[[], object], method: str, name: str) -> None:
+        """
+        Send requests following the schedule until the greenlet is killed.
+
+        Args:
+            send (Callable): the function sending a single request
+            method (str): the HTTP method of the request, used to record the open model stats
+            name (str): the group name of the request, used to record the open model stats
+        """
+        start = time.perf_counter()
+
+        # Start at a random offset within the first interval so that users do not send in lockstep
+        first_rate = self.schedule.rate_at(0) * self.rate_share
+        next_send = start + (random.random() / first_rate if first_rate > 0 else 0)
+
+        try:
+            while True:
+                elapsed = next_send - start
+                rate = self.schedule.rate_at(elapsed) * self.rate_share
+
+                if rate <= 0:
+                    next_stage_start = self.schedule.next_stage_start(elapsed)
+                    if next_stage_start is None:
+                        # Nothing left to send, idle until the user is stopped
+                        gevent.sleep(1)
+                        next_send = time.perf_counter()
+                    else:
+                        next_send = start + next_stage_start
+                    continue
+
+                delay = next_send - time.perf_counter()
+                if delay > 0:
+                    gevent.sleep(delay)
+
+                # Blocks when the pool is full, the lag is then accounted for in the schedule lag stats
+                self.pool.spawn(self._send_at, next_send, send, method, name)
+                next_send += 1 / rate
+        finally:
+            self.pool.kill()
+
+    @staticmethod
+    def _send_at(intended_send_time: float, send: Callable[[], object], method: str, name: str) -> None:
+        """Send a request and record its lag against the intended send time"""
+        actual_send_time = time.perf_counter()
+        send()
+        completion_time = time.perf_counter()
+
+        schedule_lag_stats.log(method, name, (actual_send_time - intended_send_time) * 1000)
+        corrected_latency_stats.log(method, name, (completion_time - intended_send_time) * 1000)
+
+
+def get_user_rate_share(environment: Environment) -> float:
+    """
+    Get the share of the target arrival rate handled by a single user. The target arrival rate is split evenly
+    across all users of the test, so that the total arrival rate is independent of the number of workers.
+    """
+    return 1 / get_total_users(environment)
@@ -0,0 +1,47 @@
+from gevent import Greenlet
+from locust.env import Environment
+
+from performance_tests.bulk_seed import get_seed_survey_ids
+from performance_tests.configs.config import App, config
+from performance_tests.locust_helper import LocustHelper
+from performance_tests.postprocess.postprocess_base import PostProcessBase
+from performance_tests.setup_engine import gather
+
+
+class PostProcessBulkSeedDelete(PostProcessBase):
+    def __init__(self, header: dict, environment: Environment):
+        self.header = header
+        self.environment = environment
+        self.locust_helper = LocustHelper()
+
+    def delete_seed_survey(self, survey_id: str) -> Greenlet:
+        """Start deleting all the seeded schemas/CIs of a survey"""
+        if config.APP == App.SDS:
+            return self.locust_helper.delete_sds_schema_records_after_test_async(survey_id)
+
+        return self.locust_helper.delete_cir_schema_record_after_test_async(
+            headers=self.header,
+            base_url=config.BASE_URL,
+            survey_id=survey_id,
+        )
+
+    def postprocess_master(self) -> int:
+        parsed_options = self.environment.parsed_options
+
+        if parsed_options.seed_records <= 0:
+            return self.skip("No records seeded. Skipping bulk delete.")
+
+        if parsed_options.seed_keep:
+            return self.skip("Seeded records are kept for the next run. Skipping bulk delete.")
+
+        survey_ids = get_seed_survey_ids(parsed_options.seed_surveys)
+        results = gather([self.delete_seed_survey(survey_id) for survey_id in survey_ids])
+
+        failed_count = results.count(-1)
+        if failed_count:
+            return self.error(f"Failed to delete the seeded records of {failed_count} of {len(survey_ids)} surveys.")
+
+        return self.success(f"Successfully deleted the seeded records of {len(survey_ids)} surveys after test.")
+
+    def postprocess_worker(self) -> None:
+        pass
@@ -1,8 +1,10 @@
 from locust.env import Environment
 
+from performance_tests.cache_key_pool import WARM_CACHE_MODE
 from performance_tests.configs.config import config
 from performance_tests.locust_helper import LocustHelper
 from performance_tests.postprocess.postprocess_base import PostProcessBase
+from performance_tests.setup_engine import gather
 
 
 class PostProcessCirDeleteSchemas(PostProcessBase):
@@ -12,12 +14,22 @@ class PostProcessCirDeleteSchemas(PostProcessBase):
         self.locust_helper = LocustHelper()
 
     def postprocess_master(self) -> int:
-        if self.locust_helper.delete_cir_schema_record_after_test(
+        survey_ids = [config.TEST_SURVEY_ID]
+        if self.environment.parsed_options.cache_mode != WARM_CACHE_MODE:
+            survey_ids.append(config.TEST_COLD_POOL_SURVEY_ID)
+
+        results = gather([
+            self.locust_helper.delete_cir_schema_record_after_test_async(
                 headers=self.header,
                 base_url=config.BASE_URL,
-                survey_id=config.TEST_SURVEY_ID,
-        ) < 0:
-            return self.error("Failed to delete CIR schema record after test.")
+                survey_id=survey_id,
+            )
+            for survey_id in survey_ids
+        ])
+
+        for survey_id, result in zip(survey_ids, results, strict=True):
+            if result < 0:
+                return self.error(f"Failed to delete CIR schema record of survey {survey_id} after test.")
 
         return self.success("Successfully deleted CIR schema record after test.")
 
@@ -0,0 +1,27 @@
+from locust.env import Environment
+
+from performance_tests.metrics.custom_request_stats import get_registered_custom_request_stats
+from performance_tests.postprocess.postprocess_base import PostProcessBase
+
+
+class PostProcessCustomStats(PostProcessBase):
+    def __init__(self, header: dict, environment: Environment):
+        self.environment = environment
+
+    def postprocess_master(self) -> int:
+        csv_prefix = self.environment.parsed_options.csv_prefix if self.environment.parsed_options else None
+
+        if not csv_prefix:
+            return self.skip("No CSV result path is set. Skipping writing custom stats.")
+
+        for custom_request_stats in get_registered_custom_request_stats():
+            if not custom_request_stats.entries():
+                continue
+
+            file_path = custom_request_stats.write_csv(csv_prefix)
+            self.logger.info(f"Custom stats {custom_request_stats.key} written to {file_path}")
+
+        return self.success("Successfully written custom stats.")
+
+    def postprocess_worker(self) -> int:
+        pass
@@ -0,0 +1,77 @@
+import csv
+from collections import defaultdict
+
+from locust.env import Environment
+
+from performance_tests.endpoint_matrix import matrix_cell_results
+from performance_tests.postprocess.postprocess_base import PostProcessBase
+from performance_tests.result_evaluation.scaling_model import MIN_SCALING_POINTS, fit_power_law
+
+# Response time metrics of the combined report the scaling model is fitted to
+SCALING_METRICS: tuple[str, ...] = ("Average Response Time", "50%", "95%")
+
+
+class PostProcessDatasetScaling(PostProcessBase):
+    def __init__(self, header: dict, environment: Environment):
+        self.environment = environment
+
+    def postprocess_master(self) -> int:
+        # Response times of each request and metric, keyed by dataset size, apart for each set of endpoints and users
+        # tested, so that the dataset size is the only axis varying along a curve
+        curves: dict[tuple[str, int, str, str, str], dict[int, float]] = defaultdict(dict)
+        for result in matrix_cell_results:
+            for row in result["stats"]:
+                if row["Dataset Entries"] == "":
+                    continue
+
+                for metric in SCALING_METRICS:
+                    curve_key = (row["Endpoints"], row["Users"], row["Type"], row["Name"], metric)
+                    curves[curve_key][row["Dataset Entries"]] = row[metric]
+
+        if all(len(curve) < MIN_SCALING_POINTS for curve in curves.values()):
+            return self.skip(f"Fewer than {MIN_SCALING_POINTS} dataset sizes tested with the same endpoints and users. "
+                             f"Skipping the dataset scaling model.")
+
+        sizes = sorted({size for curve in curves.values() for size in curve})
+        rows = []
+        for (endpoints, users, method, name, metric), curve in curves.items():
+            fit = fit_power_law(list(curve), list(curve.values()))
+            if fit is None:
+                continue
+
+            message = (f"Endpoint {name} with method {method} ({users} users on {endpoints}): {metric} scales as "
+                       f"{fit['scaling']} in the dataset size (exponent {fit['exponent']:.2f}, "
+                       f"R² {fit['r_squared']:.2f}) over {dict(sorted(curve.items()))}")
+            if fit["scaling"] == "superlinear":
+                self.logger.warning(message)
+            else:
+                self.logger.info(message)
+
+            rows.append([
+                endpoints,
+                users,
+                method,
+                name,
+                metric,
+                *[round(curve[size], 2) if size in curve else "" for size in sizes],
+                round(fit["exponent"], 3),
+                round(fit["coefficient"], 3),
+                round(fit["r_squared"], 3),
+                fit["scaling"],
+            ])
+
+        csv_prefix = self.environment.parsed_options.csv_prefix if self.environment.parsed_options else None
+        if csv_prefix:
+            file_path = f"{csv_prefix}_dataset_scaling.csv"
+            with open(file_path, "w", newline="") as csv_file:
+                writer = csv.writer(csv_file)
+                writer.writerow(["Endpoints", "Users", "Type", "Name", "Metric", *[f"{size} entries" for size in sizes], "Exponent",
+                                 "Coefficient", "R2", "Scaling"])
+                writer.writerows(rows)
+
+            self.logger.info(f"Dataset scaling model written to {file_path}")
+
+        return self.success(f"Dataset scaling model fitted to {len(rows)} curves over {len(sizes)} dataset sizes.")
+
+    def postprocess_worker(self) -> int:
+        pass
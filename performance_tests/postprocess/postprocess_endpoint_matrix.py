@@ -0,0 +1,33 @@
+from locust.env import Environment
+
+from performance_tests.endpoint_matrix import get_matrix_report_path, matrix_cell_results, write_matrix_report
+from performance_tests.postprocess.postprocess_base import PostProcessBase
+
+
+class PostProcessEndpointMatrix(PostProcessBase):
+    def __init__(self, header: dict, environment: Environment):
+        self.environment = environment
+
+    def postprocess_master(self) -> int:
+        if not matrix_cell_results:
+            self.environment.process_exit_code = 1
+            return self.skip("No endpoint matrix cell completed. Skipping the endpoint matrix report.")
+
+        failed_cells = [result["cell"]["label"] for result in matrix_cell_results if result["exit_code"] != 0]
+
+        # The run fails with the worst exit code of its cells, an invalid run taking precedence over a failed one
+        self.environment.process_exit_code = max(result["exit_code"] for result in matrix_cell_results)
+
+        csv_prefix = self.environment.parsed_options.csv_prefix if self.environment.parsed_options else None
+        if csv_prefix:
+            file_path = write_matrix_report(get_matrix_report_path(csv_prefix), matrix_cell_results)
+            self.logger.info(f"Endpoint matrix report written to {file_path}")
+
+        if failed_cells:
+            self.logger.error(f"Endpoint matrix cells failed: {failed_cells}")
+
+        return self.success(f"Endpoint matrix of {len(matrix_cell_results)} cells completed, "
+                            f"{len(matrix_cell_results) - len(failed_cells)} passed.")
+
+    def postprocess_worker(self) -> int:
+        pass
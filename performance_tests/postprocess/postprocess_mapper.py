@@ -1,8 +1,14 @@
 from locust.env import Environment
 
 from performance_tests.configs.config import App, config
+from performance_tests.endpoint_matrix import is_endpoint_matrix_run
 from performance_tests.postprocess.postprocess_base import PostProcessBase
+from performance_tests.postprocess.postprocess_bulk_seed_delete import PostProcessBulkSeedDelete
 from performance_tests.postprocess.postprocess_cir_delete_schemas import PostProcessCirDeleteSchemas
+from performance_tests.postprocess.postprocess_custom_stats import PostProcessCustomStats
+from performance_tests.postprocess.postprocess_dataset_scaling import PostProcessDatasetScaling
+from performance_tests.postprocess.postprocess_endpoint_matrix import PostProcessEndpointMatrix
+from performance_tests.postprocess.postprocess_result_archive import PostProcessResultArchive
 from performance_tests.postprocess.postprocess_result_evaluator import PostProcessResultEvaluator
 
 
@@ -13,11 +19,18 @@ class PostprocessMapper:
         self.mapping_app = config.APP
 
     def initiate_postprocessors(self, header: dict, environment: Environment) -> list[PostProcessBase]:
+        # With an endpoint matrix or a dataset sweep, the result of each cell is post-processed as the cell ends, and
+        # only the combined report and the scaling model across the dataset sizes are left to write
+        if is_endpoint_matrix_run(environment.parsed_options):
+            result_postprocessors = [PostProcessEndpointMatrix, PostProcessDatasetScaling]
+        else:
+            result_postprocessors = [PostProcessCustomStats, PostProcessResultArchive, PostProcessResultEvaluator]
+
         if self.mapping_app == App.SDS:
-            postprocessors_list = [PostProcessResultEvaluator]
+            postprocessors_list = [PostProcessBulkSeedDelete, *result_postprocessors]
 
         else:
-            postprocessors_list = [PostProcessCirDeleteSchemas, PostProcessResultEvaluator]
+            postprocessors_list = [PostProcessCirDeleteSchemas, PostProcessBulkSeedDelete, *result_postprocessors]
 
         self.postprocessors = [postprocessor(header, environment) for postprocessor in postprocessors_list]
 
@@ -0,0 +1,30 @@
+from locust.env import Environment
+
+from performance_tests.postprocess.postprocess_base import PostProcessBase
+from performance_tests.result_evaluation.result_store import (
+    get_result_archive_path,
+    get_run_metadata,
+    write_result_archive,
+)
+
+
+class PostProcessResultArchive(PostProcessBase):
+    def __init__(self, header: dict, environment: Environment):
+        self.environment = environment
+
+    def postprocess_master(self) -> int:
+        csv_prefix = self.environment.parsed_options.csv_prefix if self.environment.parsed_options else None
+
+        if not csv_prefix:
+            return self.skip("No CSV result path is set. Skipping archiving the test result.")
+
+        file_path = write_result_archive(
+            get_result_archive_path(csv_prefix),
+            get_run_metadata(self.environment),
+            list(self.environment.stats.entries.values()),
+        )
+
+        return self.success(f"Test result archived to {file_path}")
+
+    def postprocess_worker(self) -> int:
+        pass
@@ -1,9 +1,44 @@
 from locust.env import Environment
+from locust.stats import StatsEntry
 
 from performance_tests.configs.endpoints_config import ALL_ENDPOINTS
+from performance_tests.configs.journeys_config import ALL_JOURNEYS, JOURNEY_REQUEST_TYPE
+from performance_tests.load_shape import (
+    NO_LOAD_SHAPE,
+    get_stage_kind,
+    load_stage_stats,
+    split_load_stage_request_name,
+)
+from performance_tests.metrics.body_streaming import body_streaming_stats, get_body_throughput
+from performance_tests.metrics.client_health import client_health_stats
+from performance_tests.metrics.http_phase_timing import HTTP_PHASES, NEW_CONNECTION, http_phase_stats
+from performance_tests.open_model import (
+    OPEN_LOAD_MODEL,
+    REPLAY_LOAD_MODEL,
+    corrected_latency_stats,
+    schedule_lag_stats,
+)
 from performance_tests.postprocess.postprocess_base import PostProcessBase
 from performance_tests.result_evaluation.result_evaluator import EvaluationResult, ResultEvaluator
-from performance_tests.result_evaluation.thresholds import THRESHOLDS_AVG_RESPONSE_TIME, THRESHOLDS_FAIL_RATIO
+from performance_tests.result_evaluation.result_store import (
+    get_request_histograms,
+    get_request_key,
+    get_result_archive_path,
+    get_run_metadata,
+    load_baseline_result,
+)
+from performance_tests.result_evaluation.statistics import histogram_percentile
+from performance_tests.result_evaluation.thresholds import (
+    THRESHOLDS_AVG_RESPONSE_TIME,
+    THRESHOLDS_BASELINE_PERCENTILES,
+    THRESHOLDS_BASELINE_SIGNIFICANCE_LEVEL,
+    THRESHOLDS_CLIENT_HEALTH,
+    THRESHOLDS_FAIL_RATIO,
+    THRESHOLDS_LOAD_STAGE_FACTOR,
+)
+
+# Exit code of a test whose result is invalid because the load generator was saturated
+INVALID_RUN_EXIT_CODE: int = 2
 
 
 class PostProcessResultEvaluator(PostProcessBase):
@@ -12,37 +47,53 @@ class PostProcessResultEvaluator(PostProcessBase):
         self.result_evaluator = ResultEvaluator(
             logger=self.logger,
             fail_ratio_thresholds=THRESHOLDS_FAIL_RATIO,
-            avg_response_time_thresholds=THRESHOLDS_AVG_RESPONSE_TIME
+            avg_response_time_thresholds=THRESHOLDS_AVG_RESPONSE_TIME,
+            client_health_thresholds=THRESHOLDS_CLIENT_HEALTH,
+            baseline_tolerance=environment.parsed_options.baseline_tolerance,
+            baseline_significance_level=THRESHOLDS_BASELINE_SIGNIFICANCE_LEVEL,
+            baseline_percentiles=THRESHOLDS_BASELINE_PERCENTILES,
+            load_stage_threshold_factors=THRESHOLDS_LOAD_STAGE_FACTOR,
         )
         self.endpoint_configs = ALL_ENDPOINTS
+        self.journey_configs = ALL_JOURNEYS
 
     def postprocess_master(self) -> int:
 
         self.logger.info("Begin test result evaluation...")
 
-        evaluation_passed: bool = True
+        # Evaluate the health of the load generator first, as a saturated generator invalidates the response times
+        client_health_passed: bool = self.evaluate_client_health()
+        self.logger.info("Client health evaluation completed.")
 
         # Evaluate average response time for each endpoint
-        for (name, method), stats in self.environment.stats.entries.items():
-            endpoint_key = self.map_endpoint_key_from_environment_name_and_method(name, method)
-            if endpoint_key is None:
-                self.logger.warning(f"Endpoint {name} with method {method} not found in endpoint configs.")
+        evaluation_passed: bool = self.evaluate_avg_response_times(self.environment.stats.entries)
 
-            threshold = self.result_evaluator.get_avg_response_time_threshold(endpoint_key)
-            evaluation_result: EvaluationResult = self.result_evaluator.evaluate_avg_response_time(
-                endpoint=endpoint_key,
-                avg_response_time=stats.avg_response_time
-            )
-
-            if not evaluation_result["result"]:
-                self.result_evaluator.prompt_anomaly(evaluation_result)
-                self.logger.error(f"Endpoint {name} with method {method} failed average response time evaluation. "
-                                  f"Average response time: {stats.avg_response_time} ms, "
-                                  f"Threshold: {threshold} ms")
+        # In open model and replay, the latency measured from the intended send time is the one seen by the arrivals
+        if self.environment.parsed_options.load_model in (OPEN_LOAD_MODEL, REPLAY_LOAD_MODEL):
+            self.log_schedule_lag()
+            self.logger.info("Evaluating coordinated omission corrected response times...")
+            if not self.evaluate_avg_response_times(corrected_latency_stats.entries()):
                 evaluation_passed = False
 
+        # With a load shape, evaluate the response times of each stage against the thresholds of its kind
+        if self.environment.parsed_options.load_shape != NO_LOAD_SHAPE and not self.evaluate_load_stage_avg_response_times():
+            evaluation_passed = False
+
         self.logger.info("Average response time evaluation completed.")
 
+        # Evaluate the response time distribution of each endpoint against the baseline run, if set
+        if self.environment.parsed_options.baseline_result:
+            if not self.evaluate_baseline(self.environment.parsed_options.baseline_result):
+                evaluation_passed = False
+
+            self.logger.info("Baseline evaluation completed.")
+
+        # Break the response times down into phases, to tell network and TLS costs apart from the service latency
+        self.log_http_phases()
+
+        # Report the throughput of the streamed response bodies, for the large schema and unit data responses
+        self.log_body_throughput()
+
         # Evaluate total fail ratio
         total_fail_ratio = self.environment.stats.total.fail_ratio
 
@@ -55,7 +106,12 @@ class PostProcessResultEvaluator(PostProcessBase):
 
         self.logger.info("Fail ratio evaluation completed.")
 
-        if not evaluation_passed:
+        if not client_health_passed:
+            self.logger.error("Test result is invalid as the load generator was saturated. "
+                              "Response times include the queueing of the load generator and cannot be attributed "
+                              "to the service. Add workers or reduce the users per worker and run the test again.")
+            self.environment.process_exit_code = INVALID_RUN_EXIT_CODE
+        elif not evaluation_passed:
             self.environment.process_exit_code = 1
         else:
             self.environment.process_exit_code = 0
@@ -65,9 +121,174 @@ class PostProcessResultEvaluator(PostProcessBase):
     def postprocess_worker(self) -> int:
         pass
 
+    def evaluate_avg_response_times(self, entries: dict[tuple[str, str], StatsEntry]) -> bool:
+        """
+        Evaluate the average response time of each stats entry against the threshold of its endpoint.
+
+        Args:
+            entries (dict): the stats entries keyed by (name, method)
+
+        Returns:
+            bool: True if all the entries are within their threshold, False otherwise
+        """
+        evaluation_passed: bool = True
+
+        for (name, method), stats in entries.items():
+            endpoint_key = self.map_endpoint_key_from_environment_name_and_method(name, method)
+            if endpoint_key is None:
+                self.logger.warning(f"Endpoint {name} with method {method} not found in endpoint configs.")
+
+            threshold = self.result_evaluator.get_avg_response_time_threshold(endpoint_key)
+            evaluation_result: EvaluationResult = self.result_evaluator.evaluate_avg_response_time(
+                endpoint=endpoint_key,
+                avg_response_time=stats.avg_response_time
+            )
+
+            if not evaluation_result["result"]:
+                self.result_evaluator.prompt_anomaly(evaluation_result)
+                self.logger.error(f"Endpoint {name} with method {method} failed average response time evaluation. "
+                                  f"Average response time: {stats.avg_response_time} ms, "
+                                  f"Threshold: {threshold} ms")
+                evaluation_passed = False
+
+        return evaluation_passed
+
+    def evaluate_load_stage_avg_response_times(self) -> bool:
+        """
+        Evaluate the average response time of the requests of each load stage against the threshold of its endpoint,
+        scaled by the factor of the stage kind.
+
+        Returns:
+            bool: True if all the stages are within their threshold, False otherwise
+        """
+        evaluation_passed: bool = True
+
+        for (stage_request_name, method), stats in load_stage_stats.entries().items():
+            label, name = split_load_stage_request_name(stage_request_name)
+            stage_kind = get_stage_kind(label)
+            endpoint_key = self.map_endpoint_key_from_environment_name_and_method(name, method)
+
+            threshold = self.result_evaluator.get_load_stage_avg_response_time_threshold(endpoint_key, stage_kind)
+            evaluation_result: EvaluationResult = self.result_evaluator.evaluate_load_stage_avg_response_time(
+                endpoint=endpoint_key,
+                stage_kind=stage_kind,
+                avg_response_time=stats.avg_response_time,
+            )
+
+            if not evaluation_result["result"]:
+                self.result_evaluator.prompt_anomaly(evaluation_result)
+                self.logger.error(f"Endpoint {name} with method {method} failed average response time evaluation "
+                                  f"during load stage {label}. Average response time: {stats.avg_response_time} ms, "
+                                  f"Threshold: {threshold} ms")
+                evaluation_passed = False
+
+        return evaluation_passed
+
+    def evaluate_baseline(self, baseline_result: str) -> bool:
+        """
+        Evaluate the response time distribution of each stats entry against its distribution in the baseline run.
+
+        Args:
+            baseline_result (str): the result archive of the baseline run, or the directory of the baseline runs, the
+                latest run executed with the same configuration being taken, other than the run itself once archived
+
+        Returns:
+            bool: True if no entry regressed from the baseline, False otherwise
+        """
+        csv_prefix = self.environment.parsed_options.csv_prefix
+        try:
+            baseline_run = load_baseline_result(
+                baseline_result,
+                get_run_metadata(self.environment),
+                get_result_archive_path(csv_prefix) if csv_prefix else None,
+            )
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Failed to load the baseline result {baseline_result}: {e}")
+            return False
+
+        self.logger.info(f"Evaluating response times against the baseline run of commit "
+                         f"{baseline_run['metadata']['commit']} at {baseline_run['metadata']['created_at']}...")
+        self.result_evaluator.baseline_histograms = get_request_histograms(baseline_run)
+        baseline_passed: bool = True
+
+        for (name, method), stats in self.environment.stats.entries.items():
+            request_key = get_request_key(name, method)
+            evaluation_result: EvaluationResult = self.result_evaluator.evaluate_baseline(request_key, stats.response_times)
+
+            if not evaluation_result["result"]:
+                baseline = self.result_evaluator.get_baseline_histogram(request_key)
+                percentiles = ", ".join(
+                    f"p{percentile * 100:g} {stats.get_response_time_percentile(percentile)} ms "
+                    f"(baseline {histogram_percentile(baseline, percentile)} ms)"
+                    for percentile in THRESHOLDS_BASELINE_PERCENTILES
+                )
+                self.result_evaluator.prompt_anomaly(evaluation_result)
+                self.logger.error(f"Endpoint {name} with method {method} regressed from the baseline run: {percentiles}")
+                baseline_passed = False
+
+        return baseline_passed
+
+    def evaluate_client_health(self) -> bool:
+        """
+        Evaluate the 95th percentile of the client health metrics of each load generator process against the
+        thresholds.
+
+        Returns:
+            bool: True if no load generator process was saturated, False otherwise
+        """
+        client_health_passed: bool = True
+
+        for (process_name, metric), stats in client_health_stats.entries().items():
+            value = stats.get_response_time_percentile(0.95)
+            evaluation_result: EvaluationResult = self.result_evaluator.evaluate_client_health(metric, value)
+
+            if not evaluation_result["result"]:
+                self.result_evaluator.prompt_anomaly(evaluation_result)
+                self.logger.error(f"Load generator {process_name} was saturated. 95th percentile of {metric}: {value}, "
+                                  f"Threshold: {THRESHOLDS_CLIENT_HEALTH[metric]}")
+                client_health_passed = False
+
+        return client_health_passed
+
+    def log_http_phases(self) -> None:
+        """Log the average and 95th percentile of each request phase per endpoint, and the connection reuse ratio"""
+        phase_entries = http_phase_stats.entries()
+
+        for name in dict.fromkeys(name for name, _ in phase_entries):
+            phases = []
+            for phase in HTTP_PHASES:
+                stats = phase_entries.get((name, phase))
+                if stats is None:
+                    continue
+
+                if phase == NEW_CONNECTION:
+                    phases.append(f"connection reuse {1 - stats.avg_response_time:.1%}")
+                else:
+                    phases.append(f"{phase} avg {stats.avg_response_time:.1f} "
+                                  f"p95 {stats.get_response_time_percentile(0.95)}")
+
+            self.logger.info(f"HTTP phases of endpoint {name}: {', '.join(phases)}")
+
+    def log_body_throughput(self) -> None:
+        """Log the bytes, time to last byte and throughput of the streamed response bodies per endpoint"""
+        for (name, _), stats in body_streaming_stats.entries().items():
+            self.logger.info(f"Streamed bodies of endpoint {name}: {stats.total_content_length} bytes over "
+                             f"{stats.num_requests} responses, average {stats.avg_content_length:.0f} bytes, "
+                             f"time to last byte avg {stats.avg_response_time:.1f} "
+                             f"p95 {stats.get_response_time_percentile(0.95)} ms, "
+                             f"throughput {get_body_throughput(stats):.2f} MB/s")
+
+    def log_schedule_lag(self) -> None:
+        """Log how far behind the intended send times the requests were sent in open model"""
+        for (name, method), stats in schedule_lag_stats.entries().items():
+            self.logger.info(f"Schedule lag of endpoint {name} with method {method}: "
+                             f"average {stats.avg_response_time:.1f} ms, "
+                             f"99th percentile {stats.get_response_time_percentile(0.99)} ms, "
+                             f"max {stats.max_response_time} ms")
+
     def map_endpoint_key_from_environment_name_and_method(self, endpoint_name: str, endpoint_method: str) -> str | None:
         """
-        Function to get the endpoint key from the environment.
+        Function to get the endpoint or journey key from the environment.
 
         Args:
             endpoint_name (str): The name of the endpoint.
@@ -76,6 +297,11 @@ class PostProcessResultEvaluator(PostProcessBase):
         Returns:
             str: The endpoint key
         """
+        if endpoint_method.upper() == JOURNEY_REQUEST_TYPE:
+            for key, value in self.journey_configs.items():
+                if value["name"] in endpoint_name:
+                    return key
+
         for key, value in self.endpoint_configs.items():
             if value["name"] in endpoint_name and value["method"].upper() == endpoint_method.upper():
                 return key
@@ -0,0 +1,96 @@
+from locust.env import Environment
+from locust.runners import WorkerRunner
+
+from performance_tests.bulk_seed import SeedRecord, get_seed_records, group_seed_records
+from performance_tests.configs.config import App, config
+from performance_tests.locust_helper import LocustHelper
+from performance_tests.preprocess.preprocess_base import PreProcessBase
+from performance_tests.setup_engine import setup_engine
+
+
+class PreProcessBulkSeed(PreProcessBase):
+    def __init__(self, header: dict, environment: Environment):
+        self.header = header
+        self.environment = environment
+        self.worker_index = environment.runner.worker_index if isinstance(environment.runner, WorkerRunner) else None
+        self.locust_helper = LocustHelper()
+
+    def is_required(self) -> bool:
+        """Seeding is only required when a number of records to seed is set"""
+        return self.environment.parsed_options.seed_records > 0
+
+    def count_existing_records(self, group: tuple[str, ...]) -> int | None:
+        """Count the schemas/CIs already published for a metadata query"""
+        if config.APP == App.SDS:
+            (survey_id,) = group
+            guids = self.locust_helper.get_sds_schema_guids(self.header, config.BASE_URL, survey_id)
+        else:
+            survey_id, classifier_value, language = group
+            guids = self.locust_helper.get_cir_schema_guids(
+                headers=self.header,
+                base_url=config.BASE_URL,
+                classifier_type=config.TEST_CI_CLASSIFIER_TYPE,
+                classifier_value=classifier_value,
+                language=language,
+                survey_id=survey_id,
+            )
+
+        return None if guids is None else len(guids)
+
+    def publish_seed_record(self, record: SeedRecord) -> int:
+        """Publish a single seeded schema/CI"""
+        if config.APP == App.SDS:
+            return self.locust_helper.create_sds_schema_record_before_test(
+                self.header,
+                config.BASE_URL,
+                record["survey_id"],
+                self.schema_payload,
+            )
+
+        return self.locust_helper.create_cir_schema_record_before_test(
+            headers=self.header,
+            base_url=config.BASE_URL,
+            guid=f"{config.TEST_SEED_SURVEY_ID_PREFIX}_{record['index']}",
+            validator_version=config.TEST_CI_VALIDATOR_VERSION,
+            payload=self.schema_payload,
+            survey_id=record["survey_id"],
+            form_type=record["classifier_value"],
+            language=record["language"],
+        )
+
+    def preprocess_master(self) -> int:
+        if not self.is_required():
+            return self.skip("No records to seed. Skipping bulk seeding.")
+
+        parsed_options = self.environment.parsed_options
+        groups = group_seed_records(get_seed_records(parsed_options.seed_records, parsed_options.seed_surveys))
+
+        # Records already published by a previous run are skipped, so that the seeded collection is reused as is
+        existing_counts = setup_engine.map(self.count_existing_records, groups, parsed_options.seed_concurrency)
+        if None in existing_counts:
+            return self.error("Error retrieving seeded records metadata")
+
+        missing_records = [
+            record
+            for records, existing_count in zip(groups.values(), existing_counts, strict=True)
+            for record in records[existing_count:]
+        ]
+        if not missing_records:
+            return self.skip(f"All {parsed_options.seed_records} records are already seeded. Skipping bulk seeding.")
+
+        self.logger.info(f"Seeding {len(missing_records)} records across {len(groups)} collections "
+                         f"with {min(parsed_options.seed_concurrency, setup_engine.concurrency)} concurrent requests...")
+
+        self.schema_payload = self.locust_helper.load_json(
+            config.TEST_SCHEMA_FILE if config.APP == App.SDS else config.TEST_CI_SCHEMA_FILE
+        )
+        results = setup_engine.map(self.publish_seed_record, missing_records, parsed_options.seed_concurrency)
+
+        failed_count = results.count(-1)
+        if failed_count:
+            return self.error(f"Error seeding {failed_count} of {len(missing_records)} records")
+
+        return self.success("Bulk seeding pre-processing completed successfully on master")
+
+    def preprocess_worker(self) -> int:
+        return self.skip(f"Bulk seeding is done on master. Skipping on worker {self.worker_index}.")
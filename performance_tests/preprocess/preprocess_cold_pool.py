@@ -0,0 +1,154 @@
+import logging
+
+import gevent
+from gevent import Greenlet
+from locust.env import Environment
+from locust.runners import WorkerRunner
+
+from performance_tests.cache_key_pool import WARM_CACHE_MODE, ColdCacheKeyPool, select_cold_pool_keys
+from performance_tests.configs.config import App, config
+from performance_tests.locust_helper import LocustHelper
+from performance_tests.preprocess.preprocess_base import PreProcessBase
+from performance_tests.setup_engine import gather
+from performance_tests.test_data_shard import get_worker_partition, get_worker_shard
+
+logger = logging.getLogger(__name__)
+
+
+def get_worker_cold_pool_keys(cold_pool_guids: list[str], environment: Environment) -> list[str]:
+    """
+    Get the keys of the cold pool read by this process: the first cold pool size guids, split between the workers
+    whether the test data is sharded or not, so that no key read on the cold path by a worker is read again by another.
+    """
+    cold_pool_guids = select_cold_pool_keys(cold_pool_guids, environment.parsed_options.cold_pool_size)
+
+    _, shards = get_worker_shard(environment)
+    if len(cold_pool_guids) < shards:
+        logger.warning(
+            f"Cold pool of {len(cold_pool_guids)} guids is smaller than the {shards} workers, "
+            "workers without a key of their own read the same key"
+        )
+
+    return get_worker_partition(cold_pool_guids, environment)
+
+
+class PreProcessColdPool(PreProcessBase):
+    cold_pool: ColdCacheKeyPool | None = None
+
+    def __init__(self, header: dict, environment: Environment):
+        self.header = header
+        self.environment = environment
+        self.worker_index = environment.runner.worker_index if isinstance(environment.runner, WorkerRunner) else None
+        self.locust_helper = LocustHelper()
+
+    def is_required(self) -> bool:
+        """The cold pool is only required when read requests are sent on the cold path"""
+        return self.environment.parsed_options.cache_mode != WARM_CACHE_MODE
+
+    def get_cold_pool_guids(self) -> list[str] | None:
+        """Get the guids of the schemas/CIs of the cold pool"""
+        if config.APP == App.SDS:
+            return self.locust_helper.get_sds_schema_guids(self.header, config.BASE_URL, config.TEST_COLD_POOL_SURVEY_ID)
+
+        return self.locust_helper.get_cir_schema_guids(
+            headers=self.header,
+            base_url=config.BASE_URL,
+            classifier_type=config.TEST_CI_CLASSIFIER_TYPE,
+            classifier_value=config.TEST_CI_CLASSIFIER_VALUE,
+            language=config.TEST_CI_LANGUAGE,
+            survey_id=config.TEST_COLD_POOL_SURVEY_ID,
+        )
+
+    def wait_and_get_cold_pool_guids(self, attempts: int = 10, backoff: int = 0.25) -> list[str] | None:
+        """
+        Wait for the cold pool to be published and get the guids of its schemas/CIs
+
+        Args:
+            attempts (int): the number of attempts to make
+            backoff (int): the backoff time
+
+        Returns:
+            list[str] | None: the cold pool guids, None if the cold pool is not fully published
+        """
+        cold_pool_size = self.environment.parsed_options.cold_pool_size
+
+        while attempts != 0:
+            cold_pool_guids = self.get_cold_pool_guids()
+
+            if cold_pool_guids is not None and len(cold_pool_guids) >= cold_pool_size:
+                return cold_pool_guids
+
+            attempts -= 1
+            gevent.sleep(backoff)
+            backoff += backoff
+
+        self.logger.error(f"Error getting the {cold_pool_size} cold pool guids using survey_id: {config.TEST_COLD_POOL_SURVEY_ID}.")
+        return None
+
+    def publish_cold_pool_record(self, index: int) -> Greenlet:
+        """Start publishing a single schema/CI of the cold pool"""
+        if config.APP == App.SDS:
+            return self.locust_helper.create_sds_schema_record_before_test_async(
+                self.header,
+                config.BASE_URL,
+                config.TEST_COLD_POOL_SURVEY_ID,
+                self.schema_payload,
+            )
+
+        return self.locust_helper.create_cir_schema_record_before_test_async(
+            headers=self.header,
+            base_url=config.BASE_URL,
+            guid=f"{config.TEST_COLD_POOL_SURVEY_ID}_{index}",
+            validator_version=config.TEST_CI_VALIDATOR_VERSION,
+            payload=self.schema_payload,
+            survey_id=config.TEST_COLD_POOL_SURVEY_ID,
+        )
+
+    def preprocess_master(self) -> int:
+        if not self.is_required():
+            return self.skip("Warm cache mode. Skipping cold pool publish.")
+
+        cold_pool_size = self.environment.parsed_options.cold_pool_size
+
+        existing_guids = self.get_cold_pool_guids()
+        if existing_guids is None:
+            return self.error("Error retrieving cold pool metadata")
+
+        if len(existing_guids) >= cold_pool_size:
+            return self.skip(f"Cold pool of {len(existing_guids)} records already exists. Skipping cold pool publish.")
+
+        missing_count = cold_pool_size - len(existing_guids)
+        self.logger.info(f"Publishing {missing_count} records to the cold pool...")
+
+        self.schema_payload = self.locust_helper.load_json(
+            config.TEST_SCHEMA_FILE if config.APP == App.SDS else config.TEST_CI_SCHEMA_FILE
+        )
+        results = gather([self.publish_cold_pool_record(index) for index in range(len(existing_guids), cold_pool_size)])
+
+        failed_count = results.count(-1)
+        if failed_count:
+            return self.error(f"Error publishing {failed_count} of {missing_count} cold pool records")
+
+        return self.success("Cold pool pre-processing completed successfully on master")
+
+    def preprocess_worker(self) -> int:
+        if not self.is_required():
+            return self.skip("Warm cache mode. Skipping cold pool retrieval.")
+
+        self.logger.info(f"Retrieving cold pool guids on worker {self.worker_index}")
+        cold_pool_guids = self.wait_and_get_cold_pool_guids()
+
+        if not cold_pool_guids:
+            return self.error(f"Cold pool guids cannot be retrieved on worker {self.worker_index}")
+
+        # Each worker walks its own shard of the pool, so that a key read on the cold path by a worker is not read
+        # again by another one as if it were cold
+        self.cold_pool = ColdCacheKeyPool(
+            get_worker_cold_pool_keys(cold_pool_guids, self.environment), seed=self.worker_index
+        )
+        self.logger.info(f"Cold pool of {len(self.cold_pool)} guids retrieved")
+
+        return self.success(f"Cold pool pre-processing completed successfully on worker {self.worker_index}")
+
+    def get_cold_pool(self) -> ColdCacheKeyPool | None:
+        return self.cold_pool
@@ -2,7 +2,9 @@ from locust.env import Environment
 
 from performance_tests.configs.config import App, config
 from performance_tests.preprocess.preprocess_base import PreProcessBase
+from performance_tests.preprocess.preprocess_bulk_seed import PreProcessBulkSeed
 from performance_tests.preprocess.preprocess_cir_schema import PreProcessCIRSchema
+from performance_tests.preprocess.preprocess_cold_pool import PreProcessColdPool
 from performance_tests.preprocess.preprocess_sds_dataset import PreProcessSDSDataset
 from performance_tests.preprocess.preprocess_sds_schema import PreProcessSDSSchema
 
@@ -15,12 +17,12 @@ class PreprocessMapper:
 
     def initiate_preprocessors(self, header: dict, environment: Environment) -> list[PreProcessBase]:
         if self.mapping_app == App.SDS:
-            # For SDS, we need to preprocess both Schema and Dataset
-            preprocessors_list = [PreProcessSDSSchema, PreProcessSDSDataset]
+            # For SDS, we need to preprocess both Schema and Dataset, the cold pool of schemas and the seeded schemas if required
+            preprocessors_list = [PreProcessSDSSchema, PreProcessSDSDataset, PreProcessColdPool, PreProcessBulkSeed]
 
         else:
-            # For CIR, we only need to preprocess the CIR Schema
-            preprocessors_list = [PreProcessCIRSchema]
+            # For CIR, we only need to preprocess the CIR Schema, the cold pool of CIs and the seeded CIs if required
+            preprocessors_list = [PreProcessCIRSchema, PreProcessColdPool, PreProcessBulkSeed]
 
         self.preprocessors = [preprocessor(header, environment) for preprocessor in preprocessors_list]
 
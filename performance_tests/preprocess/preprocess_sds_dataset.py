@@ -4,10 +4,18 @@ from locust.env import Environment
 from locust.runners import WorkerRunner
 
 from performance_tests.configs.config import config
-from performance_tests.json_generator import JsonGenerator
+from performance_tests.json_generator import (
+    JsonGenerator,
+    get_dataset_file,
+    get_dataset_identifiers,
+    get_dataset_period_id,
+    get_dataset_variant,
+    has_known_identifiers,
+)
 from performance_tests.locust_helper import LocustHelper
 from performance_tests.locust_test import FIXED_IDENTIFIERS
 from performance_tests.preprocess.preprocess_base import PreProcessBase
+from performance_tests.unit_data_generator import create_unit_data_generator
 
 
 class PreProcessSDSDataset(PreProcessBase):
@@ -21,9 +29,13 @@ class PreProcessSDSDataset(PreProcessBase):
         self.locust_helper = LocustHelper()
 
     def preprocess_master(self) -> int:
+        dataset_entries = self.environment.parsed_options.dataset_entries
+        variant = get_dataset_variant(self.environment.parsed_options)
+        period_id = get_dataset_period_id(dataset_entries, variant)
+        dataset_file = get_dataset_file(dataset_entries, variant)
 
         response = self.locust_helper.get_sds_dataset_metadata(
-            self.header, config.BASE_URL, config.TEST_SURVEY_ID, config.TEST_PERIOD_ID
+            self.header, config.BASE_URL, config.TEST_SURVEY_ID, period_id
         )
 
 
@@ -34,16 +46,23 @@ class PreProcessSDSDataset(PreProcessBase):
             return self.error(f"Error retrieving dataset metadata: {response.status_code}")
 
 
-        self.logger.info("Generating dataset file...")
+        self.logger.info(f"Generating dataset file of {dataset_entries} entries...")
+
+        # A sharded or replayed dataset has identifiers known to every process, for the workers and users to split
+        # them or the replayed identifiers to be rewritten to them
+        if has_known_identifiers(self.environment.parsed_options):
+            identifiers = get_dataset_identifiers(dataset_entries)
+        else:
+            identifiers = FIXED_IDENTIFIERS
 
         json_generator = JsonGenerator(
             config.TEST_SURVEY_ID,
-            config.TEST_DATASET_FILE,
-            FIXED_IDENTIFIERS,
+            dataset_file,
+            identifiers,
+            period_id,
+            create_unit_data_generator(self.environment.parsed_options),
         )
 
-        dataset_entries = self.environment.parsed_options.dataset_entries
-
         if json_generator.generate_dataset_file(dataset_entries) < 0:
             return self.error("Error generating dataset file")
 
@@ -58,13 +77,13 @@ class PreProcessSDSDataset(PreProcessBase):
 
         self.logger.info("Uploading file to bucket...")
         if self.locust_helper.upload_file_to_bucket(
-            config.TEST_DATASET_FILE, self.dataset_bucket_name
+            dataset_file, self.dataset_bucket_name
         ) < 0:
             return self.error("Error uploading file to bucket")
 
         self.logger.info("Wait and check if file is uploaded...")
         if self.locust_helper.wait_and_check_file_is_uploaded(
-            config.TEST_DATASET_FILE, self.dataset_bucket_name
+            dataset_file, self.dataset_bucket_name
         ) < 0:
             return self.error("Error waiting for file to be uploaded")
 
@@ -81,7 +100,12 @@ class PreProcessSDSDataset(PreProcessBase):
         self.logger.info(f"Retrieving dataset ID via SDS Dataset preprocessor on worker {worker_index}")
 
         dataset_id = self.locust_helper.wait_and_get_sds_dataset_id(
-            self.header, config.BASE_URL, config.TEST_SURVEY_ID, config.TEST_PERIOD_ID
+            self.header,
+            config.BASE_URL,
+            config.TEST_SURVEY_ID,
+            get_dataset_period_id(
+                self.environment.parsed_options.dataset_entries, get_dataset_variant(self.environment.parsed_options)
+            ),
         )
 
         if not dataset_id:
@@ -0,0 +1,242 @@
+import datetime
+import hashlib
+import json
+import logging
+import os
+from argparse import Namespace
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, Final, TypedDict
+
+from gevent import Greenlet
+
+from performance_tests.cache_key_pool import WARM_CACHE_MODE
+from performance_tests.configs.config import App, config
+from performance_tests.locust_helper import LocustHelper
+from performance_tests.setup_engine import gather, setup_engine
+
+logger = logging.getLogger(__name__)
+
+# Version of the manifest format, a manifest of another version is never reused
+PREPROCESS_MANIFEST_VERSION: Final[int] = 1
+
+# Age in hours after which a manifest is no longer reused, when the max age option is not set
+DEFAULT_PREPROCESS_MANIFEST_MAX_AGE: Final[float] = 24.0
+
+
+class PreprocessManifest(TypedDict):
+    """
+    A TypedDict to represent the state of the test data left by the preprocessing of a run, for the next runs with the
+    same parameters to reuse it instead of preprocessing again.
+    """
+    version: int # Version of the manifest format
+    parameters: dict[str, Any] # App, base URL and preprocess options the test data was preprocessed from
+    parameters_hash: str # SHA-256 of the parameters
+    created_at: str # ISO 8601 date and time the manifest was written at, in UTC
+    dataset_id: str | None # Id of the published dataset (SDS only)
+    schema_guid: str | None # Guid of the test schema/CI
+    cold_pool_guids: list[str] # Guids of the schemas/CIs of the cold pool, empty in warm cache mode
+
+
+def hash_preprocess_parameters(parameters: dict[str, Any]) -> str:
+    """Hash the parameters the test data is preprocessed from, independently of their order"""
+    return hashlib.sha256(json.dumps(parameters, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def load_preprocess_manifest(file_path: str) -> PreprocessManifest | None:
+    """Load the preprocess manifest, None if there is none or it cannot be read"""
+    try:
+        with open(file_path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Preprocess manifest {file_path} cannot be read: {e}")
+        return None
+
+
+def write_preprocess_manifest(file_path: str, manifest: PreprocessManifest) -> None:
+    """Write the preprocess manifest, replacing the previous one at once so that it is never read half written"""
+    path = Path(file_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    temp_path = path.with_name(f"{path.name}.tmp")
+    temp_path.write_text(json.dumps(manifest, indent=2))
+    os.replace(temp_path, path)
+
+
+def get_manifest_invalid_reason(manifest: PreprocessManifest, parameters_hash: str, max_age: float) -> str | None:
+    """
+    Check the manifest against the requested parameters without any request.
+
+    Args:
+        manifest (PreprocessManifest): the manifest of a previous run
+        parameters_hash (str): the hash of the parameters of this run
+        max_age (float): the maximum age of the manifest in hours
+
+    Returns:
+        str | None: the reason the manifest cannot be reused, None if it can
+    """
+    if manifest.get("version") != PREPROCESS_MANIFEST_VERSION:
+        return f"manifest version {manifest.get('version')} is not {PREPROCESS_MANIFEST_VERSION}"
+
+    if manifest.get("parameters_hash") != parameters_hash:
+        return "test data was preprocessed from other parameters"
+
+    age = datetime.datetime.now(datetime.UTC) - datetime.datetime.fromisoformat(manifest["created_at"])
+    if age > datetime.timedelta(hours=max_age):
+        return f"manifest is {age.total_seconds() / 3600:.1f} hours old, over the max age of {max_age:g} hours"
+
+    if not manifest.get("schema_guid") or (config.APP == App.SDS and not manifest.get("dataset_id")):
+        return "manifest has no test data"
+
+    return None
+
+
+class PreprocessManifestVerifier:
+    """
+    Check that the test data of a manifest is still served, with one metadata request per kind of test data made
+    concurrently, and collect the state of the freshly preprocessed test data into a manifest.
+    """
+
+    def __init__(self, header: dict, cache_mode: str):
+        self.header = header
+        self.cache_mode = cache_mode
+        self.locust_helper = LocustHelper()
+
+    def get_schema_guids_async(self, survey_id: str) -> Greenlet:
+        """Start getting the guids of the schemas/CIs of a survey"""
+        if config.APP == App.SDS:
+            return self.locust_helper.get_sds_schema_guids_async(self.header, config.BASE_URL, survey_id)
+
+        return self.locust_helper.get_cir_schema_guids_async(
+            headers=self.header,
+            base_url=config.BASE_URL,
+            classifier_type=config.TEST_CI_CLASSIFIER_TYPE,
+            classifier_value=config.TEST_CI_CLASSIFIER_VALUE,
+            language=config.TEST_CI_LANGUAGE,
+            survey_id=survey_id,
+        )
+
+    def get_dataset_ids(self, period_id: str) -> list[str] | None:
+        """Get the ids of the datasets published for the test survey and the given period"""
+        response = self.locust_helper.get_sds_dataset_metadata(self.header, config.BASE_URL, config.TEST_SURVEY_ID, period_id)
+        if response.status_code != HTTPStatus.OK:
+            return None
+
+        return [dataset_metadata["dataset_id"] for dataset_metadata in response.json()]
+
+    def verify(self, manifest: PreprocessManifest, period_id: str) -> str | None:
+        """
+        Check that the test data of the manifest is still served.
+
+        Returns:
+            str | None: the reason the manifest cannot be reused, None if it can
+        """
+        survey_ids = [config.TEST_SURVEY_ID]
+        if self.cache_mode != WARM_CACHE_MODE:
+            survey_ids.append(config.TEST_COLD_POOL_SURVEY_ID)
+
+        calls = [self.get_schema_guids_async(survey_id) for survey_id in survey_ids]
+        if config.APP == App.SDS:
+            calls.append(setup_engine.spawn(self.get_dataset_ids, period_id))
+        results = gather(calls)
+
+        if manifest["schema_guid"] not in (results[0] or []):
+            return f"schema {manifest['schema_guid']} is no longer served"
+
+        if self.cache_mode != WARM_CACHE_MODE and not set(manifest["cold_pool_guids"]) <= set(results[1] or []):
+            return "cold pool is no longer served"
+
+        if config.APP == App.SDS and manifest["dataset_id"] not in (results[-1] or []):
+            return f"dataset {manifest['dataset_id']} is no longer served"
+
+        return None
+
+    def collect(self, parameters: dict[str, Any], period_id: str) -> PreprocessManifest | None:
+        """Collect the state of the test data published by the preprocessing, None if any of it is not served yet"""
+        schema_guid = None
+        dataset_id = None
+        if config.APP == App.SDS:
+            schema_guid = self.locust_helper.wait_and_get_sds_schema_guid(self.header, config.BASE_URL, config.TEST_SURVEY_ID)
+            dataset_id = self.locust_helper.wait_and_get_sds_dataset_id(
+                self.header, config.BASE_URL, config.TEST_SURVEY_ID, period_id
+            )
+        else:
+            schema_guid = self.locust_helper.wait_and_get_cir_schema_guid(
+                headers=self.header,
+                base_url=config.BASE_URL,
+                classifier_type=config.TEST_CI_CLASSIFIER_TYPE,
+                classifier_value=config.TEST_CI_CLASSIFIER_VALUE,
+                language=config.TEST_CI_LANGUAGE,
+                survey_id=config.TEST_SURVEY_ID,
+            )
+
+        cold_pool_guids: list[str] | None = []
+        if self.cache_mode != WARM_CACHE_MODE:
+            cold_pool_guids = self.get_schema_guids_async(config.TEST_COLD_POOL_SURVEY_ID).get()
+
+        if not schema_guid or (config.APP == App.SDS and not dataset_id) or cold_pool_guids is None:
+            return None
+
+        return PreprocessManifest(
+            version=PREPROCESS_MANIFEST_VERSION,
+            parameters=parameters,
+            parameters_hash=hash_preprocess_parameters(parameters),
+            created_at=datetime.datetime.now(datetime.UTC).isoformat(),
+            dataset_id=dataset_id,
+            schema_guid=schema_guid,
+            cold_pool_guids=cold_pool_guids,
+        )
+
+
+def load_reusable_preprocess_manifest(
+        options: Namespace,
+        header: dict,
+        parameters: dict[str, Any],
+        period_id: str,
+) -> PreprocessManifest | None:
+    """
+    Load the preprocess manifest of a previous run, if its test data matches the parameters of this run and is still
+    served, so that the preprocessing is skipped.
+
+    Args:
+        options (Namespace): the parsed options, with the path and max age of the manifest
+        header (dict): the headers of the metadata requests
+        parameters (dict): the parameters the test data of this run is preprocessed from
+        period_id (str): the period of the dataset of this run (SDS only)
+
+    Returns:
+        PreprocessManifest | None: the manifest to reuse, None to preprocess the test data
+    """
+    manifest = load_preprocess_manifest(options.preprocess_manifest)
+    if manifest is None:
+        return None
+
+    reason = get_manifest_invalid_reason(
+        manifest, hash_preprocess_parameters(parameters), options.preprocess_manifest_max_age
+    )
+    if reason is None and options.seed_records > 0 and not options.seed_keep:
+        reason = "seeded records are deleted after each run"
+    if reason is None:
+        reason = PreprocessManifestVerifier(header, options.cache_mode).verify(manifest, period_id)
+
+    if reason:
+        logger.info(f"Preprocess manifest {options.preprocess_manifest} not reused: {reason}.")
+        return None
+
+    logger.info(f"Reusing the test data of the preprocess manifest {options.preprocess_manifest} "
+                f"created at {manifest['created_at']}. Skipping pre-processing.")
+
+    return manifest
+
+
+def save_preprocess_manifest(options: Namespace, header: dict, parameters: dict[str, Any], period_id: str) -> None:
+    """Write the manifest of the test data preprocessed by this run, for the next runs to reuse it"""
+    manifest = PreprocessManifestVerifier(header, options.cache_mode).collect(parameters, period_id)
+    if manifest is None:
+        logger.warning("Preprocessed test data cannot be retrieved. The preprocess manifest is not written.")
+        return
+
+    write_preprocess_manifest(options.preprocess_manifest, manifest)
+    logger.info(f"Preprocess manifest written to {options.preprocess_manifest}")
@@ -0,0 +1,115 @@
+import logging
+import random
+import zlib
+from http import HTTPStatus
+from typing import Final, TypedDict
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Share of the responses validated when the response validation rate option is not set, 0 disabling the validation
+DEFAULT_RESPONSE_VALIDATION_RATE: Final[float] = 0.0
+
+
+class ResponseDigest(TypedDict):
+    """
+    A TypedDict to represent the reference response of an endpoint, fetched once before the test, that the responses
+    to the same URL are validated against.
+    """
+    url: str # Full URL of the reference request
+    status_code: int # Status code of the reference response
+    size: int # Size of the body of the reference response in bytes
+    crc32: int # CRC-32 of the body of the reference response
+
+
+def digest_response_body(body: bytes) -> int:
+    """Digest a response body, without decoding or parsing it"""
+    return zlib.crc32(body)
+
+
+def fetch_response_digest(url: str, headers: dict | None) -> ResponseDigest | None:
+    """
+    Fetch the reference response of a URL and digest it, None if the reference request fails, the responses to
+    the URL then being validated on their status and size only.
+    """
+    try:
+        response = requests.get(url, headers=headers, timeout=60)
+    except requests.RequestException as e:
+        logger.warning(f"Reference response of {url} cannot be fetched: {e}")
+        return None
+
+    if response.status_code != HTTPStatus.OK or not response.content:
+        logger.warning(f"Reference response of {url} cannot be digested: status {response.status_code}, "
+                       f"{len(response.content)} bytes")
+        return None
+
+    return ResponseDigest(
+        url=url,
+        status_code=response.status_code,
+        size=len(response.content),
+        crc32=digest_response_body(response.content),
+    )
+
+
+class ResponseValidator:
+    """
+    Validate a sample of the responses of the test, so that a successful status carrying a wrong or empty body is
+    counted as a failure.
+
+    A sampled response is checked on its status, on the size bounds of its endpoint and, if it answers the URL of the
+    reference response of its endpoint, on the size and CRC-32 of its body against the reference. The body is never
+    decoded or parsed, so that the validation costs a comparison and a checksum of the body at most.
+    """
+
+    def __init__(self, rate: float, digests: dict[str, ResponseDigest]):
+        if not 0 <= rate <= 1:
+            raise ValueError(f"Invalid response validation rate: {rate}. Must be between 0 and 1")
+
+        self.rate = rate
+        self.digests = digests
+
+    def is_sampled(self) -> bool:
+        """Draw whether the next response is validated"""
+        return self.rate >= 1 or random.random() < self.rate
+
+    def validate(
+            self,
+            endpoint_name: str,
+            url: str,
+            status_code: int,
+            body: bytes,
+            size_bounds: tuple[int, int] | None = None,
+    ) -> str | None:
+        """
+        Validate a response of an endpoint.
+
+        Args:
+            endpoint_name (str): the name of the endpoint in the endpoints config
+            url (str): the full URL of the request
+            status_code (int): the status code of the response
+            body (bytes): the body of the response
+            size_bounds (tuple[int, int] | None): the minimum and maximum size of the body in bytes, if bounded
+
+        Returns:
+            str | None: the reason the response is invalid, None if it is valid
+        """
+        digest = self.digests.get(endpoint_name)
+        expected_status = digest["status_code"] if digest else None
+        if expected_status and status_code != expected_status:
+            return f"Response status {status_code}, expected {expected_status}"
+
+        if not expected_status and not HTTPStatus.OK <= status_code < HTTPStatus.MULTIPLE_CHOICES:
+            return f"Response status {status_code}, expected a successful status"
+
+        if size_bounds and not size_bounds[0] <= len(body) <= size_bounds[1]:
+            return f"Response body of {len(body)} bytes, expected between {size_bounds[0]} and {size_bounds[1]}"
+
+        if digest and url == digest["url"]:
+            if len(body) != digest["size"]:
+                return f"Response body of {len(body)} bytes, expected the {digest['size']} bytes of the reference"
+
+            if digest_response_body(body) != digest["crc32"]:
+                return "Response body does not match the reference response"
+
+        return None
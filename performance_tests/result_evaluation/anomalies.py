@@ -2,6 +2,8 @@ from typing import Final, TypedDict
 
 FAIL_RATIO_EXCEEDED_ANOMALY: Final[str] = "fail_ratio_exceeded_anomaly"
 AVG_RESPONSE_TIME_EXCEEDED_ANOMALY: Final[str] = "avg_response_time_exceeded_anomaly"
+LOAD_GENERATOR_SATURATED_ANOMALY: Final[str] = "load_generator_saturated_anomaly"
+BASELINE_REGRESSION_ANOMALY: Final[str] = "baseline_regression_anomaly"
 
 
 class Anomaly(TypedDict):
@@ -20,5 +22,13 @@ ANOMALIES: Final[dict[str, Anomaly]] = {
     AVG_RESPONSE_TIME_EXCEEDED_ANOMALY: {
         "name": AVG_RESPONSE_TIME_EXCEEDED_ANOMALY,
         "logging": "Performance Test average response time exceeded threshold."
+    },
+    LOAD_GENERATOR_SATURATED_ANOMALY: {
+        "name": LOAD_GENERATOR_SATURATED_ANOMALY,
+        "logging": "Performance Test load generator was saturated. The test result is invalid."
+    },
+    BASELINE_REGRESSION_ANOMALY: {
+        "name": BASELINE_REGRESSION_ANOMALY,
+        "logging": "Performance Test response times regressed from the baseline run."
     }
 }
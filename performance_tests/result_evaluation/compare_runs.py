@@ -0,0 +1,195 @@
+"""
+Comparison of the latest run against the previous runs stored in the result directory, to detect response time
+regressions and trends across nightly runs.
+
+The response time histograms of the previous runs are pooled into a baseline, and each endpoint percentile of the
+latest run is reported as a regression when it exceeds the baseline by more than the tolerance and the latest
+distribution is significantly higher than the baseline one (Mann-Whitney U test).
+
+Only the runs executed with the same configuration as the latest run (host, endpoints, journeys, traffic profile, load
+model, load shape, cache mode, users and dataset entries) are compared, unless --all-configs is set.
+
+Usage:
+    APP=sds python -m performance_tests.result_evaluation.compare_runs --results-dir /locust_tasks_result/sds --runs 10
+"""
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Final, TypedDict
+
+from performance_tests.result_evaluation.result_store import (
+    RunResult,
+    find_result_archives,
+    get_request_histograms,
+    get_request_key,
+    is_comparable,
+    read_result_archives,
+)
+from performance_tests.result_evaluation.statistics import histogram_percentile, mann_whitney_u, merge_histograms
+
+logger = logging.getLogger(__name__)
+
+# Percentiles of the response times compared between runs
+COMPARED_PERCENTILES: Final[tuple[float, ...]] = (0.5, 0.9, 0.95, 0.99)
+
+# Minimum number of runs to compare, the latest run and at least one previous run
+MIN_COMPARED_RUNS: Final[int] = 2
+
+
+class PercentileComparison(TypedDict):
+    """
+    A TypedDict to represent the comparison of a response time percentile of an endpoint between runs.
+    """
+    percentile: float
+    trend: list[int] # Percentile of each run, oldest first
+    trend_slope: float # Least squares change of the percentile per run, relative to its mean
+    baseline: int # Percentile of the pooled previous runs
+    current: int # Percentile of the latest run
+    change: float # Relative change of the latest run from the baseline
+    regression: bool
+
+
+class EndpointComparison(TypedDict):
+    """
+    A TypedDict to represent the comparison of the response times of an endpoint between runs.
+    """
+    name: str
+    method: str
+    runs: int # Number of runs the endpoint was tested in
+    p_value: float | None # Mann-Whitney U test of the latest run against the baseline, None if no baseline
+    z_score: float | None
+    percentiles: list[PercentileComparison]
+    regression: bool
+
+
+def get_trend_slope(values: list[int]) -> float:
+    """Get the least squares slope of the values per run, relative to their mean"""
+    count = len(values)
+    mean = sum(values) / count if count else 0
+    if count < MIN_COMPARED_RUNS or not mean:
+        return 0.0
+
+    mean_index = (count - 1) / 2
+    covariance = sum((index - mean_index) * (value - mean) for index, value in enumerate(values))
+    variance = sum((index - mean_index) ** 2 for index in range(count))
+
+    return covariance / variance / mean
+
+
+def compare_runs(runs: list[RunResult], alpha: float, tolerance: float) -> list[EndpointComparison]:
+    """
+    Compare the response times of each endpoint of the latest run against the pooled previous runs.
+
+    Args:
+        runs (list[RunResult]): the runs to compare, oldest first
+        alpha (float): the significance level of the Mann-Whitney U test
+        tolerance (float): the relative increase of a percentile over the baseline tolerated before a regression
+
+    Returns:
+        list[EndpointComparison]: the comparison of each endpoint of the latest run
+    """
+    *previous_runs, current_run = runs
+    comparisons = []
+
+    previous_histograms = [get_request_histograms(run) for run in previous_runs]
+
+    for current in current_run["endpoints"]:
+        key = get_request_key(current["name"], current["method"])
+        history = [histograms[key] for histograms in previous_histograms if key in histograms]
+        baseline = merge_histograms(history)
+        test_result = mann_whitney_u(current["histogram"], baseline)
+        significantly_higher = test_result is not None and test_result["p_value"] < alpha and test_result["z_score"] > 0
+
+        percentiles = []
+        for percentile in COMPARED_PERCENTILES:
+            trend = [histogram_percentile(histogram, percentile) for histogram in [*history, current["histogram"]]]
+            baseline_value = histogram_percentile(baseline, percentile)
+            current_value = histogram_percentile(current["histogram"], percentile)
+            change = (current_value - baseline_value) / baseline_value if baseline_value else 0.0
+
+            percentiles.append(PercentileComparison(
+                percentile=percentile,
+                trend=trend,
+                trend_slope=get_trend_slope(trend),
+                baseline=baseline_value,
+                current=current_value,
+                change=change,
+                regression=significantly_higher and change > tolerance,
+            ))
+
+        comparisons.append(EndpointComparison(
+            name=current["name"],
+            method=current["method"],
+            runs=len(history) + 1,
+            p_value=test_result["p_value"] if test_result else None,
+            z_score=test_result["z_score"] if test_result else None,
+            percentiles=percentiles,
+            regression=any(comparison["regression"] for comparison in percentiles),
+        ))
+
+    return comparisons
+
+
+def load_runs(results_dir: str, runs_count: int, all_configs: bool) -> list[RunResult]:
+    """Load the last runs stored under the result directory, oldest first"""
+    runs = sorted(
+        read_result_archives(find_result_archives(results_dir)),
+        key=lambda run: run["metadata"]["created_at"],
+    )
+    if not runs:
+        return []
+
+    if not all_configs:
+        runs = [run for run in runs if is_comparable(run["metadata"], runs[-1]["metadata"])]
+
+    return runs[-runs_count:]
+
+
+def log_comparisons(comparisons: list[EndpointComparison]) -> None:
+    for comparison in comparisons:
+        p_value = f"{comparison['p_value']:.2g}" if comparison["p_value"] is not None else "n/a"
+        logger.info(f"Endpoint {comparison['name']} with method {comparison['method']} "
+                    f"over {comparison['runs']} runs (p-value {p_value}):")
+
+        for percentile in comparison["percentiles"]:
+            message = (f"  p{percentile['percentile'] * 100:g}: {percentile['current']} ms vs baseline "
+                       f"{percentile['baseline']} ms ({percentile['change']:+.1%}), "
+                       f"trend {percentile['trend_slope']:+.1%} per run {percentile['trend']}")
+            if percentile["regression"]:
+                logger.error(f"{message} REGRESSION")
+            else:
+                logger.info(message)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--results-dir", required=True, help="Directory the runs are stored under, e.g. /locust_tasks_result/sds")
+    parser.add_argument("--runs", type=int, default=10, help="Number of last runs to compare, including the latest run")
+    parser.add_argument("--alpha", type=float, default=0.01, help="Significance level of the Mann-Whitney U test")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Relative increase of a percentile tolerated over the baseline")
+    parser.add_argument("--all-configs", action="store_true", help="Compare the runs whatever their configuration")
+    parser.add_argument("--output", help="JSON file to write the comparison to")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    runs = load_runs(args.results_dir, args.runs, args.all_configs)
+    if len(runs) < MIN_COMPARED_RUNS:
+        logger.error(f"At least {MIN_COMPARED_RUNS} comparable runs are required, found {len(runs)} under {args.results_dir}.")
+        sys.exit(1)
+
+    latest = runs[-1]["metadata"]
+    logger.info(f"Comparing run of commit {latest['commit']} at {latest['created_at']} against {len(runs) - 1} previous runs")
+
+    comparisons = compare_runs(runs, args.alpha, args.tolerance)
+    log_comparisons(comparisons)
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps({"runs": [run["metadata"] for run in runs], "endpoints": comparisons}, indent=2))
+        logger.info(f"Comparison written to {output}")
+
+    sys.exit(1 if any(comparison["regression"] for comparison in comparisons) else 0)
@@ -4,9 +4,12 @@ from typing import NotRequired, TypedDict
 from performance_tests.result_evaluation.anomalies import (
     ANOMALIES,
     AVG_RESPONSE_TIME_EXCEEDED_ANOMALY,
+    BASELINE_REGRESSION_ANOMALY,
     FAIL_RATIO_EXCEEDED_ANOMALY,
+    LOAD_GENERATOR_SATURATED_ANOMALY,
     Anomaly,
 )
+from performance_tests.result_evaluation.statistics import histogram_percentile, mann_whitney_u
 
 
 class EvaluationResult(TypedDict):
@@ -23,10 +26,22 @@ class ResultEvaluator:
             logger: Logger,
             fail_ratio_thresholds: float,
             avg_response_time_thresholds: dict[str, int],
+            client_health_thresholds: dict[str, int] | None = None,
+            baseline_histograms: dict[tuple[str, str], dict[int, int]] | None = None,
+            baseline_tolerance: float = 0.1,
+            baseline_significance_level: float = 0.01,
+            baseline_percentiles: tuple[float, ...] = (0.5, 0.95, 0.99),
+            load_stage_threshold_factors: dict[str, float] | None = None,
     ):
         self.logger = logger
         self.fail_ratio_thresholds = fail_ratio_thresholds
         self.avg_response_time_thresholds = avg_response_time_thresholds
+        self.client_health_thresholds = client_health_thresholds or {}
+        self.baseline_histograms = baseline_histograms or {}
+        self.baseline_tolerance = baseline_tolerance
+        self.baseline_significance_level = baseline_significance_level
+        self.baseline_percentiles = baseline_percentiles
+        self.load_stage_threshold_factors = load_stage_threshold_factors or {}
 
     def evaluate_fail_ratio(self, fail_ratio: float) -> EvaluationResult:
         """
@@ -61,6 +76,81 @@ class ResultEvaluator:
 
         return EvaluationResult(result=True)
 
+    def evaluate_load_stage_avg_response_time(self, endpoint: str, stage_kind: str, avg_response_time: float) -> EvaluationResult:
+        """
+        Evaluate the average response time of the requests sent during a load stage against the threshold of the
+        endpoint, scaled by the factor of the stage kind.
+
+        Parameters:
+        endpoint (str): The endpoint to evaluate.
+        stage_kind (str): The kind of the load stage, e.g. spike.
+        avg_response_time (float): The average response time during the stage to evaluate.
+
+        Returns:
+        bool: True if the average response time is within the threshold, Anomaly otherwise.
+        """
+        if avg_response_time > self.get_load_stage_avg_response_time_threshold(endpoint, stage_kind):
+            return EvaluationResult(result=False, anomaly=ANOMALIES.get(AVG_RESPONSE_TIME_EXCEEDED_ANOMALY))
+
+        return EvaluationResult(result=True)
+
+    def evaluate_client_health(self, metric: str, value: float) -> EvaluationResult:
+        """
+        Evaluate a client health metric of a load generator process against the threshold.
+        Metrics without a threshold always pass.
+
+        Parameters:
+        metric (str): The client health metric to evaluate.
+        value (float): The value of the metric to evaluate.
+
+        Returns:
+        bool: True if the metric is within the threshold, Anomaly otherwise.
+        """
+        threshold = self.client_health_thresholds.get(metric)
+        if threshold is not None and value > threshold:
+            return EvaluationResult(result=False, anomaly=ANOMALIES.get(LOAD_GENERATOR_SATURATED_ANOMALY))
+
+        return EvaluationResult(result=True)
+
+    def evaluate_baseline(self, request_key: tuple[str, str], histogram: dict[int, int]) -> EvaluationResult:
+        """
+        Evaluate the response time distribution of a request against its distribution in the baseline run.
+        The request regressed if its response times are significantly higher than the baseline ones and any of the
+        compared percentiles exceeds the baseline percentile by more than the tolerance.
+        Requests without a baseline always pass.
+
+        Parameters:
+        request_key (tuple[str, str]): The (name, method) of the request, without the host.
+        histogram (dict[int, int]): The response time histogram of the request to evaluate.
+
+        Returns:
+        bool: True if the response times did not regress from the baseline, Anomaly otherwise.
+        """
+        baseline = self.get_baseline_histogram(request_key)
+        test_result = mann_whitney_u(histogram, baseline) if baseline else None
+
+        if test_result is None or test_result["p_value"] >= self.baseline_significance_level or test_result["z_score"] <= 0:
+            return EvaluationResult(result=True)
+
+        for percentile in self.baseline_percentiles:
+            baseline_value = histogram_percentile(baseline, percentile)
+            if histogram_percentile(histogram, percentile) > baseline_value * (1 + self.baseline_tolerance):
+                return EvaluationResult(result=False, anomaly=ANOMALIES.get(BASELINE_REGRESSION_ANOMALY))
+
+        return EvaluationResult(result=True)
+
+    def get_baseline_histogram(self, request_key: tuple[str, str]) -> dict[int, int] | None:
+        """
+        Get the response time histogram of a request in the baseline run.
+
+        Parameters:
+        request_key (tuple[str, str]): The (name, method) of the request, without the host.
+
+        Returns:
+        dict[int, int]: The baseline histogram of the request, None if the request is not in the baseline run.
+        """
+        return self.baseline_histograms.get(request_key)
+
     def get_avg_response_time_threshold(self, endpoint: str) -> int:
         """
         Get the average response time threshold for a specific endpoint.
@@ -74,6 +164,21 @@ class ResultEvaluator:
         """
         return self.avg_response_time_thresholds.get(endpoint, self.avg_response_time_thresholds.get("default"))
 
+    def get_load_stage_avg_response_time_threshold(self, endpoint: str, stage_kind: str) -> float:
+        """
+        Get the average response time threshold for a specific endpoint during a kind of load stage.
+        If the stage kind is not found in the factors, it will apply the default factor.
+
+        Parameters:
+        endpoint (str): The endpoint to get the threshold for.
+        stage_kind (str): The kind of the load stage, e.g. spike.
+
+        Returns:
+        float: The average response time threshold for the endpoint during the stage.
+        """
+        factor = self.load_stage_threshold_factors.get(stage_kind, self.load_stage_threshold_factors.get("default", 1.0))
+        return self.get_avg_response_time_threshold(endpoint) * factor
+
     def get_fail_ratio_threshold(self) -> float:
         """
         Get the fail ratio threshold.
@@ -0,0 +1,315 @@
+import datetime
+import json
+import logging
+import math
+import os
+import struct
+import subprocess
+from array import array
+from pathlib import Path
+from typing import Final, TypedDict
+from urllib.parse import urlsplit
+
+from locust.env import Environment
+from locust.stats import StatsEntry
+
+from performance_tests.configs.config import config
+
+logger = logging.getLogger(__name__)
+
+# Columns of the tables of the result archive, as (name, array typecode), in the order they are written
+STATS_COLUMNS: Final[list[tuple[str, str]]] = [
+    ("num_requests", "Q"),
+    ("num_failures", "Q"),
+    ("total_response_time", "d"), # Milliseconds
+    ("min_response_time", "d"), # Milliseconds, NaN if no request completed
+    ("max_response_time", "d"), # Milliseconds
+    ("total_content_length", "Q"), # Bytes
+    ("start_time", "d"), # Seconds since epoch
+    ("last_request_timestamp", "d"), # Seconds since epoch, NaN if no request completed
+]
+HISTOGRAM_COLUMNS: Final[list[tuple[str, str]]] = [
+    ("endpoint", "I"), # Index of the row of the endpoint in the stats table
+    ("response_time", "Q"), # Response time in milliseconds, rounded the way Locust buckets it
+    ("count", "Q"),
+]
+
+RESULT_ARCHIVE_MAGIC: Final[bytes] = b"LRES"
+RESULT_ARCHIVE_VERSION: Final[int] = 1
+RESULT_ARCHIVE_HEADER: Final[struct.Struct] = struct.Struct("<4sHI") # Magic, version, length of the JSON header
+
+RESULT_ARCHIVE_SUFFIX: Final[str] = "_archive.bin"
+
+# Metadata the runs must share to be compared
+COMPARABLE_METADATA: Final[tuple[str, ...]] = (
+    "app", "host", "endpoints", "journeys", "traffic_profile", "load_model", "load_shape", "load_shape_file",
+    "cache_mode", "users", "dataset_entries",
+)
+
+
+class RunMetadata(TypedDict):
+    """
+    A TypedDict to represent the configuration a run was executed with, to tell which runs are comparable.
+    """
+    app: str
+    commit: str
+    created_at: str
+    host: str
+    users: int | None
+    run_time: int | None
+    endpoints: str
+    journeys: str
+    traffic_profile: str
+    load_model: str
+    load_shape: str
+    load_shape_file: str # Parameters or stages of the load shape, empty for the default parameters
+    cache_mode: str
+    dataset_entries: int | None # SDS only
+
+
+class EndpointResult(TypedDict):
+    """
+    A TypedDict to represent the stats and the response time histogram of an endpoint in a run.
+    """
+    name: str
+    method: str
+    num_requests: int
+    num_failures: int
+    total_response_time: float
+    min_response_time: float
+    max_response_time: float
+    total_content_length: int
+    start_time: float
+    last_request_timestamp: float
+    histogram: dict[int, int]
+
+
+class RunResult(TypedDict):
+    """
+    A TypedDict to represent a run loaded from its result archive.
+    """
+    metadata: RunMetadata
+    endpoints: list[EndpointResult]
+
+
+def is_comparable(metadata: RunMetadata, reference: RunMetadata) -> bool:
+    """Check if a run was executed with the same configuration as the reference run"""
+    return all(metadata.get(key) == reference.get(key) for key in COMPARABLE_METADATA)
+
+
+def get_commit() -> str:
+    """Get the commit of the harness, from the COMMIT_SHA environment variable or the git checkout"""
+    if config.COMMIT_SHA != "unknown":
+        return config.COMMIT_SHA
+
+    try:
+        completed = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True)
+    except OSError:
+        return "unknown"
+
+    return completed.stdout.strip() or "unknown"
+
+
+def get_run_metadata(environment: Environment) -> RunMetadata:
+    """Get the metadata of the current run from its parsed options"""
+    options = environment.parsed_options
+
+    return RunMetadata(
+        app=config.APP,
+        commit=get_commit(),
+        created_at=datetime.datetime.now(datetime.UTC).isoformat(),
+        host=environment.host or config.BASE_URL,
+        users=getattr(options, "num_users", None),
+        run_time=getattr(options, "run_time", None),
+        endpoints=getattr(options, "test_endpoints", ""),
+        journeys=getattr(options, "test_journeys", ""),
+        traffic_profile=getattr(options, "traffic_profile", ""),
+        load_model=getattr(options, "load_model", ""),
+        load_shape=getattr(options, "load_shape", ""),
+        load_shape_file=getattr(options, "load_shape_file", ""),
+        cache_mode=getattr(options, "cache_mode", ""),
+        dataset_entries=getattr(options, "dataset_entries", None),
+    )
+
+
+def write_result_archive(file_path: str, metadata: RunMetadata, entries: list[StatsEntry]) -> str:
+    """
+    Write the stats and response time histograms of the entries of a run to a columnar result archive.
+
+    The archive is a file header, a JSON header with the metadata, the endpoint names and the row count of each table,
+    then each column of the stats table and of the histogram table in native little endian layout.
+
+    Args:
+        file_path (str): the path of the archive
+        metadata (RunMetadata): the metadata of the run
+        entries (list[StatsEntry]): the stats entries of the endpoints
+
+    Returns:
+        str: the path of the archive
+    """
+    stats_columns = {name: array(typecode) for name, typecode in STATS_COLUMNS}
+    histogram_columns = {name: array(typecode) for name, typecode in HISTOGRAM_COLUMNS}
+
+    for index, entry in enumerate(entries):
+        stats_columns["num_requests"].append(entry.num_requests)
+        stats_columns["num_failures"].append(entry.num_failures)
+        stats_columns["total_response_time"].append(entry.total_response_time)
+        stats_columns["min_response_time"].append(math.nan if entry.min_response_time is None else entry.min_response_time)
+        stats_columns["max_response_time"].append(entry.max_response_time)
+        stats_columns["total_content_length"].append(entry.total_content_length)
+        stats_columns["start_time"].append(entry.start_time)
+        stats_columns["last_request_timestamp"].append(entry.last_request_timestamp or math.nan)
+
+        # Locust rounds the response times above 100 ms with round(), which keeps them as floats
+        for response_time, count in sorted(entry.response_times.items()):
+            histogram_columns["endpoint"].append(index)
+            histogram_columns["response_time"].append(int(response_time))
+            histogram_columns["count"].append(count)
+
+    header = json.dumps({
+        "metadata": metadata,
+        "endpoints": [[entry.name, entry.method] for entry in entries],
+        "rows": {"stats": len(entries), "histograms": len(histogram_columns["endpoint"])},
+        "columns": {"stats": dict(STATS_COLUMNS), "histograms": dict(HISTOGRAM_COLUMNS)},
+    }).encode()
+
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+    with open(file_path, "wb") as archive_file:
+        archive_file.write(RESULT_ARCHIVE_HEADER.pack(RESULT_ARCHIVE_MAGIC, RESULT_ARCHIVE_VERSION, len(header)))
+        archive_file.write(header)
+        for columns in (stats_columns, histogram_columns):
+            for column in columns.values():
+                archive_file.write(column.tobytes())
+
+    return file_path
+
+
+def read_result_archive(file_path: str) -> RunResult:
+    """
+    Read a columnar result archive.
+
+    Args:
+        file_path (str): the path of the archive
+
+    Returns:
+        RunResult: the metadata of the run and the stats and histogram of each endpoint
+
+    Raises:
+        ValueError: if the file is not a result archive or is truncated
+    """
+    data = Path(file_path).read_bytes()
+    if len(data) < RESULT_ARCHIVE_HEADER.size:
+        raise ValueError(f"{file_path} is not a version {RESULT_ARCHIVE_VERSION} result archive")
+
+    magic, version, header_length = RESULT_ARCHIVE_HEADER.unpack_from(data, 0)
+    if magic != RESULT_ARCHIVE_MAGIC or version != RESULT_ARCHIVE_VERSION:
+        raise ValueError(f"{file_path} is not a version {RESULT_ARCHIVE_VERSION} result archive")
+
+    offset = RESULT_ARCHIVE_HEADER.size
+    if offset + header_length > len(data):
+        raise ValueError(f"{file_path} is truncated")
+
+    header = json.loads(data[offset:offset + header_length])
+    offset += header_length
+
+    tables: dict[str, dict[str, array]] = {}
+    for table in ("stats", "histograms"):
+        rows = header["rows"][table]
+        tables[table] = {}
+        for name, typecode in header["columns"][table].items():
+            column = array(typecode)
+            size = rows * column.itemsize
+            if offset + size > len(data):
+                raise ValueError(f"{file_path} is truncated")
+
+            column.frombytes(data[offset:offset + size])
+            tables[table][name] = column
+            offset += size
+
+    stats = tables["stats"]
+    endpoints = [
+        EndpointResult(
+            name=name,
+            method=method,
+            **{column: stats[column][index] for column, _ in STATS_COLUMNS},
+            histogram={},
+        )
+        for index, (name, method) in enumerate(header["endpoints"])
+    ]
+
+    histograms = tables["histograms"]
+    for index, response_time, count in zip(
+        histograms["endpoint"], histograms["response_time"], histograms["count"], strict=True
+    ):
+        endpoints[index]["histogram"][response_time] = count
+
+    return RunResult(metadata=header["metadata"], endpoints=endpoints)
+
+
+def get_request_key(name: str, method: str) -> tuple[str, str]:
+    """Get the key of a request stats entry across runs, without the host the requests were sent to"""
+    parts = urlsplit(name)
+    if parts.scheme and parts.netloc:
+        name = name[len(f"{parts.scheme}://{parts.netloc}"):]
+
+    return name, method
+
+
+def get_request_histograms(run: RunResult) -> dict[tuple[str, str], dict[int, int]]:
+    """Get the response time histogram of each request of a run, keyed by request key"""
+    return {
+        get_request_key(endpoint["name"], endpoint["method"]): endpoint["histogram"]
+        for endpoint in run["endpoints"]
+        if endpoint["histogram"]
+    }
+
+
+def load_baseline_result(path: str, reference: RunMetadata | None = None, exclude: str | None = None) -> RunResult:
+    """
+    Load the run to use as a baseline, from its result archive or from the latest comparable archive under a directory.
+
+    Args:
+        path (str): the path of a result archive, or of a directory the runs are stored under
+        reference (RunMetadata | None): the metadata of the evaluated run, the runs under a directory executed with
+            another configuration being skipped
+        exclude (str | None): the result archive of the evaluated run, skipped under a directory so that the run is
+            not its own baseline
+
+    Returns:
+        RunResult: the baseline run
+    """
+    if not os.path.isdir(path):
+        return read_result_archive(path)
+
+    excluded = Path(exclude).resolve() if exclude else None
+    runs = read_result_archives(
+        [file_path for file_path in find_result_archives(path) if Path(file_path).resolve() != excluded]
+    )
+    if reference is not None:
+        runs = [run for run in runs if is_comparable(run["metadata"], reference)]
+    if not runs:
+        raise FileNotFoundError(f"No comparable result archive found under {path}")
+
+    return max(runs, key=lambda run: run["metadata"]["created_at"])
+
+
+def find_result_archives(results_dir: str) -> list[str]:
+    """Find the result archives of the runs stored under a directory, e.g. /locust_tasks_result/<APP>"""
+    return sorted(str(path) for path in Path(results_dir).rglob(f"*{RESULT_ARCHIVE_SUFFIX}"))
+
+
+def read_result_archives(file_paths: list[str]) -> list[RunResult]:
+    """Read the result archives of runs, skipping with a warning the archives which cannot be read, e.g. truncated"""
+    runs = []
+    for file_path in file_paths:
+        try:
+            runs.append(read_result_archive(file_path))
+        except ValueError as error:
+            logger.warning(f"Skipping result archive: {error}")
+
+    return runs
+
+
+def get_result_archive_path(csv_prefix: str) -> str:
+    """Get the result archive of a run, next to its CSV result files"""
+    return f"{csv_prefix}{RESULT_ARCHIVE_SUFFIX}"
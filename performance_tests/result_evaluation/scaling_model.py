@@ -0,0 +1,86 @@
+import math
+from typing import Final, TypedDict
+
+# Exponents of the fitted power law below which the response times are reported as constant or sublinear in the
+# dataset size, and above which they are reported as superlinear
+CONSTANT_SCALING_EXPONENT: Final[float] = 0.1
+LINEAR_SCALING_EXPONENT: Final[tuple[float, float]] = (0.9, 1.1)
+
+# Minimum number of dataset sizes to fit a scaling model to, two sizes fitting any power law exactly
+MIN_SCALING_POINTS: Final[int] = 3
+
+# Change in milliseconds of the response times across the dataset sizes below which they are reported as constant,
+# whatever the exponent, as the change is within the run to run noise
+MIN_SCALING_CHANGE_MS: Final[float] = 5.0
+
+
+class ScalingFit(TypedDict):
+    """
+    A TypedDict to represent a power law fitted to the response times of a request across dataset sizes,
+    response_time = coefficient * size ^ exponent.
+    """
+    exponent: float # 0 if the response times do not depend on the size, 1 if they grow linearly with it
+    coefficient: float # Response time in milliseconds of a dataset of a single entry
+    r_squared: float # Share of the variance of the log response times explained by the fit
+    scaling: str # Complexity the exponent is classified as
+
+
+def classify_scaling(exponent: float, change: float) -> str:
+    """
+    Classify the exponent of a power law fit as the complexity of the response times in the dataset size, constant if
+    the response times change by less than the minimum change across the sizes.
+    """
+    if exponent < CONSTANT_SCALING_EXPONENT or change < MIN_SCALING_CHANGE_MS:
+        return "O(1)"
+
+    if exponent < LINEAR_SCALING_EXPONENT[0]:
+        return "sublinear"
+
+    if exponent <= LINEAR_SCALING_EXPONENT[1]:
+        return "linear"
+
+    return "superlinear"
+
+
+def fit_power_law(sizes: list[int], response_times: list[float]) -> ScalingFit | None:
+    """
+    Fit a power law to the response times of a request across dataset sizes, by least squares on their logarithms.
+    Response times below 1 ms are taken as 1 ms, the resolution of the Locust stats.
+
+    Args:
+        sizes (list[int]): the dataset sizes
+        response_times (list[float]): the unrounded response time in milliseconds at each size
+
+    Returns:
+        ScalingFit | None: the fit, None if there are fewer than the minimum number of distinct sizes
+    """
+    if len(set(sizes)) < MIN_SCALING_POINTS:
+        return None
+
+    log_sizes = [math.log(size) for size in sizes]
+    log_response_times = [math.log(max(response_time, 1.0)) for response_time in response_times]
+
+    count = len(log_sizes)
+    mean_size = sum(log_sizes) / count
+    mean_response_time = sum(log_response_times) / count
+
+    covariance = sum(
+        (log_size - mean_size) * (log_response_time - mean_response_time)
+        for log_size, log_response_time in zip(log_sizes, log_response_times, strict=True)
+    )
+    variance = sum((log_size - mean_size) ** 2 for log_size in log_sizes)
+    exponent = covariance / variance
+    intercept = mean_response_time - exponent * mean_size
+
+    residuals = sum(
+        (log_response_time - intercept - exponent * log_size) ** 2
+        for log_size, log_response_time in zip(log_sizes, log_response_times, strict=True)
+    )
+    total = sum((log_response_time - mean_response_time) ** 2 for log_response_time in log_response_times)
+
+    return ScalingFit(
+        exponent=exponent,
+        coefficient=math.exp(intercept),
+        r_squared=1 - residuals / total if total else 1.0,
+        scaling=classify_scaling(exponent, max(response_times) - min(response_times)),
+    )
@@ -0,0 +1,99 @@
+import math
+from typing import TypedDict
+
+
+class MannWhitneyResult(TypedDict):
+    """
+    A TypedDict to represent the result of a Mann-Whitney U test between two response time histograms.
+    """
+    u_statistic: float
+    z_score: float # Positive if the current response times tend to be higher than the baseline ones
+    p_value: float # Two-sided p-value
+    effect_size: float # Probability that a current response time is higher than a baseline one, 0.5 if no difference
+
+
+def histogram_count(histogram: dict[int, int]) -> int:
+    """Get the number of response times in a histogram"""
+    return sum(histogram.values())
+
+
+def histogram_percentile(histogram: dict[int, int], percentile: float) -> int:
+    """
+    Get a percentile of the response times of a histogram, the same way Locust computes it from its stats entries.
+
+    Args:
+        histogram (dict[int, int]): the count of each rounded response time
+        percentile (float): the percentile between 0 and 1
+
+    Returns:
+        int: the response time at the percentile, 0 if the histogram is empty
+    """
+    count = histogram_count(histogram)
+    if not count:
+        return 0
+
+    processed_count = 0
+    for response_time in sorted(histogram, reverse=True):
+        processed_count += histogram[response_time]
+        if count - processed_count <= int(count * percentile):
+            return response_time
+
+    return 0
+
+
+def merge_histograms(histograms: list[dict[int, int]]) -> dict[int, int]:
+    """Merge the histograms of several runs into a single histogram"""
+    merged: dict[int, int] = {}
+    for histogram in histograms:
+        for response_time, count in histogram.items():
+            merged[response_time] = merged.get(response_time, 0) + count
+
+    return merged
+
+
+def mann_whitney_u(current: dict[int, int], baseline: dict[int, int]) -> MannWhitneyResult | None:
+    """
+    Compare two response time histograms with a Mann-Whitney U test, using the normal approximation with tie
+    correction. The histograms are binned response times, so the ranks are computed per bin without expanding them.
+
+    Args:
+        current (dict[int, int]): the histogram of the run under test
+        baseline (dict[int, int]): the histogram of the baseline run(s)
+
+    Returns:
+        MannWhitneyResult | None: the test result, None if either histogram is empty
+    """
+    n1 = histogram_count(current)
+    n2 = histogram_count(baseline)
+    if not n1 or not n2:
+        return None
+
+    # Rank sum of the current response times, giving each tied bin the average of its ranks
+    rank_sum = 0.0
+    tie_correction = 0.0
+    rank_start = 1
+    for response_time in sorted(current.keys() | baseline.keys()):
+        current_count = current.get(response_time, 0)
+        tied_count = current_count + baseline.get(response_time, 0)
+        rank_sum += current_count * (rank_start + (tied_count - 1) / 2)
+        tie_correction += tied_count ** 3 - tied_count
+        rank_start += tied_count
+
+    u_statistic = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    mean = n1 * n2 / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_correction / (n * (n - 1))) if n > 1 else 0.0
+
+    if variance <= 0:
+        # All the response times are identical
+        return MannWhitneyResult(u_statistic=u_statistic, z_score=0.0, p_value=1.0, effect_size=0.5)
+
+    z_score = (u_statistic - mean) / math.sqrt(variance)
+    p_value = math.erfc(abs(z_score) / math.sqrt(2))
+
+    return MannWhitneyResult(
+        u_statistic=u_statistic,
+        z_score=z_score,
+        p_value=p_value,
+        effect_size=u_statistic / (n1 * n2),
+    )
@@ -10,6 +10,8 @@ from performance_tests.configs.endpoints_config import (
     POST_CI,
     PUT_VALIDATOR_VERSION,
 )
+from performance_tests.configs.journeys_config import CI_SCHEMA_JOURNEY, SCHEMA_JOURNEY, UNIT_DATA_JOURNEY
+from performance_tests.metrics.client_health import CPU_PERCENT_METRIC, LOOP_LAG_METRIC
 
 # Maximum average response time thresholds for each endpoint in milliseconds.
 # If an endpoint is not listed, the default threshold will be applied.
@@ -24,7 +26,32 @@ THRESHOLDS_AVG_RESPONSE_TIME: dict[str, int] = {
     GET_CI_METADATA: 500,
     GET_CI_SCHEMA: 500,
     PUT_VALIDATOR_VERSION: 500,
+    UNIT_DATA_JOURNEY: 300,
+    SCHEMA_JOURNEY: 1000,
+    CI_SCHEMA_JOURNEY: 1000,
     "default": 500,
 }
 
 THRESHOLDS_FAIL_RATIO: float = 0.01 # 1% fail ratio threshold for all endpoints
+
+# Maximum 95th percentile of the client health metrics of each load generator process.
+# A process above any of them is saturated, and the response times it measured include its own queueing.
+THRESHOLDS_CLIENT_HEALTH: dict[str, int] = {
+    CPU_PERCENT_METRIC: 90,
+    LOOP_LAG_METRIC: 100,
+}
+
+# Baseline mode: maximum relative increase of the response time percentiles of each endpoint over the baseline run.
+# An endpoint regressed if any of the percentiles exceeds the tolerance and its response times are significantly higher
+# than the baseline ones (Mann-Whitney U test at the significance level).
+THRESHOLDS_BASELINE_TOLERANCE: float = 0.1 # 10% increase over the baseline
+THRESHOLDS_BASELINE_SIGNIFICANCE_LEVEL: float = 0.01
+THRESHOLDS_BASELINE_PERCENTILES: tuple[float, ...] = (0.5, 0.95, 0.99)
+
+# Factor applied to the average response time thresholds of the requests sent during each kind of load stage, when a load
+# shape is selected. The requests of the stages without a factor are evaluated against the default factor.
+THRESHOLDS_LOAD_STAGE_FACTOR: dict[str, float] = {
+    "spike": 2.0, # Users are started all at once, the service is expected to scale out
+    "burst": 2.0,
+    "default": 1.0,
+}
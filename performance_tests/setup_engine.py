@@ -0,0 +1,85 @@
+import logging
+from collections.abc import Callable, Iterable
+from typing import Any, Final
+
+import gevent
+from gevent import Greenlet
+from gevent.lock import BoundedSemaphore
+from gevent.pool import Pool
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of setup and teardown calls in flight at once when the setup concurrency option is not set
+DEFAULT_SETUP_CONCURRENCY: Final[int] = 10
+
+
+class SetupEngine:
+    """
+    Run the independent calls of the setup and teardown of the test (publishing, verification, cleanup) concurrently,
+    with at most `concurrency` calls in flight at once across all the pre/post-processors of the process.
+
+    The calls run in greenlets, so that the HTTP calls, which are cooperative once Locust has patched the standard
+    library, wait on the network side by side. The calls of the clients that block the gevent loop, e.g. the gRPC
+    calls of the Firestore client, run in the gevent thread pool instead, so that the master keeps answering the
+    heartbeats of the workers meanwhile.
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_SETUP_CONCURRENCY):
+        self.set_concurrency(concurrency)
+
+    def set_concurrency(self, concurrency: int) -> None:
+        """Set the maximum number of calls in flight at once, for the calls spawned from now on"""
+        if concurrency < 1:
+            raise ValueError(f"Invalid setup concurrency: {concurrency}. Must be at least 1")
+
+        self.concurrency = concurrency
+        self.semaphore = BoundedSemaphore(concurrency)
+
+    def _run_limited(self, func: Callable, *args, **kwargs) -> Any:
+        with self.semaphore:
+            return func(*args, **kwargs)
+
+    def _run_limited_in_thread(self, func: Callable, *args, **kwargs) -> Any:
+        with self.semaphore:
+            return gevent.get_hub().threadpool.apply(func, args, kwargs)
+
+    def spawn(self, func: Callable, *args, **kwargs) -> Greenlet:
+        """Start a call in a greenlet within the concurrency limit. Its result is returned by the `get` of the greenlet."""
+        return gevent.spawn(self._run_limited, func, *args, **kwargs)
+
+    def spawn_blocking(self, func: Callable, *args, **kwargs) -> Greenlet:
+        """Start a call blocking the gevent loop in the thread pool within the concurrency limit"""
+        return gevent.spawn(self._run_limited_in_thread, func, *args, **kwargs)
+
+    def map(self, func: Callable, items: Iterable, concurrency: int | None = None) -> list:
+        """
+        Call a function over the items concurrently, within the concurrency limit of the engine and, if set, of the
+        given concurrency for this batch of calls.
+
+        Returns:
+            list: the results of the function, in the order of the items
+        """
+        if concurrency is None:
+            return gather([self.spawn(func, item) for item in items])
+
+        return list(Pool(concurrency).imap(lambda item: self._run_limited(func, item), items))
+
+
+def gather(greenlets: list[Greenlet]) -> list:
+    """Wait for the greenlets of spawned calls, and return their results in order. The first error is raised."""
+    gevent.joinall(greenlets, raise_error=True)
+
+    return [greenlet.get() for greenlet in greenlets]
+
+
+def run_concurrently(funcs: list[Callable[[], Any]]) -> list:
+    """
+    Run the steps of the setup or teardown that do not depend on each other concurrently, e.g. the pre-processors,
+    and return their results in order. The steps are not counted in the concurrency limit, only the calls they
+    spawn are, so that a step waiting for its calls never holds a slot.
+    """
+    return gather([gevent.spawn(func) for func in funcs])
+
+
+# Engine of the setup and teardown calls of this process
+setup_engine = SetupEngine()
@@ -0,0 +1,125 @@
+import itertools
+import math
+from typing import Final
+
+from locust.env import Environment
+from locust.runners import WorkerRunner
+
+from performance_tests.cache_key_pool import CacheKeyPool
+from performance_tests.total_users import get_total_users
+
+# Share of the keys of the other shards each shard also takes when the shard overlap option is not set
+DEFAULT_SHARD_OVERLAP: Final[float] = 0.0
+
+
+def get_shard(keys: list[str], shard: int, shards: int, overlap: float = DEFAULT_SHARD_OVERLAP) -> list[str]:
+    """
+    Get the keys of a shard. The keys are split into contiguous disjoint slices, one per shard, and each slice is
+    widened over the next slices by the overlap share of the keys of the other shards.
+
+    Args:
+        keys (list[str]): the keys to shard, in the same order for every shard
+        shard (int): the index of the shard, wrapped around the number of shards
+        shards (int): the number of shards
+        overlap (float): the share of the keys of the other shards the shard also takes, from 0 for disjoint shards
+            to 1 for every shard taking all the keys
+
+    Returns:
+        list[str]: the keys of the shard, at least one if there are any keys
+    """
+    if not 0 <= overlap <= 1:
+        raise ValueError(f"Invalid shard overlap: {overlap}. Must be between 0 and 1")
+
+    if shards <= 1 or not keys:
+        return list(keys)
+
+    shard %= shards
+    start = len(keys) * shard // shards
+    shard_size = len(keys) * (shard + 1) // shards - start
+    # More shards than keys leaves some slices empty, these shards then share the key of the slice they start at
+    size = max(shard_size + round(overlap * (len(keys) - shard_size)), 1)
+
+    return [keys[(start + offset) % len(keys)] for offset in range(size)]
+
+
+def get_worker_shard(environment: Environment) -> tuple[int, int]:
+    """
+    Get the shard of the test data of this process and the number of shards, one per expected worker. The workers get
+    the expected number of workers from the master, which is the number of processes.
+    """
+    if isinstance(environment.runner, WorkerRunner):
+        return environment.runner.worker_index, environment.parsed_options.expect_workers or 1
+
+    return 0, 1
+
+
+def get_worker_partition(keys: list[str], environment: Environment, overlap: float = DEFAULT_SHARD_OVERLAP) -> list[str]:
+    """
+    Get the keys of the shard of this process, one shard per expected worker. The keys are sorted first, so that every
+    process slices the same order whatever order it retrieved them in.
+    """
+    shard, shards = get_worker_shard(environment)
+
+    return get_shard(sorted(keys), shard, shards, overlap)
+
+
+def get_worker_keys(keys: list[str], environment: Environment) -> list[str]:
+    """Get the keys of the shard of this process if the test data is sharded, all the keys otherwise"""
+    options = environment.parsed_options
+    if not options.shard_test_data:
+        return keys
+
+    return get_worker_partition(keys, environment, options.shard_overlap)
+
+
+class ShardedTestData:
+    """
+    Hand out to each user of the process its own shard of the test data keys of the process, e.g. the identifiers of
+    the dataset, so that the requests of the users are spread across the stored documents instead of piling onto the
+    same few ones.
+
+    The keys of the process are split between the users by user index, the users of the process being numbered in
+    the order they start, and each user walks its keys in a shuffled cycle.
+    """
+
+    def __init__(self, keys: dict[str, list[str]], users: int, overlap: float = DEFAULT_SHARD_OVERLAP):
+        self.keys = keys
+        self.users = max(users, 1)
+        self.overlap = overlap
+        self._user_indices = itertools.count()
+
+    def next_user_key_pools(self) -> dict[str, CacheKeyPool]:
+        """Get the key pools of the shard of the next user, by parameter the keys are sent as"""
+        user_index = next(self._user_indices)
+
+        return {
+            param: CacheKeyPool(get_shard(keys, user_index, self.users, self.overlap), seed=user_index)
+            for param, keys in self.keys.items()
+            if keys
+        }
+
+
+def create_test_data_shard(keys: dict[str, list[str]], environment: Environment) -> ShardedTestData | None:
+    """
+    Create the shard of the test data of this process from all the test data keys, None if the test data is not
+    sharded. The users of the process are the total users of the test split evenly across the expected workers.
+
+    Args:
+        keys (dict[str, list[str]]): all the keys of the test data, by parameter they are sent as
+        environment (Environment): the Locust environment, with the sharding options and the worker index
+
+    Returns:
+        ShardedTestData | None: the shard of the test data of this process
+    """
+    options = environment.parsed_options
+    if not options.shard_test_data:
+        return None
+
+    _, shards = get_worker_shard(environment)
+    users = math.ceil(get_total_users(environment) / shards)
+
+    return ShardedTestData(
+        {param: get_worker_keys(param_keys, environment) for param, param_keys in keys.items()},
+        users,
+        options.shard_overlap,
+    )
@@ -0,0 +1,41 @@
+from typing import Final
+
+from locust.env import Environment
+from locust.event import Events
+from locust.runners import WorkerRunner
+
+# Option carrying the total number of users of the test from the master to the workers. Locust only sends the custom
+# options to the workers with the users to start, not the users option, which the workers keep at its startup value.
+TOTAL_USERS_OPTION: Final[str] = "total_users"
+
+
+def set_total_users(environment: Environment, users: int) -> None:
+    """Set the total number of users of the test, sent by the master to the workers with the users to start"""
+    setattr(environment.parsed_options, TOTAL_USERS_OPTION, users)
+
+
+def get_total_users(environment: Environment) -> int:
+    """
+    Get the total number of users of the test across all the processes, as sent by the master, or the users option,
+    or the users of the process if neither is set.
+    """
+    options = environment.parsed_options
+
+    return getattr(options, TOTAL_USERS_OPTION, None) or options.num_users or environment.runner.target_user_count or 1
+
+
+def register_total_users(events: Events) -> None:
+    """
+    Set the total number of users on the master (or local) node as the test starts, before the users to start are
+    sent to the workers.
+
+    Args:
+        events (Events): the Locust events to register the listeners to
+    """
+
+    @events.test_start.add_listener
+    def _(environment: Environment, **kwargs):
+        if isinstance(environment.runner, WorkerRunner):
+            return
+
+        set_total_users(environment, environment.parsed_options.num_users or environment.runner.target_user_count)
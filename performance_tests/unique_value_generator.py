@@ -0,0 +1,103 @@
+import logging
+import time
+import zlib
+from collections import deque
+from typing import Final
+
+from locust.env import Environment
+from locust.event import Events
+from locust.runners import WorkerRunner
+
+logger = logging.getLogger(__name__)
+
+# Number of unique values rendered at once, so that the requests only take the next one
+UNIQUE_VALUE_BATCH_SIZE: Final[int] = 1000
+
+
+def generate_run_id() -> str:
+    """Generate the id of a run, the seconds since epoch it started at"""
+    return str(int(time.time()))
+
+
+def get_run_number(run_id: str) -> int:
+    """Get the run id as a number, to be rendered as a version component. A non-numeric run id is hashed."""
+    return int(run_id) if run_id.isdigit() else zlib.crc32(run_id.encode())
+
+
+class UniqueValueGenerator:
+    """
+    Generate values unique across all the processes and runs of the test, for the writes to always create new records.
+
+    The values are taken from a monotonic counter of the process, namespaced by the run id and the index of the worker
+    (e.g. guid_1735689600_3_42 and 1735689600.3.42), so that no two processes or runs generate the same value. The
+    values are rendered in batches, so that sending a request takes the next value without random or uuid work.
+    """
+
+    def __init__(self, batch_size: int = UNIQUE_VALUE_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.run_id = generate_run_id()
+        self.worker_index = 0
+        self._next_count = 0
+        self._suffixes: deque[str] = deque()
+        self._versions: deque[str] = deque()
+
+    def set_namespace(self, run_id: str, worker_index: int) -> None:
+        """
+        Set the run id and the worker index the values are namespaced by, dropping the values rendered in the previous
+        namespace. The counter is not restarted, so that setting a namespace again does not generate its values again.
+        """
+        if (run_id, worker_index) == (self.run_id, self.worker_index):
+            return
+
+        self.run_id = run_id
+        self.worker_index = worker_index
+        self._suffixes.clear()
+        self._versions.clear()
+
+    def _next_batch(self) -> range:
+        """Take the next batch of counts from the counter"""
+        counts = range(self._next_count, self._next_count + self.batch_size)
+        self._next_count = counts.stop
+
+        return counts
+
+    def next_value(self, value: str) -> str:
+        """Get the given value suffixed with the next unique suffix, e.g. guid_1735689600_3_42"""
+        if not self._suffixes:
+            self._suffixes.extend(f"{self.run_id}_{self.worker_index}_{count}" for count in self._next_batch())
+
+        return f"{value}_{self._suffixes.popleft()}"
+
+    def next_version(self) -> str:
+        """Get the next unique version in the x.x.x format: run number, worker index and count, e.g. 1735689600.3.42"""
+        if not self._versions:
+            run_number = get_run_number(self.run_id)
+            self._versions.extend(f"{run_number}.{self.worker_index}.{count}" for count in self._next_batch())
+
+        return self._versions.popleft()
+
+
+# Unique values of the writes sent by this process
+unique_value_generator = UniqueValueGenerator()
+
+
+def register_unique_value_generator(events: Events) -> None:
+    """
+    Namespace the unique values of every process by the run id and its worker index. The run id is set on the master
+    (or local) node if not given, and sent to the workers with the users to start.
+
+    Args:
+        events (Events): the Locust events to register the listeners to
+    """
+
+    @events.init.add_listener
+    def _(environment: Environment, **kwargs):
+        options = environment.parsed_options
+        if options is not None and not options.run_id and not isinstance(environment.runner, WorkerRunner):
+            options.run_id = generate_run_id()
+            logger.info(f"Run id {options.run_id} namespacing the unique values of the writes")
+
+    @events.test_start.add_listener
+    def _(environment: Environment, **kwargs):
+        worker_index = environment.runner.worker_index if isinstance(environment.runner, WorkerRunner) else 0
+        unique_value_generator.set_namespace(environment.parsed_options.run_id, worker_index)
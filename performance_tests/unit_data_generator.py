@@ -0,0 +1,145 @@
+import base64
+import json
+import math
+import random
+import zlib
+from argparse import Namespace
+from typing import Final
+
+from performance_tests.configs.config import config
+
+FILE_UNIT_DATA_SIZE: Final[str] = "file"
+FIXED_UNIT_DATA_SIZE: Final[str] = "fixed"
+LOGNORMAL_UNIT_DATA_SIZE: Final[str] = "lognormal"
+SAMPLED_UNIT_DATA_SIZE: Final[str] = "sampled"
+UNIT_DATA_SIZE_CHOICES: Final[list[str]] = [
+    FILE_UNIT_DATA_SIZE,
+    FIXED_UNIT_DATA_SIZE,
+    LOGNORMAL_UNIT_DATA_SIZE,
+    SAMPLED_UNIT_DATA_SIZE,
+]
+
+# Bounds of the size of a generated unit data in bytes, the upper one keeping the unit data within the Firestore
+# document limit of 1 MiB
+MIN_UNIT_DATA_SIZE: Final[int] = 1
+MAX_UNIT_DATA_SIZE: Final[int] = 1_000_000
+
+# Size in bytes of the pool of random characters the high entropy part of the unit data is sliced from
+RANDOM_POOL_SIZE: Final[int] = 4 * MAX_UNIT_DATA_SIZE
+
+
+class UnitDataGenerator:
+    """
+    Generate the unit data of the dataset entries, with sizes following a distribution and a share of random content.
+
+    The unit data of an entry is a slice of a pool of random characters, for the entropy share of its size, followed
+    by the unit data file repeated for the rest, so that the entropy sets how well it compresses. The pool and the
+    file are loaded once, and the sizes and slices are drawn from a seeded random generator, so that the same options
+    generate the same unit data.
+    """
+
+    def __init__(
+            self,
+            distribution: str,
+            size: int,
+            sigma: float,
+            entropy: float,
+            seed: int,
+            sizes_file: str = "",
+    ):
+        if distribution not in UNIT_DATA_SIZE_CHOICES:
+            raise ValueError(f"Unknown unit data size distribution: {distribution}")
+
+        if not 0 <= entropy <= 1:
+            raise ValueError(f"Invalid unit data entropy: {entropy}. Must be between 0 and 1")
+
+        self.distribution = distribution
+        self.size = size
+        self.sigma = sigma
+        self.entropy = entropy
+        self.random = random.Random(seed)
+
+        with open(config.UNIT_DATA_FILE) as file:
+            self.template = file.read()
+
+        self.sampled_sizes = load_unit_data_sizes(sizes_file) if distribution == SAMPLED_UNIT_DATA_SIZE else []
+        if distribution == SAMPLED_UNIT_DATA_SIZE and not self.sampled_sizes:
+            raise ValueError("The sampled unit data size distribution requires the unit data sizes file")
+
+        self._random_pool = ""
+        if distribution != FILE_UNIT_DATA_SIZE and entropy > 0:
+            # Base64 of random bytes, 6 bits of entropy per character
+            self._random_pool = base64.b64encode(self.random.randbytes(RANDOM_POOL_SIZE * 3 // 4)).decode()
+
+    def next_size(self) -> int:
+        """Draw the size of the next unit data in bytes from the distribution"""
+        if self.distribution == LOGNORMAL_UNIT_DATA_SIZE:
+            # The size option is the median of the distribution
+            size = round(self.random.lognormvariate(math.log(self.size), self.sigma))
+        elif self.distribution == SAMPLED_UNIT_DATA_SIZE:
+            size = self.random.choice(self.sampled_sizes)
+        else:
+            size = self.size
+
+        return min(max(size, MIN_UNIT_DATA_SIZE), MAX_UNIT_DATA_SIZE)
+
+    def generate(self) -> str:
+        """Generate the unit data of the next entry"""
+        if self.distribution == FILE_UNIT_DATA_SIZE:
+            return self.template
+
+        size = self.next_size()
+        random_size = round(size * self.entropy)
+        offset = self.random.randrange(len(self._random_pool) - random_size + 1) if random_size else 0
+        repeated_size = size - random_size
+
+        repeated = self.template * (repeated_size // len(self.template) + 1)
+
+        return self._random_pool[offset:offset + random_size] + repeated[:repeated_size]
+
+
+def load_unit_data_sizes(file_path: str) -> list[int]:
+    """Load the sampled unit data sizes in bytes, from a JSON list or a file of one size per line"""
+    if not file_path:
+        return []
+
+    with open(file_path) as f:
+        content = f.read()
+
+    if content.lstrip().startswith("["):
+        return [int(size) for size in json.loads(content)]
+
+    return [int(line) for line in content.splitlines() if line.strip()]
+
+
+def create_unit_data_generator(options: Namespace) -> UnitDataGenerator:
+    """Create the unit data generator from the unit data options"""
+    return UnitDataGenerator(
+        distribution=options.unit_data_size_distribution,
+        size=options.unit_data_size,
+        sigma=options.unit_data_size_sigma,
+        entropy=options.unit_data_entropy,
+        seed=options.unit_data_seed,
+        sizes_file=options.unit_data_sizes_file,
+    )
+
+
+def get_unit_data_variant(options: Namespace) -> str:
+    """
+    Get a short key of the unit data options, to tell the datasets generated with different unit data apart.
+    Empty for the unit data file, the dataset then being named after its size only.
+    """
+    distribution = getattr(options, "unit_data_size_distribution", FILE_UNIT_DATA_SIZE)
+    if distribution == FILE_UNIT_DATA_SIZE:
+        return ""
+
+    parameters = [
+        distribution,
+        options.unit_data_size,
+        options.unit_data_size_sigma,
+        options.unit_data_entropy,
+        options.unit_data_seed,
+        options.unit_data_sizes_file,
+    ]
+
+    return f"{zlib.crc32(json.dumps(parameters).encode()):08x}"
@@ -0,0 +1,80 @@
+import gzip
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from performance_tests.access_log_replay import AccessLogReplay, is_in_partition, read_access_log
+from performance_tests.json_generator import get_dataset_identifiers
+
+SAMPLE_LOG = "performance_tests/access_logs/sds_sample.csv"
+
+EXPECTED_RECORDS = [
+    {"timestamp": 1735725600.0, "method": "GET", "path": "/v1/unit_data", "query": "identifier=49900001"},
+    {"timestamp": 1735725600.5, "method": "GET", "path": "/v1/survey_list", "query": "survey_id=068"},
+]
+
+RECORD_ROWS = [
+    ["2025-01-01T10:00:00", "get", "/v1/unit_data?identifier=49900001", ""],
+    ["1735725600.5", "GET", "/v1/survey_list", "?survey_id=068"],
+]
+
+
+def write_csv_log(file_path, opener=open) -> str:
+    with opener(file_path, "wt") as log_file:
+        log_file.write("timestamp,method,path,query\n")
+        log_file.writelines(",".join(row) + "\n" for row in RECORD_ROWS)
+
+    return str(file_path)
+
+
+def write_jsonl_log(file_path, opener=open) -> str:
+    with opener(file_path, "wt") as log_file:
+        for row in RECORD_ROWS:
+            log_file.write(json.dumps(dict(zip(("timestamp", "method", "path", "query"), row, strict=True))) + "\n")
+        log_file.write("\n")
+
+    return str(file_path)
+
+
+@pytest.mark.parametrize(
+    ("file_name", "write_log", "opener"),
+    [
+        ("access_log.csv", write_csv_log, open),
+        ("access_log.jsonl", write_jsonl_log, open),
+        ("access_log.csv.gz", write_csv_log, gzip.open),
+        ("access_log.jsonl.gz", write_jsonl_log, gzip.open),
+    ],
+)
+def test_read_access_log(tmp_path, file_name, write_log, opener):
+    file_path = write_log(tmp_path / file_name, opener)
+
+    assert list(read_access_log(file_path)) == EXPECTED_RECORDS
+
+
+@pytest.mark.parametrize("partitions", [1, 2, 3, 5])
+def test_partitions_are_disjoint_and_cover_every_record(partitions):
+    records = list(read_access_log(SAMPLE_LOG))
+
+    for record in records:
+        assert sum(is_in_partition(record, partition, partitions) for partition in range(partitions)) == 1
+
+
+def test_replay_rewrites_the_identifiers_to_the_dataset_identifiers():
+    dataset_identifiers = get_dataset_identifiers(100)
+    runtime_config = SimpleNamespace(DATASET_IDENTIFIERS=dataset_identifiers, COLD_CACHE_KEY_POOL=None)
+    endpoint_configs = {
+        "get_unit_data": {
+            "method": "GET",
+            "url": "/v1/unit_data",
+            "params": {"dataset_id": "[dataset_id]", "identifier": "[identifier]"},
+        },
+    }
+    replay = AccessLogReplay(SAMPLE_LOG, endpoint_configs, runtime_config, speedup=1, partition=0, partitions=1)
+
+    overrides = [replay.get_param_overrides("get_unit_data", f"identifier={identifier}") for identifier in range(1000)]
+
+    rewritten_identifiers = {override["identifier"] for override in overrides}
+    assert rewritten_identifiers <= set(dataset_identifiers)
+    assert len(rewritten_identifiers) > len(dataset_identifiers) // 2
+    assert replay.get_param_overrides("get_unit_data", "identifier=7") == overrides[7]
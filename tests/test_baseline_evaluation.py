@@ -0,0 +1,64 @@
+from argparse import Namespace
+
+from locust.env import Environment
+
+from performance_tests.postprocess.postprocess_result_archive import PostProcessResultArchive
+from performance_tests.postprocess.postprocess_result_evaluator import PostProcessResultEvaluator
+from performance_tests.result_evaluation.result_store import (
+    get_run_metadata,
+    load_baseline_result,
+    write_result_archive,
+)
+
+ENDPOINT = "/v1/unit_data?dataset_id=[dataset_id]&identifier=[identifier]"
+
+
+def create_environment(csv_prefix: str, baseline_result: str, response_time: int, users: int = 10) -> Environment:
+    options = Namespace(
+        csv_prefix=csv_prefix,
+        baseline_result=baseline_result,
+        baseline_tolerance=0.1,
+        num_users=users,
+        run_time=60,
+        test_endpoints="get_unit_data",
+        test_journeys="",
+        traffic_profile="",
+        load_model="closed",
+        load_shape="none",
+        load_shape_file="",
+        cache_mode="mixed",
+        dataset_entries=100,
+    )
+    environment = Environment(parsed_options=options, host="http://127.0.0.1:3033")
+    for offset in range(200):
+        environment.stats.log_request("GET", ENDPOINT, response_time + offset % 5, 100)
+
+    return environment
+
+
+def seed_archive(file_path: str, environment: Environment, created_at: str) -> None:
+    metadata = get_run_metadata(environment)
+    metadata["created_at"] = created_at
+    write_result_archive(file_path, metadata, list(environment.stats.entries.values()))
+
+
+def test_evaluate_baseline_reports_regression_from_latest_comparable_run(tmp_path):
+    baseline_dir = str(tmp_path)
+    seed_archive(f"{tmp_path}/1/result_archive.bin", create_environment("", "", 10), "2026-01-01T00:00:00+00:00")
+
+    environment = create_environment(f"{tmp_path}/2/result", baseline_dir, 50)
+    # The run is archived before it is evaluated, as in the post-processors of a run
+    PostProcessResultArchive(None, environment).postprocess_master()
+
+    assert not PostProcessResultEvaluator(None, environment).evaluate_baseline(baseline_dir)
+
+
+def test_load_baseline_result_skips_own_and_not_comparable_runs(tmp_path):
+    environment = create_environment(f"{tmp_path}/3/result", "", 50)
+    seed_archive(f"{tmp_path}/1/result_archive.bin", create_environment("", "", 10), "2026-01-01T00:00:00+00:00")
+    seed_archive(f"{tmp_path}/2/result_archive.bin", create_environment("", "", 20, users=50), "2026-01-02T00:00:00+00:00")
+    seed_archive(f"{tmp_path}/3/result_archive.bin", environment, "2026-01-03T00:00:00+00:00")
+
+    baseline_run = load_baseline_result(str(tmp_path), get_run_metadata(environment), f"{tmp_path}/3/result_archive.bin")
+
+    assert baseline_run["metadata"]["created_at"] == "2026-01-01T00:00:00+00:00"
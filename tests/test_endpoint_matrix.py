@@ -0,0 +1,25 @@
+from argparse import Namespace
+from types import SimpleNamespace
+
+from locust import argument_parser
+
+from performance_tests.endpoint_matrix import apply_matrix_cell, build_matrix_cells
+from performance_tests.total_users import get_total_users
+
+
+def test_apply_matrix_cell_sends_the_users_of_the_cell_to_the_workers():
+    cells = build_matrix_cells({"test_endpoints": ["get_unit_data"], "users": [10, 40]})
+    master = SimpleNamespace(parsed_options=Namespace(num_users=10, test_endpoints="get_unit_data", dataset_entries=100))
+
+    apply_matrix_cell(master, cells[1])
+
+    # The workers only get the options which are not Locust arguments, and run 25 and 15 of the 40 users
+    forwarded_options = {
+        key: value for key, value in vars(master.parsed_options).items() if key not in argument_parser.default_args_dict()
+    }
+    worker = SimpleNamespace(
+        parsed_options=Namespace(num_users=10, **forwarded_options), runner=SimpleNamespace(target_user_count=25)
+    )
+
+    assert worker.parsed_options.matrix_cell == "get_unit_data_u40"
+    assert get_total_users(worker) == 40
@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+
+from performance_tests.cache_key_pool import CacheKeyPool, ColdCacheKeyPool
+from performance_tests.configs.endpoints_helpers import EndpointsHelpers
+
+
+class RecordingClient:
+    """Client recording the requests sent instead of sending them"""
+
+    def __init__(self):
+        self.requests = []
+
+    def request(self, **kwargs):
+        self.requests.append(kwargs)
+
+
+def create_runtime_config(**overrides) -> SimpleNamespace:
+    return SimpleNamespace(
+        **{
+            "CACHE_MODE": "cold",
+            "COLD_CACHE_KEY_POOL": None,
+            "COLD_RATIO": 1.0,
+            "HEADER": {},
+            "RESPONSE_VALIDATOR": None,
+            "BODY_CHUNK_SIZE": 0,
+            **overrides,
+        }
+    )
+
+
+def test_send_request_sets_the_cold_key_of_an_endpoint_without_params():
+    endpoints_helpers = EndpointsHelpers(
+        "http://127.0.0.1:3033",
+        {"get_schema": {"url": "/v2/schema", "method": "GET", "name": "/v2/schema", "cache_key_param": "guid"}},
+    )
+    client = RecordingClient()
+
+    endpoints_helpers.send_request(
+        client, "get_schema", create_runtime_config(COLD_CACHE_KEY_POOL=ColdCacheKeyPool(["guid_1"]))
+    )
+
+    assert client.requests[0]["url"] == "http://127.0.0.1:3033/v2/schema?guid=guid_1"
+    assert client.requests[0]["name"].endswith("/v2/schema [cold]")
+
+
+def test_send_request_sets_the_shard_key_of_an_endpoint_without_params():
+    endpoints_helpers = EndpointsHelpers(
+        "http://127.0.0.1:3033",
+        {"get_unit": {"url": "/v1/unit", "method": "GET", "name": "/v1/unit", "shard_key_param": "identifier"}},
+    )
+    endpoints_helpers.shard_key_pools = {"identifier": CacheKeyPool(["43532"])}
+    client = RecordingClient()
+
+    endpoints_helpers.send_request(client, "get_unit", create_runtime_config(CACHE_MODE="warm"))
+
+    assert client.requests[0]["url"] == "http://127.0.0.1:3033/v1/unit?identifier=43532"
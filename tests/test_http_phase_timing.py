@@ -0,0 +1,34 @@
+import logging
+from types import SimpleNamespace
+
+from geventhttpclient.client import HTTPClient
+from locust.contrib.fasthttp import FastHttpSession
+from locust.env import Environment
+
+from performance_tests.metrics.http_phase_timing import (
+    CLIENT_INTERNALS,
+    SESSION_INTERNALS,
+    get_missing_attributes,
+    instrument_session,
+    track_request_phases,
+)
+
+
+def test_the_installed_locust_and_geventhttpclient_have_the_wrapped_internals():
+    session = FastHttpSession(Environment(), base_url="http://127.0.0.1:3033", user=None)
+    client = HTTPClient("127.0.0.1", 3033)
+
+    assert get_missing_attributes(session, SESSION_INTERNALS) == []
+    assert get_missing_attributes(client, CLIENT_INTERNALS) == []
+
+
+def test_instrument_session_turns_phase_timing_off_without_the_internals(caplog):
+    session = SimpleNamespace(client=SimpleNamespace(clientpool=SimpleNamespace()))
+
+    with caplog.at_level(logging.WARNING):
+        instrument_session(session)
+
+    assert "client.clientpool.get_client, _send_request_safe_mode" in caplog.text
+    assert not getattr(session, "phase_timing_instrumented", False)
+    with track_request_phases(session, "/v1/unit_data"):
+        pass
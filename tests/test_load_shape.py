@@ -0,0 +1,70 @@
+import pytest
+
+from performance_tests.load_shape import (
+    CUSTOM_LOAD_SHAPE,
+    DIURNAL_LOAD_SHAPE,
+    LOAD_SHAPE_CHOICES,
+    NO_LOAD_SHAPE,
+    RAMP_LOAD_SHAPE,
+    SOAK_LOAD_SHAPE,
+    SPIKE_LOAD_SHAPE,
+    STAIRCASE_LOAD_SHAPE,
+    build_load_stages,
+)
+
+CUSTOM_STAGES = {"stages": [{"label": "warmup", "duration": 60, "users": 10}, {"label": "peak", "duration": 120, "users": 50, "spawn_rate": 5}]}
+
+
+@pytest.mark.parametrize("shape", [shape for shape in LOAD_SHAPE_CHOICES if shape != NO_LOAD_SHAPE])
+def test_build_load_stages_of_the_default_parameters(shape):
+    stages = build_load_stages(shape, 100, 10, 3600, CUSTOM_STAGES if shape == CUSTOM_LOAD_SHAPE else None)
+
+    assert all(stage["duration"] > 0 and stage["users"] > 0 for stage in stages)
+    if shape != CUSTOM_LOAD_SHAPE:
+        assert sum(stage["duration"] for stage in stages) == pytest.approx(3600)
+
+
+@pytest.mark.parametrize(
+    ("shape", "parameters", "message"),
+    [
+        (RAMP_LOAD_SHAPE, {"ramp_share": 0}, "ramp_share must be a share above 0"),
+        (RAMP_LOAD_SHAPE, {"ramp_share": 1.5}, "ramp_share must be a share above 0"),
+        (STAIRCASE_LOAD_SHAPE, {"steps": 0}, "steps must be a positive integer"),
+        (STAIRCASE_LOAD_SHAPE, {"steps": 2.5}, "steps must be a positive integer"),
+        (SPIKE_LOAD_SHAPE, {"spike_start": 0.8, "spike_share": 0.3}, "add up to at most 1"),
+        (SPIKE_LOAD_SHAPE, {"spike_share": 0}, "spike_share must be a share above 0"),
+        (SPIKE_LOAD_SHAPE, {"baseline_share": -0.1}, "baseline_share must be a share between 0 and 1"),
+        (SOAK_LOAD_SHAPE, {"burst_interval": 0}, "burst_interval must be a positive number"),
+        (SOAK_LOAD_SHAPE, {"burst_interval": -60}, "burst_interval must be a positive number"),
+        (SOAK_LOAD_SHAPE, {"burst_duration": "60"}, "burst_duration must be a positive number"),
+        (DIURNAL_LOAD_SHAPE, {"hourly_shares": []}, "hourly_shares must be a list of shares"),
+        (DIURNAL_LOAD_SHAPE, {"hourly_shares": [0.5, 2]}, r"hourly_shares\[1\] must be a share"),
+    ],
+)
+def test_build_load_stages_rejects_invalid_parameters(shape, parameters, message):
+    with pytest.raises(ValueError, match=message):
+        build_load_stages(shape, 100, 10, 3600, parameters)
+
+
+@pytest.mark.parametrize(
+    ("stage", "message"),
+    [
+        ({"duration": 60, "users": 10}, "must have a label"),
+        ({"label": "peak", "duration": 0, "users": 10}, "peak duration must be a positive number"),
+        ({"label": "peak", "users": 10}, "peak duration must be a positive number"),
+        ({"label": "peak", "duration": 60, "users": 0}, "peak users must be a positive integer"),
+        ({"label": "peak", "duration": 60, "users": 2.5}, "peak users must be a positive integer"),
+        ({"label": "peak", "duration": 60, "users": 10, "spawn_rate": 0}, "peak spawn_rate must be a positive number"),
+    ],
+)
+def test_build_load_stages_rejects_invalid_custom_stages(stage, message):
+    with pytest.raises(ValueError, match=message):
+        build_load_stages(CUSTOM_LOAD_SHAPE, 100, 10, 3600, {"stages": [stage]})
+
+
+def test_build_load_stages_rejects_a_custom_shape_without_stages_and_a_null_duration():
+    with pytest.raises(ValueError, match="requires the stages"):
+        build_load_stages(CUSTOM_LOAD_SHAPE, 100, 10, 3600)
+
+    with pytest.raises(ValueError, match="duration must be a positive number"):
+        build_load_stages(RAMP_LOAD_SHAPE, 100, 10, 0)
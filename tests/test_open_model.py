@@ -0,0 +1,41 @@
+from argparse import Namespace
+from types import SimpleNamespace
+
+from locust import argument_parser
+from locust.event import Events
+
+from performance_tests.open_model import get_user_rate_share
+from performance_tests.total_users import register_total_users
+
+
+def forward_custom_options(master_options: Namespace) -> dict:
+    """Get the options a worker receives from the master with the users to start, as Locust filters them"""
+    return {key: value for key, value in vars(master_options).items() if key not in argument_parser.default_args_dict()}
+
+
+def test_user_rate_shares_add_up_to_the_target_rate_across_workers():
+    events = Events()
+    register_total_users(events)
+    master = SimpleNamespace(parsed_options=Namespace(num_users=10, arrival_rate=100.0), runner=SimpleNamespace(target_user_count=10))
+    events.test_start.fire(environment=master)
+
+    # The workers do not get the users option, and run 6 and 4 of the 10 users
+    workers = [
+        SimpleNamespace(
+            parsed_options=Namespace(num_users=None, **forward_custom_options(master.parsed_options)),
+            runner=SimpleNamespace(target_user_count=worker_users),
+        )
+        for worker_users in (6, 4)
+    ]
+
+    aggregate_share = sum(
+        get_user_rate_share(worker) * worker.runner.target_user_count for worker in workers
+    )
+
+    assert abs(aggregate_share - 1) < 1e-9
+
+
+def test_user_rate_share_without_total_users_falls_back_to_the_users_option():
+    environment = SimpleNamespace(parsed_options=Namespace(num_users=4), runner=SimpleNamespace(target_user_count=2))
+
+    assert get_user_rate_share(environment) == 0.25
@@ -0,0 +1,123 @@
+import math
+
+import pytest
+from locust.stats import RequestStats
+
+from performance_tests.result_evaluation.compare_runs import compare_runs, load_runs
+from performance_tests.result_evaluation.result_store import (
+    RunMetadata,
+    load_baseline_result,
+    read_result_archive,
+    write_result_archive,
+)
+
+
+def create_metadata(created_at: str, users: int = 10) -> RunMetadata:
+    return RunMetadata(
+        app="sds",
+        commit="abc1234",
+        created_at=created_at,
+        host="http://127.0.0.1:3033",
+        users=users,
+        run_time=60,
+        endpoints="get_unit_data",
+        journeys="",
+        traffic_profile="",
+        load_model="closed",
+        load_shape="none",
+        load_shape_file="",
+        cache_mode="mixed",
+        dataset_entries=100,
+    )
+
+
+def create_stats(response_times: list[int]) -> RequestStats:
+    stats = RequestStats()
+    for response_time in response_times:
+        stats.log_request("GET", "/v1/unit_data", response_time, 100)
+    stats.log_error("GET", "/v1/unit_data", "error")
+    # An endpoint without a completed request, whose minimum response time is unset
+    stats.get("/v1/schema", "POST")
+
+    return stats
+
+
+def write_run(file_path, created_at: str, response_times: list[int], users: int = 10) -> str:
+    entries = list(create_stats(response_times).entries.values())
+
+    return write_result_archive(str(file_path), create_metadata(created_at, users), entries)
+
+
+def test_result_archive_round_trip(tmp_path):
+    stats = create_stats([10, 12, 12, 250])
+    metadata = create_metadata("2026-01-01T00:00:00+00:00")
+
+    run = read_result_archive(write_result_archive(str(tmp_path / "result_archive.bin"), metadata, list(stats.entries.values())))
+
+    assert run["metadata"] == metadata
+    unit_data, schema = run["endpoints"]
+    entry = stats.get("/v1/unit_data", "GET")
+    assert (unit_data["name"], unit_data["method"]) == ("/v1/unit_data", "GET")
+    assert unit_data["num_requests"] == entry.num_requests
+    assert unit_data["num_failures"] == 1
+    assert unit_data["total_response_time"] == entry.total_response_time
+    assert unit_data["total_content_length"] == entry.total_content_length
+    assert unit_data["histogram"] == {10: 1, 12: 2, 250: 1}
+    assert (schema["name"], schema["method"], schema["num_requests"]) == ("/v1/schema", "POST", 0)
+    assert math.isnan(schema["min_response_time"])
+    assert schema["histogram"] == {}
+
+
+def test_read_result_archive_rejects_corrupt_files(tmp_path):
+    file_path = tmp_path / "result_archive.bin"
+    file_path.write_bytes(b"NOPE" + bytes(64))
+
+    with pytest.raises(ValueError, match="not a version 1 result archive"):
+        read_result_archive(str(file_path))
+
+
+@pytest.mark.parametrize("length", [0, 5, 20, -1])
+def test_read_result_archive_rejects_truncated_files(tmp_path, length):
+    file_path = tmp_path / "result_archive.bin"
+    write_run(file_path, "2026-01-01T00:00:00+00:00", [10, 20])
+    file_path.write_bytes(file_path.read_bytes()[:length])
+
+    with pytest.raises(ValueError, match=r"not a version 1 result archive|truncated"):
+        read_result_archive(str(file_path))
+
+
+def test_load_runs_keeps_the_runs_comparable_with_the_latest_one(tmp_path):
+    write_run(tmp_path / "1/result_archive.bin", "2026-01-01T00:00:00+00:00", [10])
+    write_run(tmp_path / "2/result_archive.bin", "2026-01-02T00:00:00+00:00", [10], users=50)
+    write_run(tmp_path / "3/result_archive.bin", "2026-01-03T00:00:00+00:00", [10])
+    # A run interrupted while its archive was written
+    (tmp_path / "4").mkdir()
+    (tmp_path / "4/result_archive.bin").write_bytes(b"LRES")
+
+    runs = load_runs(str(tmp_path), runs_count=10, all_configs=False)
+
+    assert [run["metadata"]["created_at"][:10] for run in runs] == ["2026-01-01", "2026-01-03"]
+    assert len(load_runs(str(tmp_path), runs_count=10, all_configs=True)) == 3
+
+
+def test_load_baseline_result_skips_truncated_archives(tmp_path):
+    write_run(tmp_path / "1/result_archive.bin", "2026-01-01T00:00:00+00:00", [10])
+    file_path = write_run(tmp_path / "2/result_archive.bin", "2026-01-02T00:00:00+00:00", [10])
+    with open(file_path, "rb+") as archive_file:
+        archive_file.truncate(40)
+
+    baseline_run = load_baseline_result(str(tmp_path), create_metadata("2026-01-03T00:00:00+00:00"))
+
+    assert baseline_run["metadata"]["created_at"] == "2026-01-01T00:00:00+00:00"
+
+
+def test_compare_runs_flags_a_regression_against_the_comparable_runs(tmp_path):
+    for day in range(1, 4):
+        write_run(tmp_path / f"{day}/result_archive.bin", f"2026-01-0{day}T00:00:00+00:00", [10 + offset % 5 for offset in range(100)])
+    write_run(tmp_path / "4/result_archive.bin", "2026-01-04T00:00:00+00:00", [30 + offset % 5 for offset in range(100)])
+
+    comparisons = compare_runs(load_runs(str(tmp_path), runs_count=10, all_configs=False), alpha=0.05, tolerance=0.1)
+
+    unit_data = next(comparison for comparison in comparisons if comparison["name"] == "/v1/unit_data")
+    assert unit_data["runs"] == 4
+    assert unit_data["regression"]
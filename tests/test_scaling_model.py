@@ -0,0 +1,66 @@
+import math
+
+import pytest
+
+from performance_tests.result_evaluation.scaling_model import MIN_SCALING_POINTS, classify_scaling, fit_power_law
+
+SIZES = [100, 1000, 10000, 90000]
+
+
+@pytest.mark.parametrize(
+    ("exponent", "scaling"),
+    [(0.5, "sublinear"), (1.0, "linear"), (1.5, "superlinear")],
+)
+def test_fit_power_law_recovers_the_exponent_of_synthetic_points(exponent, scaling):
+    response_times = [2.0 * size ** exponent for size in SIZES]
+
+    fit = fit_power_law(SIZES, response_times)
+
+    assert fit["exponent"] == pytest.approx(exponent)
+    assert fit["coefficient"] == pytest.approx(2.0)
+    assert fit["r_squared"] == pytest.approx(1.0)
+    assert fit["scaling"] == scaling
+
+
+def test_fit_power_law_of_noisy_points():
+    noise = [1.05, 0.95, 1.04, 0.97]
+    response_times = [0.01 * size * factor for size, factor in zip(SIZES, noise, strict=True)]
+
+    fit = fit_power_law(SIZES, response_times)
+
+    assert fit["exponent"] == pytest.approx(1.0, abs=0.05)
+    assert 0.9 < fit["r_squared"] < 1.0
+    assert fit["scaling"] == "linear"
+
+
+def test_fit_power_law_needs_the_minimum_number_of_distinct_sizes():
+    sizes = SIZES[:MIN_SCALING_POINTS - 1]
+
+    assert fit_power_law(sizes, [float(size) for size in sizes]) is None
+    # The same size run twice is a single point of the curve
+    assert fit_power_law([*sizes, sizes[0]], [float(size) for size in [*sizes, sizes[0]]]) is None
+
+
+def test_fit_power_law_of_a_flat_curve_is_constant():
+    # The exponent of the points is steep, but the response times only change within the run to run noise
+    response_times = [2.0, 3.0, 4.5, 6.5]
+
+    fit = fit_power_law(SIZES, response_times)
+
+    assert fit["exponent"] > 0.1
+    assert fit["scaling"] == "O(1)"
+
+
+def test_fit_power_law_takes_the_response_times_below_1_ms_as_1_ms():
+    fit = fit_power_law(SIZES, [0.2, 0.4, 0.6, 0.8])
+
+    assert fit["exponent"] == 0.0
+    assert fit["r_squared"] == 1.0
+    assert math.isclose(fit["coefficient"], 1.0)
+    assert fit["scaling"] == "O(1)"
+
+
+def test_classify_scaling():
+    assert classify_scaling(0.05, 100.0) == "O(1)"
+    assert classify_scaling(1.0, 4.9) == "O(1)"
+    assert classify_scaling(1.0, 5.0) == "linear"
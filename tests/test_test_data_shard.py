@@ -0,0 +1,44 @@
+from argparse import Namespace
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from locust.runners import WorkerRunner
+
+from performance_tests.test_data_shard import create_test_data_shard, get_shard
+
+
+def create_worker_environment(worker_index: int, **options) -> SimpleNamespace:
+    runner = Mock(spec=WorkerRunner, worker_index=worker_index, target_user_count=0)
+    parsed_options = Namespace(shard_test_data=True, shard_overlap=0.0, expect_workers=2, num_users=1, **options)
+
+    return SimpleNamespace(parsed_options=parsed_options, runner=runner)
+
+
+def test_get_shard_splits_the_keys_into_disjoint_slices_covering_all_the_keys():
+    keys = [str(key) for key in range(10)]
+
+    shards = [get_shard(keys, shard, 3) for shard in range(3)]
+
+    assert sorted(key for shard in shards for key in shard) == keys
+
+
+def test_create_test_data_shard_splits_the_total_users_between_the_workers():
+    keys = {"identifier": [str(key) for key in range(40)]}
+
+    # The workers keep the users option at its startup value, the total users being sent by the master
+    test_data_shards = [create_test_data_shard(keys, create_worker_environment(index, total_users=8)) for index in range(2)]
+
+    user_keys = [
+        test_data_shard.next_user_key_pools()["identifier"].keys
+        for test_data_shard in test_data_shards
+        for _ in range(4)
+    ]
+    assert all(len(keys) == 5 for keys in user_keys)
+    assert len({key for keys in user_keys for key in keys}) == 40
+
+
+def test_create_test_data_shard_is_none_if_the_test_data_is_not_sharded():
+    environment = create_worker_environment(0)
+    environment.parsed_options.shard_test_data = False
+
+    assert create_test_data_shard({"identifier": ["1"]}, environment) is None
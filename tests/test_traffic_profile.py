@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from performance_tests.configs.config import App
+from performance_tests.configs.traffic_profile import load_traffic_profile
+from performance_tests.locust_tests_factory import LocustTestsFactory
+
+AVAILABLE_ENDPOINTS = ("get_unit_data", "get_survey_list", "get_schema_v2")
+
+
+def write_profile(tmp_path, sds_profile: dict, file_name: str = "traffic_profile.json") -> str:
+    file_path = tmp_path / file_name
+    file_path.write_text(json.dumps({"sds": sds_profile}))
+
+    return str(file_path)
+
+
+def test_load_traffic_profile(tmp_path):
+    file_path = write_profile(tmp_path, {"get_unit_data": {"weight": 3}, "get_survey_list": {"rate": 2.5}})
+
+    assert load_traffic_profile(file_path, App.SDS, AVAILABLE_ENDPOINTS) == {
+        "get_unit_data": {"weight": 3},
+        "get_survey_list": {"rate": 2.5},
+    }
+
+
+@pytest.mark.parametrize("weight", [0, -1, 0.5, 2.0, "2", True, None])
+def test_load_traffic_profile_rejects_invalid_weights(tmp_path, weight):
+    file_path = write_profile(tmp_path, {"get_unit_data": {"weight": weight}})
+
+    with pytest.raises(ValueError, match="positive integer weight"):
+        load_traffic_profile(file_path, App.SDS, AVAILABLE_ENDPOINTS)
+
+
+@pytest.mark.parametrize("rate", [0, -0.5, "fast", "2", True, None])
+def test_load_traffic_profile_rejects_invalid_rates(tmp_path, rate):
+    file_path = write_profile(tmp_path, {"get_unit_data": {"weight": 1, "rate": rate}})
+
+    with pytest.raises(ValueError, match="positive rate"):
+        load_traffic_profile(file_path, App.SDS, AVAILABLE_ENDPOINTS)
+
+
+def test_load_traffic_profile_rejects_unknown_endpoints_and_empty_entries(tmp_path):
+    with pytest.raises(ValueError, match="not a valid"):
+        load_traffic_profile(write_profile(tmp_path, {"get_nothing": {"weight": 1}}), App.SDS, AVAILABLE_ENDPOINTS)
+
+    with pytest.raises(ValueError, match="weight or a rate"):
+        load_traffic_profile(write_profile(tmp_path, {"get_unit_data": {}}, "empty_entry.json"), App.SDS, AVAILABLE_ENDPOINTS)
+
+
+def test_compile_weighted_task_table_reduces_the_weights_by_their_gcd():
+    factory = LocustTestsFactory(
+        {"get_unit_data": {}, "get_survey_list": {}, "get_schema_v2": {}},
+        {"get_unit_data": {"weight": 6}, "get_survey_list": {"weight": 4}, "get_schema_v2": {"rate": 2.0}},
+    )
+
+    task_table = factory.compile_weighted_task_table(["unit_data", "survey_list", "schema_v2"])
+
+    assert sorted(task_table) == ["schema_v2", "survey_list", "survey_list", "unit_data", "unit_data", "unit_data"]
+
+
+def test_compile_weighted_task_table_without_traffic_profile():
+    factory = LocustTestsFactory({"get_unit_data": {}, "get_survey_list": {}})
+
+    assert factory.compile_weighted_task_table(["unit_data", "survey_list"]) == ["unit_data", "survey_list"]
@@ -0,0 +1,52 @@
+import re
+
+from performance_tests.unique_value_generator import UniqueValueGenerator, get_run_number
+
+
+def test_values_are_unique_across_worker_indexes():
+    generators = [UniqueValueGenerator(batch_size=10) for _ in range(3)]
+    for worker_index, generator in enumerate(generators):
+        generator.set_namespace("1735689600", worker_index)
+
+    values = [generator.next_value("guid") for generator in generators for _ in range(25)]
+    versions = [generator.next_version() for generator in generators for _ in range(25)]
+
+    assert len(set(values)) == len(values)
+    assert len(set(versions)) == len(versions)
+
+
+def test_values_are_unique_across_namespace_resets():
+    generator = UniqueValueGenerator(batch_size=10)
+    values = []
+    for run_id, worker_index in [("1735689600", 0), ("1735689700", 0), ("1735689600", 1), ("1735689600", 0)]:
+        generator.set_namespace(run_id, worker_index)
+        values.extend(generator.next_value("guid") for _ in range(15))
+        values.extend(generator.next_version() for _ in range(15))
+
+    assert len(set(values)) == len(values)
+
+
+def test_next_value_format():
+    generator = UniqueValueGenerator()
+    generator.set_namespace("1735689600", 3)
+
+    assert generator.next_value("guid") == "guid_1735689600_3_0"
+    assert generator.next_value("guid") == "guid_1735689600_3_1"
+
+
+def test_next_version_format():
+    generator = UniqueValueGenerator(batch_size=10)
+    generator.set_namespace("1735689600", 3)
+
+    versions = [generator.next_version() for _ in range(12)]
+
+    assert versions[:2] == ["1735689600.3.0", "1735689600.3.1"]
+    assert all(re.fullmatch(r"\d+\.\d+\.\d+", version) for version in versions)
+
+
+def test_next_version_of_a_non_numeric_run_id():
+    generator = UniqueValueGenerator()
+    generator.set_namespace("nightly-build", 0)
+
+    assert generator.next_version() == f"{get_run_number('nightly-build')}.0.0"
+    assert re.fullmatch(r"\d+\.0\.1", generator.next_version())